@@ -1,184 +1,167 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
 import os
-import pandas as pd
-import numpy as np
-
-from backend.engines.scoring_engine import ScoringEngine
-from backend.engines.outlier_engine import OutlierEngine
-from backend.engines.importance_engine import ImportanceEngine
-from backend.engines.completeness_engine import CompletenessEngine
-from backend.services.correlation import (
-    calculate_correlation_matrix,
-    detect_strong_correlations
-)
-from backend.services.recommendation_service import RecommendationService
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import STREAMING_PROFILE_THRESHOLD_BYTES
+from backend.core.dataset_store import load_dataset, columnar_path, columnar_size, original_path, dataset_rows
+from backend.core.job_queue import job_queue, report_progress
+from backend.core.metrics import span
+from backend.core.result_cache import result_cache
+from backend.core.sampling import SAMPLE_METHODS, parse_sample_size
+from backend.engines.dataset_stats import DatasetStats
+from backend.services.analytics_service import build_analytics_response
+from backend.services.sampled_analytics import sample_full_analytics
+from backend.services.streaming_profiler import stream_full_analytics
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
-UPLOAD_DIR = "backend/storage/uploads"
 
-# ✅ Helper function to clean NaN safely from any object
-def clean_nan(obj):
-    if isinstance(obj, dict):
-        return {k: clean_nan(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_nan(i) for i in obj]
-    elif isinstance(obj, float) and (np.isnan(obj) or np.isinf(obj)):
-        return None
-    else:
-        return obj
+@router.get("/{dataset_id}")
+async def get_full_analytics(
+    dataset_id: str,
+    streaming: Optional[bool] = None,
+    sample: Optional[str] = None,
+    sample_method: str = "stratified",
+    priority: int = 0
+):
+    """
+    streaming=true profiles the dataset in chunks with bounded memory
+    (approximate quartiles and distinct counts on large data). Left
+    unset, it is chosen by dataset size.
+
+    sample (a row count such as 100000, or a fraction such as 0.05)
+    runs the whole pipeline on a stratified or reservoir sample and adds
+    confidence intervals for every metric. Without it (the mode for
+    final reports) results are exact.
+
+    Cached responses are returned directly; anything else runs on the
+    job queue (see /jobs for the non-blocking variant).
+    """
+
+    sample_size = await run_in_threadpool(resolve_sample, dataset_id, sample, sample_method)
+
+    namespace = analytics_namespace(dataset_id, streaming, sample_size, sample_method)
+    cached = await run_in_threadpool(result_cache.lookup, dataset_id, namespace)
+
+    if cached is not None:
+        return cached
+
+    job = submit_analytics(dataset_id, streaming, priority, sample_size, sample_method)
+
+    return await asyncio.wrap_future(job.future)
+
+
+def submit_analytics(
+    dataset_id: str,
+    streaming: Optional[bool] = None,
+    priority: int = 0,
+    sample_size: Optional[int] = None,
+    sample_method: str = "stratified"
+):
+
+    return job_queue.submit(
+        "analytics",
+        dataset_id,
+        lambda: cached_full_analytics(dataset_id, streaming, sample_size, sample_method),
+        priority=priority,
+        key=("analytics", dataset_id, streaming, sample_size, sample_method)
+    )
+
+
+def cached_full_analytics(
+    dataset_id: str,
+    streaming: Optional[bool] = None,
+    sample_size: Optional[int] = None,
+    sample_method: str = "stratified"
+):
+
+    namespace = analytics_namespace(dataset_id, streaming, sample_size, sample_method)
 
+    if sample_size is not None:
+        return result_cache.get_or_compute(
+            dataset_id,
+            namespace,
+            lambda: sample_full_analytics(dataset_id, sample_size, sample_method)
+        )
 
-# ✅ NEW: Precise Cell-wise Outlier Percentage (IQR)
-def calculate_outlier_percentage(df):
-    numeric_df = df.select_dtypes(include=["number"])
+    if namespace == "analytics-streaming":
+        return result_cache.get_or_compute(
+            dataset_id,
+            "analytics-streaming",
+            lambda: stream_full_analytics(dataset_id)
+        )
 
-    if numeric_df.empty:
-        return 0.0
+    return result_cache.get_or_compute(
+        dataset_id,
+        "analytics",
+        lambda: build_full_analytics(dataset_id)
+    )
 
-    total_cells = numeric_df.size
-    outlier_cells = 0
 
-    for col in numeric_df.columns:
-        Q1 = numeric_df[col].quantile(0.25)
-        Q3 = numeric_df[col].quantile(0.75)
-        IQR = Q3 - Q1
+def build_full_analytics(dataset_id: str):
 
-        if IQR == 0:
-            continue
+    report_progress(0.1, "loading")
+    df = load_dataset(dataset_id)
+    stats = DatasetStats(df, dataset_id)
 
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+    report_progress(0.2, "statistics")
+    with span("analytics.statistics", len(df)):
+        stats.precompute()
 
-        outliers = numeric_df[
-            (numeric_df[col] < lower_bound) |
-            (numeric_df[col] > upper_bound)
-        ][col]
+    report_progress(0.4, "computing")
+    return build_analytics_response(df, stats)
 
-        outlier_cells += outliers.count()
 
-    return round((outlier_cells / total_cells) * 100, 2)
+def analytics_namespace(
+    dataset_id: str,
+    streaming: Optional[bool] = None,
+    sample_size: Optional[int] = None,
+    sample_method: str = "stratified"
+) -> str:
 
+    if sample_size is not None:
+        return f"analytics-sample-{sample_method}-{sample_size}"
 
-@router.get("/{dataset_id}")
-def get_full_analytics(dataset_id: str):
+    if streaming is None:
+        streaming = should_stream(dataset_id)
 
-    file_path = os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
+    return "analytics-streaming" if streaming else "analytics"
 
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Dataset not found")
 
-    df = pd.read_csv(file_path)
+def should_stream(dataset_id: str) -> bool:
 
-    total_rows = len(df)
-    total_cols = len(df.columns)
-    total_cells = total_rows * total_cols
+    if os.path.exists(columnar_path(dataset_id)):
+        return columnar_size(dataset_id) >= STREAMING_PROFILE_THRESHOLD_BYTES
 
-    # ================= CHANGED TO COUNTS =================
-    missing_count = int(df.isnull().all(axis=1).sum())
-    duplicate_count = int(df.duplicated(keep="first").sum())
+    if os.path.exists(original_path(dataset_id)):
+        return os.path.getsize(original_path(dataset_id)) >= STREAMING_PROFILE_THRESHOLD_BYTES
 
-    # ================= KEEP PERCENTAGE FOR SCORING =================
-    missing_percentage = (missing_count / total_cells) * 100 if total_cells else 0
-    duplicate_percentage = (duplicate_count / total_rows) * 100 if total_rows else 0
+    return False
 
-    # ✅ UPDATED: Using precise cell-wise IQR calculation
-    outlier_pct = calculate_outlier_percentage(df)
 
-    # ================= NOISY DATA (Cell-wise using Z-score) =================
-    numeric_df = df.select_dtypes(include=["number"])
+def resolve_sample(dataset_id: str, sample: Optional[str], sample_method: str = "stratified") -> Optional[int]:
+    """
+    Sample rows for the sample/sample_method query parameters, or None
+    for an exact run (no sample, or one covering the whole dataset).
+    """
 
-    if not numeric_df.empty:
-        z_scores = np.abs((numeric_df - numeric_df.mean()) / numeric_df.std())
-        noisy_cells = (z_scores > 3).sum().sum()
-        total_numeric_cells = numeric_df.shape[0] * numeric_df.shape[1]
-        noisy_percentage = (
-            (noisy_cells / total_numeric_cells) * 100
-            if total_numeric_cells > 0 else 0
+    if sample is None:
+        return None
+
+    if sample_method not in SAMPLE_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sample_method must be one of: {', '.join(SAMPLE_METHODS)}"
         )
-    else:
-        noisy_percentage = 0
-
-    quality_score = ScoringEngine.calculate_score(
-        missing_percentage,
-        duplicate_percentage,
-        outlier_pct,
-        noisy_percentage
-    )
 
-    completeness = CompletenessEngine.calculate(df)
-
-    # Advanced Data Type Classification
-    numeric_columns = df.select_dtypes(include=["number"]).columns.tolist()
-    categorical_columns = df.select_dtypes(include=["object"]).columns.tolist()
-    boolean_columns = df.select_dtypes(include=["bool"]).columns.tolist()
-    datetime_columns = df.select_dtypes(include=["datetime"]).columns.tolist()
-
-    importance = ImportanceEngine.calculate(df)
-
-    column_outliers = OutlierEngine.detect_column_outliers(df, "iqr")
-
-    correlation_matrix = calculate_correlation_matrix(df)
-    strong_pairs = detect_strong_correlations(df)
-
-    correlation_matrix = {
-        k: {kk: float(vv) for kk, vv in v.items()}
-        for k, v in correlation_matrix.items()
-    }
-
-    recommendations = RecommendationService.generate(df)
-
-    # ================= ML READINESS =================
-    if quality_score < 60:
-        readiness = "Not Ready"
-        badge_color = "red"
-    elif quality_score < 75:
-        readiness = "Needs Work"
-        badge_color = "orange"
-    elif quality_score < 90:
-        readiness = "Good"
-        badge_color = "blue"
-    else:
-        readiness = "ML Ready"
-        badge_color = "green"
-
-    # ================= SAFE JSON CLEANING =================
-    df_clean = df.replace([np.inf, -np.inf], np.nan)
-    preview_rows = df_clean.head(20).where(
-        pd.notnull(df_clean), None
-    ).to_dict(orient="records")
-
-    # ================= RETURN RESPONSE =================
-    response = {
-        "profile": {
-            "rows": total_rows,
-            "columns": total_cols,
-            "missing_count": missing_count,
-            "duplicate_count": duplicate_count,
-            "quality_score": round(quality_score, 2),
-            "completeness": round(completeness, 2),
-        },
-        "ml_readiness": {
-            "label": readiness,
-            "color": badge_color
-        },
-        "data_types": {
-            "numeric": numeric_columns,
-            "categorical": categorical_columns,
-            "boolean": boolean_columns,
-            "datetime": datetime_columns,
-        },
-        "importance": importance,
-        "outliers": {
-            "overall_percentage": outlier_pct,
-            "noisy_percentage": round(noisy_percentage, 2),
-            "column_outliers": column_outliers,
-        },
-        "correlation": {
-            "matrix": correlation_matrix,
-            "strong_pairs": strong_pairs,
-        },
-        "ai_review": recommendations
-    }
-
-    return clean_nan(response)
\ No newline at end of file
+    population = dataset_rows(dataset_id)
+
+    try:
+        size = parse_sample_size(sample, population)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return size if size < population else None
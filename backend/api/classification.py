@@ -1,26 +1,17 @@
-from fastapi import APIRouter, HTTPException
-import pandas as pd
-import os
+from fastapi import APIRouter
 
-router = APIRouter()
+from backend.engines.classification_engine import ClassificationEngine
+from backend.services.classification_service import column_types
 
-UPLOAD_DIR = "backend/storage/uploads"
+router = APIRouter()
 
 
 @router.get("/{dataset_id}")
 def classify(dataset_id: str):
 
-    file_path = os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
-
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Dataset not found")
-
-    df = pd.read_csv(file_path)
-
-    numeric = df.select_dtypes(include=["number"]).columns.tolist()
-    categorical = df.select_dtypes(include=["object"]).columns.tolist()
+    types = column_types(dataset_id)
 
     return {
-        "numeric": numeric,
-        "categorical": categorical
-    }
\ No newline at end of file
+        **ClassificationEngine.group(types),
+        "columns": types
+    }
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException
+
+from backend.config import KENDALL_MAX_ROWS
+from backend.core.dataset_store import load_dataset
+from backend.core.metrics import span
+from backend.core.result_cache import result_cache
+from backend.engines.correlation_engine import CorrelationEngine
+from backend.engines.dataset_stats import DatasetStats
+from backend.services.correlation import (
+    calculate_correlation_matrix,
+    detect_strong_correlations,
+    generate_heatmap_data
+)
+
+router = APIRouter()
+
+
+@router.get("/{dataset_id}")
+def get_correlation(dataset_id: str, method: str = "pearson", threshold: float = 0.8):
+    """
+    method: pearson, spearman (Pearson over cached column ranks, robust
+    to skewed columns) or kendall (tau-b; estimated from a row sample
+    on large datasets).
+    """
+
+    if method not in CorrelationEngine.METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"method must be one of: {', '.join(CorrelationEngine.METHODS)}"
+        )
+
+    return result_cache.get_or_compute(
+        dataset_id,
+        f"correlation-response-{method}-{threshold}",
+        lambda: build_correlation(dataset_id, method, threshold)
+    )
+
+
+def build_correlation(dataset_id: str, method: str, threshold: float):
+
+    df = load_dataset(dataset_id)
+    stats = DatasetStats(df, dataset_id)
+
+    with span(f"correlation.{method}", stats.rows):
+        matrix = calculate_correlation_matrix(df, stats, method)
+        strong_pairs = detect_strong_correlations(df, threshold, stats=stats, method=method)
+        heatmap = generate_heatmap_data(df, stats=stats, method=method)
+
+    return {
+        "method": method,
+        "rows": stats.rows,
+        "sampled": method == "kendall" and stats.rows > KENDALL_MAX_ROWS,
+        "matrix": {
+            k: {kk: float(vv) for kk, vv in v.items()}
+            for k, v in matrix.items()
+        },
+        "strong_pairs": strong_pairs,
+        "heatmap": heatmap,
+    }
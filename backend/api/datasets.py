@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+
+from backend.core.registry import dataset_record, registry
+
+router = APIRouter()
+
+
+@router.get("")
+def list_datasets(limit: int = 100, offset: int = 0):
+    """
+    Registered datasets, newest first.
+    """
+
+    return registry.list(limit=min(max(limit, 1), 1000), offset=max(offset, 0))
+
+
+@router.get("/{dataset_id}")
+def get_dataset(dataset_id: str):
+    """
+    Source file, columnar store, schema, inferred types, size,
+    fingerprint and cached statistics of one dataset.
+    """
+
+    return dataset_record(dataset_id)
@@ -1,15 +1,21 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 import os
 import pandas as pd
 import numpy as np
 
-router = APIRouter()
-
-UPLOAD_DIR = "backend/storage/uploads"
-CLEAN_DIR = "backend/storage/cleaned"
+from backend.core.csv_pages import read_csv_page
+from backend.core.dataset_store import read_rows
+from backend.core.exceptions import DatasetNotFoundException
+from backend.services.export_service import (
+    EXPORT_FORMATS,
+    cleaned_path as cleaned_file_path,
+    export_cleaned,
+    has_cleaning_plan,
+    materialize_cleaned,
+)
 
-os.makedirs(CLEAN_DIR, exist_ok=True)
+router = APIRouter()
 
 # =====================================================
 # DATASET PREVIEW (JSON SAFE + FAST + PAGINATION SAFE)
@@ -18,24 +24,29 @@ os.makedirs(CLEAN_DIR, exist_ok=True)
 @router.get("/preview/{dataset_id}")
 def preview_dataset(dataset_id: str, page: int = 1, page_size: int = 20):
 
-    cleaned_path = os.path.join(CLEAN_DIR, f"{dataset_id}.csv")
-    original_path = os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
+    # Safe pagination
+    page = max(page, 1)
+    page_size = max(page_size, 1)
 
-    # Priority: cleaned first
-    if os.path.exists(cleaned_path):
-        file_path = cleaned_path
-    elif os.path.exists(original_path):
-        file_path = original_path
-    else:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    start = (page - 1) * page_size
 
+    # Priority: cleaned first (written from the cleaning plan on first
+    # preview), otherwise the columnar copy of the upload. Only the
+    # requested page is parsed (byte-offset index / Arrow slice)
     try:
-        df = pd.read_csv(file_path)
+        cleaned_path = materialize_cleaned(dataset_id)
+
+        page_df, total_rows = read_page(dataset_id, cleaned_path, start, page_size)
+
+        if total_rows and start >= total_rows:
+            start = 0
+            page_df, total_rows = read_page(dataset_id, cleaned_path, start, page_size)
+
+    except DatasetNotFoundException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading dataset: {str(e)}")
 
-    total_rows = len(df)
-
     if total_rows == 0:
         return {
             "columns": [],
@@ -43,24 +54,12 @@ def preview_dataset(dataset_id: str, page: int = 1, page_size: int = 20):
             "total_rows": 0
         }
 
-    # Safe pagination
-    page = max(page, 1)
-    page_size = max(page_size, 1)
-
-    start = (page - 1) * page_size
-    end = start + page_size
-
-    if start >= total_rows:
-        start = 0
-        end = page_size
-
-    page_df = df.iloc[start:end]
-
     # =====================================================
     # ENTERPRISE SAFE JSON CLEANING
     # =====================================================
 
-    page_df = page_df.replace([np.inf, -np.inf], np.nan)
+    # object first: float columns would turn None back into NaN
+    page_df = page_df.replace([np.inf, -np.inf], np.nan).astype(object)
     page_df = page_df.where(pd.notnull(page_df), None)
 
     return {
@@ -70,20 +69,61 @@ def preview_dataset(dataset_id: str, page: int = 1, page_size: int = 20):
     }
 
 
+def read_page(dataset_id: str, cleaned_path: str, start: int, count: int):
+
+    if cleaned_path is None:
+        return read_rows(dataset_id, start, count)
+
+    page = read_csv_page(cleaned_path, start, count)
+
+    if page is None:
+        # Cleaned file written before page indexes existed
+        df = pd.read_csv(cleaned_path)
+        return df.iloc[start:start + count], len(df)
+
+    return page
+
+
 # =====================================================
 # DOWNLOAD CLEANED DATASET
 # =====================================================
 
 @router.get("/{dataset_id}")
-def download_cleaned(dataset_id: str):
-
-    cleaned_path = os.path.join(CLEAN_DIR, f"{dataset_id}.csv")
-
-    if not os.path.exists(cleaned_path):
+def download_cleaned(dataset_id: str, format: str = "csv"):
+    """
+    format: csv, csv.gz, csv.zst, parquet or arrow. Streamed block by
+    block from the cleaning plan; a cleaned CSV already on disk is
+    served as-is.
+    """
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    cleaned_path = cleaned_file_path(dataset_id)
+    media_type, suffix = EXPORT_FORMATS[format]
+
+    if format == "csv" and os.path.exists(cleaned_path):
+        return FileResponse(
+            cleaned_path,
+            media_type=media_type,
+            filename=f"{dataset_id}_cleaned.csv"
+        )
+
+    if not has_cleaning_plan(dataset_id) and not os.path.exists(cleaned_path):
         raise HTTPException(status_code=404, detail="Cleaned dataset not found")
 
-    return FileResponse(
-        cleaned_path,
-        media_type="text/csv",
-        filename=f"{dataset_id}_cleaned.csv"
-    )
\ No newline at end of file
+    try:
+        content = export_cleaned(dataset_id, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{dataset_id}_cleaned.{suffix}"'
+        }
+    )
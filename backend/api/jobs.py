@@ -0,0 +1,92 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+
+from backend.core.dataset_store import dataset_exists
+from backend.core.exceptions import DatasetNotFoundException
+from backend.core.job_queue import job_queue
+from backend.api.analytics import resolve_sample, submit_analytics
+from backend.api.simulate import resolve_grid, submit_simulation, submit_simulation_grid
+
+router = APIRouter()
+
+
+# =====================================================
+# SUBMIT
+# =====================================================
+
+@router.post("/analytics/{dataset_id}", status_code=202)
+def submit_analytics_job(
+    dataset_id: str,
+    streaming: Optional[bool] = None,
+    sample: Optional[str] = None,
+    sample_method: str = "stratified",
+    priority: int = 0
+):
+
+    if not dataset_exists(dataset_id):
+        raise DatasetNotFoundException()
+
+    sample_size = resolve_sample(dataset_id, sample, sample_method)
+
+    return job_status(submit_analytics(dataset_id, streaming, priority, sample_size, sample_method))
+
+
+@router.post("/simulate/{dataset_id}", status_code=202)
+def submit_simulation_job(dataset_id: str, payload: dict, priority: int = 0):
+
+    if not dataset_exists(dataset_id):
+        raise DatasetNotFoundException()
+
+    return job_status(submit_simulation(dataset_id, payload, priority))
+
+
+@router.post("/simulate-grid/{dataset_id}", status_code=202)
+def submit_simulation_grid_job(dataset_id: str, grid: dict, priority: int = 0):
+
+    if not dataset_exists(dataset_id):
+        raise DatasetNotFoundException()
+
+    return job_status(submit_simulation_grid(dataset_id, resolve_grid(grid), priority))
+
+
+# =====================================================
+# STATUS / RESULT
+# =====================================================
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+
+    return job_status(find_job(job_id))
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str):
+
+    job = find_job(job_id)
+
+    # Still queued or running: report status instead
+    if not job.future.done():
+        return JSONResponse(status_code=202, content=job_status(job))
+
+    # Re-raises a failed job's error through the usual exception handlers
+    return job.future.result()
+
+
+def find_job(job_id: str):
+
+    job = job_queue.get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
+
+
+def job_status(job) -> dict:
+
+    status = job.to_dict()
+    status["queue_position"] = job_queue.position(job)
+
+    return status
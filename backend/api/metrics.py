@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.core.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse)
+def metrics():
+    """
+    Request latency and stage timings in the Prometheus text format.
+    """
+
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
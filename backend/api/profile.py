@@ -1,35 +1,34 @@
-from fastapi import APIRouter, HTTPException
-import pandas as pd
-import os
+from fastapi import APIRouter
 
-router = APIRouter()
-
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-UPLOAD_DIR = os.path.join(BASE_DIR, "storage", "uploads")
+from backend.config import COMPACT_FRAMES
+from backend.core.compact_dtypes import compact_frame
+from backend.core.dataset_store import load_dataset
+from backend.core.metrics import span
+from backend.core.registry import dataset_record, registry
+from backend.core.result_cache import result_cache
+from backend.engines.dataset_stats import DatasetStats
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+router = APIRouter()
 
 
-def calculate_quality_score(df):
-    total_cells = df.shape[0] * df.shape[1]
+def calculate_quality_score(stats: DatasetStats):
+    total_cells = stats.total_cells
 
     if total_cells == 0:
         return 0
 
-    missing_ratio = df.isnull().sum().sum() / total_cells
-    duplicate_ratio = df.duplicated().sum() / len(df)
+    missing_ratio = stats.total_missing / total_cells
+    duplicate_ratio = stats.duplicate_count / stats.rows
 
     score = 100 - ((missing_ratio * 50) + (duplicate_ratio * 50))
     return round(max(score, 0), 2)
 
 
-def calculate_importance(df):
-    numeric_df = df.select_dtypes(include=["number"])
-
-    if numeric_df.empty:
+def calculate_importance(stats: DatasetStats):
+    if not stats.numeric_columns:
         return {}
 
-    importance = numeric_df.var().sort_values(ascending=False)
+    importance = stats.var.sort_values(ascending=False)
 
     return {
         col: round(val, 2)
@@ -39,31 +38,40 @@ def calculate_importance(df):
 
 @router.get("/{dataset_id}")
 def get_profile(dataset_id: str):
+    """
+    Served from the dataset's registry record once computed.
+    """
 
-    file_path = os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
+    record = dataset_record(dataset_id)
 
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    if "profile" in record["stats"]:
+        return record["stats"]["profile"]
 
-    df = pd.read_csv(file_path)
+    profile = result_cache.get_or_compute(
+        dataset_id,
+        "profile",
+        lambda: build_profile(dataset_id)
+    )
 
-    rows = len(df)
-    cols = len(df.columns)
+    registry.save_stats(dataset_id, "profile", profile, record["fingerprint"])
 
-    total_cells = rows * cols
+    return profile
 
-    missing_pct = (
-        (df.isnull().sum().sum() / total_cells) * 100
-        if total_cells > 0 else 0
-    )
 
-    duplicate_pct = (
-        (df.duplicated().sum() / rows) * 100
-        if rows > 0 else 0
-    )
+def build_profile(dataset_id: str):
+
+    df = load_dataset(dataset_id)
+    stats = DatasetStats(df, dataset_id)
+
+    rows = stats.rows
+    cols = len(stats.columns)
 
-    quality_score = calculate_quality_score(df)
-    importance = calculate_importance(df)
+    with span("profile.statistics", rows):
+        missing_pct = stats.missing_percentage
+        duplicate_pct = stats.duplicate_percentage
+
+        quality_score = calculate_quality_score(stats)
+        importance = calculate_importance(stats)
 
     return {
         "rows": rows,
@@ -72,4 +80,24 @@ def get_profile(dataset_id: str):
         "duplicate_percentage": round(duplicate_pct, 2),
         "quality_score": quality_score,
         "importance": importance
-    }
\ No newline at end of file
+    }
+
+@router.get("/{dataset_id}/memory")
+def get_memory_report(dataset_id: str):
+    """
+    Per-column in-memory size with the default dtypes and with the
+    compact loader mode (DQ_COMPACT_FRAMES).
+    """
+
+    return result_cache.get_or_compute(
+        dataset_id,
+        "memory",
+        lambda: build_memory_report(dataset_id)
+    )
+
+
+def build_memory_report(dataset_id: str):
+
+    _, report = compact_frame(load_dataset(dataset_id, compact=False))
+
+    return {"compact_mode": COMPACT_FRAMES, **report}
@@ -1,28 +1,23 @@
-from fastapi import APIRouter, HTTPException
-import pandas as pd
-import os
+from fastapi import APIRouter
 
-router = APIRouter()
+from backend.core.dataset_store import load_dataset
+from backend.engines.dataset_stats import DatasetStats
 
-UPLOAD_DIR = "backend/storage/uploads"
+router = APIRouter()
 
 
 @router.get("/{dataset_id}")
 def recommend(dataset_id: str):
 
-    file_path = os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
-
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Dataset not found")
-
-    df = pd.read_csv(file_path)
+    df = load_dataset(dataset_id)
+    stats = DatasetStats(df, dataset_id)
 
     recommendations = []
 
-    if df.isnull().sum().sum() > 0:
+    if stats.total_missing > 0:
         recommendations.append("Dataset contains missing values.")
 
-    if df.duplicated().sum() > 0:
+    if stats.duplicate_count > 0:
         recommendations.append("Dataset contains duplicate rows.")
 
     return {"recommendations": recommendations}
\ No newline at end of file
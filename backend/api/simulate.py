@@ -1,137 +1,145 @@
 from fastapi import APIRouter, HTTPException
-import os
-import pandas as pd
-import numpy as np
+import asyncio
 
+from backend.core.dataset_store import load_dataset
+from backend.core.job_queue import job_queue, report_progress
+from backend.core.metrics import span
+from backend.engines.dataset_stats import DatasetStats
 from backend.engines.scoring_engine import ScoringEngine
 from backend.engines.outlier_engine import OutlierEngine
+from backend.services.export_service import save_cleaning_plan
+from backend.services.simulation_service import (
+    build_cleaning_plan,
+    expand_grid,
+    readiness_after,
+    run_simulation_grid,
+)
 
 router = APIRouter()
 
-UPLOAD_DIR = "backend/storage/uploads"
-CLEAN_DIR = "backend/storage/cleaned"
+@router.post("/{dataset_id}/grid")
+async def simulate_grid(dataset_id: str, grid: dict, priority: int = 0):
+    """
+    Score every combination of the listed options in one request, e.g.
+    {"handle_missing": [false, true], "outlier_method": ["none", "iqr"],
+    "drop_columns": [[], ["id"]]}. Omitted options use GRID_DEFAULTS.
+    Nothing is written to disk.
+    """
 
-os.makedirs(CLEAN_DIR, exist_ok=True)
+    job = submit_simulation_grid(dataset_id, resolve_grid(grid), priority)
 
-@router.post("/{dataset_id}")
-def simulate(dataset_id: str, payload: dict):
+    return await asyncio.wrap_future(job.future)
 
-    file_path = os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
 
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Dataset not found")
+def resolve_grid(grid: dict) -> dict:
+    """
+    The grid, checked before it is queued (400 if expand_grid rejects it).
+    """
 
-    # ================= LOAD ORIGINAL =================
-    df_original = pd.read_csv(file_path)
-    original_rows = len(df_original)
+    try:
+        expand_grid(grid)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # ================= BEFORE METRICS =================
-    total_cells = len(df_original) * len(df_original.columns)
+    return grid
 
-    missing_pct = (
-        (df_original.isnull().sum().sum() / total_cells) * 100
-        if total_cells > 0 else 0
-    )
 
-    duplicate_pct = (
-        (df_original.duplicated().sum() / len(df_original)) * 100
-        if len(df_original) > 0 else 0
-    )
+def submit_simulation_grid(dataset_id: str, grid: dict, priority: int = 0):
 
-    outlier_pct = OutlierEngine.detect_percentage(
-        df_original,
-        payload.get("outlier_method", "iqr")
+    return job_queue.submit(
+        "simulate-grid",
+        dataset_id,
+        lambda: run_simulation_grid(dataset_id, grid),
+        priority=priority
     )
 
-    # ✅ NEW — Temporary noisy percentage (until you implement real logic)
-    noisy_pct = 0
-
-    score_before = ScoringEngine.calculate_score(
-        missing_pct,
-        duplicate_pct,
-        outlier_pct,
-        noisy_pct
-    )
 
-    # ================= START CLEANING =================
-    df_clean = df_original.copy()
+@router.post("/{dataset_id}")
+async def simulate(dataset_id: str, payload: dict, priority: int = 0):
 
-    drop_cols = payload.get("drop_columns", [])
-    if drop_cols:
-        df_clean = df_clean.drop(columns=drop_cols, errors="ignore")
+    # Runs on the job queue (see /jobs for the non-blocking variant)
+    job = submit_simulation(dataset_id, payload, priority)
 
-    if payload.get("handle_missing"):
-        numeric_cols = df_clean.select_dtypes(include=[np.number]).columns
-        df_clean[numeric_cols] = df_clean[numeric_cols].fillna(
-            df_clean[numeric_cols].median()
-        )
+    return await asyncio.wrap_future(job.future)
 
-        categorical_cols = df_clean.select_dtypes(exclude=[np.number]).columns
-        for col in categorical_cols:
-            if df_clean[col].isnull().any():
-                mode_series = df_clean[col].mode()
-                df_clean[col] = df_clean[col].fillna(
-                    mode_series.iloc[0] if not mode_series.empty else "Unknown"
-                )
-
-    if payload.get("remove_duplicates"):
-        df_clean = df_clean.drop_duplicates()
-
-    if payload.get("outlier_method") and payload.get("outlier_method") != "none":
-        df_clean = OutlierEngine.remove_outliers(
-            df_clean,
-            payload.get("outlier_method")
-        )
 
-    # ================= AFTER METRICS =================
-    total_cells_after = len(df_clean) * len(df_clean.columns)
+def submit_simulation(dataset_id: str, payload: dict, priority: int = 0):
 
-    missing_pct_after = (
-        (df_clean.isnull().sum().sum() / total_cells_after) * 100
-        if total_cells_after > 0 else 0
+    return job_queue.submit(
+        "simulate",
+        dataset_id,
+        lambda: run_simulation(dataset_id, payload),
+        priority=priority
     )
 
-    duplicate_pct_after = (
-        (df_clean.duplicated().sum() / len(df_clean)) * 100
-        if len(df_clean) > 0 else 0
-    )
 
-    outlier_pct_after = OutlierEngine.detect_percentage(
-        df_clean,
-        payload.get("outlier_method", "iqr")
-    )
+def run_simulation(dataset_id: str, payload: dict):
 
-    # ✅ NEW — Temporary noisy percentage after cleaning
-    noisy_pct_after = 0
+    # ================= LOAD ORIGINAL =================
+    report_progress(0.05, "loading")
+    df_original = load_dataset(dataset_id)
+    original_rows = len(df_original)
 
-    score_after = ScoringEngine.calculate_score(
-        missing_pct_after,
-        duplicate_pct_after,
-        outlier_pct_after,
-        noisy_pct_after
-    )
+    # ================= BEFORE METRICS =================
+    stats_before = DatasetStats(df_original, dataset_id)
+
+    with span("simulate.before", original_rows):
+        # IsolationForest models are fitted on the stored dataset and reused
+        # for the cleaned frame, so both sides are scored by the same model
+        outlier_pct = OutlierEngine.detect_percentage(
+            df_original,
+            payload.get("outlier_method", "iqr"),
+            stats_before,
+            dataset_id
+        )
+
+        # ✅ NEW — Temporary noisy percentage (until you implement real logic)
+        noisy_pct = 0
+
+        score_before = ScoringEngine.calculate_score_from_stats(
+            stats_before,
+            outlier_pct,
+            noisy_pct
+        )
+
+    # ================= CLEANING PLAN =================
+    # Steps only record a projection, fill values and a row mask over
+    # the original frame; nothing is copied. Row hashes follow the plan,
+    # re-hashing only filled rows.
+    report_progress(0.4, "cleaning")
+    with span("simulate.plan", original_rows):
+        plan = build_cleaning_plan(df_original, payload, stats_before.row_index, dataset_id)
+
+    # ================= AFTER METRICS =================
+    report_progress(0.7, "scoring")
+    with span("simulate.after", original_rows):
+        outlier_pct_after = plan.outlier_percentage(payload.get("outlier_method", "iqr"))
+
+        # ✅ NEW — Temporary noisy percentage after cleaning
+        noisy_pct_after = 0
+
+        score_after = ScoringEngine.calculate_score(
+            plan.missing_percentage,
+            plan.duplicate_percentage,
+            outlier_pct_after,
+            noisy_pct_after
+        )
 
     # ================= ML READINESS AFTER =================
-    if score_after < 60:
-        readiness = {"label": "Not Ready", "color": "red"}
-    elif score_after < 75:
-        readiness = {"label": "Needs Work", "color": "orange"}
-    elif score_after < 90:
-        readiness = {"label": "Good", "color": "blue"}
-    else:
-        readiness = {"label": "ML Ready", "color": "green"}
-
-    # ================= SAVE CLEANED FILE =================
-    cleaned_path = os.path.join(CLEAN_DIR, f"{dataset_id}.csv")
-    df_clean = df_clean.replace([np.inf, -np.inf], np.nan)
-    df_clean.to_csv(cleaned_path, index=False)
+    readiness = readiness_after(score_after)
+
+    # ================= SAVE CLEANING PLAN =================
+    # The cleaned file is built from the plan when a preview or download
+    # first asks for it
+    report_progress(0.9, "saving")
+    save_cleaning_plan(dataset_id, payload)
 
     return {
         "score_before": round(score_before, 2),
         "score_after": round(score_after, 2),
         "improvement": round(score_after - score_before, 2),
         "rows_before": original_rows,
-        "rows_after": len(df_clean),
-        "rows_removed": original_rows - len(df_clean),
+        "rows_after": plan.rows,
+        "rows_removed": original_rows - plan.rows,
         "ml_readiness_after": readiness
     }
\ No newline at end of file
@@ -1,12 +1,28 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from starlette.concurrency import run_in_threadpool
 import os
 import uuid
-import pandas as pd
 
-router = APIRouter()
+from backend.core.csv_ingest import CSVStreamValidator, UPLOAD_CHUNK_SIZE
+from backend.core.dataset_store import (
+    dataset_exists,
+    original_path,
+    columnar_path,
+    metadata_path,
+    row_index_path,
+    convert_upload,
+    link_dataset,
+    load_metadata,
+    save_metadata,
+    shared_columns_dir,
+)
+from backend.core.exceptions import DatasetNotFoundException
+from backend.core.registry import register_copy, register_dataset, registry
+from backend.core.row_index import build_row_index
+from backend.core.shared_columns import discard_shared_columns
+from backend.services.append_service import append_batch
 
-UPLOAD_DIR = "backend/storage/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+router = APIRouter()
 
 
 @router.post("/")
@@ -16,26 +32,63 @@ async def upload_file(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only CSV files allowed")
 
     dataset_id = str(uuid.uuid4())
-    file_path = os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
+    file_path = original_path(dataset_id)
 
     try:
-        contents = await file.read()
+        # 🔥 Stream to disk in fixed-size chunks, validating as they arrive
+        validator = CSVStreamValidator()
 
         with open(file_path, "wb") as f:
-            f.write(contents)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                validator.feed(chunk)
+                await run_in_threadpool(f.write, chunk)
+
+        validator.close()
 
-        # 🔥 Robust CSV validation
-        try:
-            df = pd.read_csv(file_path, sep=None, engine="python")
-        except UnicodeDecodeError:
-            df = pd.read_csv(file_path, sep=None, engine="python", encoding="latin1")
+        # Same bytes as a stored dataset: share its files and results
+        source = await run_in_threadpool(find_stored_copy, validator.fingerprint)
 
-        if df.empty:
-            raise ValueError("CSV file is empty")
+        if source is not None:
+            await run_in_threadpool(link_dataset, source["dataset_id"], dataset_id)
+        else:
+            # Parse once (chunked), reload from the columnar copy everywhere else
+            await run_in_threadpool(
+                convert_upload,
+                dataset_id,
+                sep=validator.delimiter,
+                encoding=validator.encoding
+            )
+
+            # Row hashes once, so duplicate checks never re-hash the frame
+            await run_in_threadpool(build_row_index, dataset_id)
+
+        save_metadata(
+            dataset_id,
+            filename=file.filename,
+            encoding=validator.encoding,
+            delimiter=validator.delimiter,
+            fingerprint=validator.fingerprint,
+            size_bytes=validator.bytes_seen
+        )
+
+        if source is not None:
+            await run_in_threadpool(register_copy, dataset_id, source)
+        else:
+            await run_in_threadpool(register_dataset, dataset_id)
 
     except Exception as e:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        await run_in_threadpool(registry.delete, dataset_id)
+
+        for path in (
+            file_path,
+            columnar_path(dataset_id),
+            metadata_path(dataset_id),
+            row_index_path(dataset_id)
+        ):
+            if os.path.exists(path):
+                os.remove(path)
+
+        discard_shared_columns(shared_columns_dir(dataset_id))
 
         raise HTTPException(
             status_code=400,
@@ -45,5 +98,71 @@ async def upload_file(file: UploadFile = File(...)):
     return {
         "dataset_id": dataset_id,
         "filename": file.filename,
+        "deduplicated": source is not None,
         "message": "File uploaded successfully"
-    }
\ No newline at end of file
+    }
+
+
+def find_stored_copy(fingerprint: str):
+    """
+    Registry record of a stored dataset with exactly these bytes whose
+    files are still in place, or None.
+    """
+
+    source = registry.find(fingerprint)
+
+    if source is None or not os.path.exists(columnar_path(source["dataset_id"])):
+        return None
+
+    # Appended to since it was registered
+    if load_metadata(source["dataset_id"]).get("fingerprint") != fingerprint:
+        return None
+
+    return source
+
+
+@router.post("/{dataset_id}/append")
+async def append_file(dataset_id: str, file: UploadFile = File(...)):
+    """
+    Append a CSV batch with the same columns to an existing dataset.
+    Metrics are updated from the new rows only; cached results for the
+    dataset are dropped.
+    """
+
+    if not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only CSV files allowed")
+
+    if not dataset_exists(dataset_id):
+        raise DatasetNotFoundException()
+
+    batch_path = f"{original_path(dataset_id)}.{uuid.uuid4()}.append"
+
+    try:
+        validator = CSVStreamValidator()
+
+        with open(batch_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                validator.feed(chunk)
+                await run_in_threadpool(f.write, chunk)
+
+        validator.close()
+
+        return await run_in_threadpool(
+            append_batch,
+            dataset_id,
+            batch_path,
+            sep=validator.delimiter,
+            encoding=validator.encoding,
+            fingerprint=validator.fingerprint,
+            size_bytes=validator.bytes_seen
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid CSV batch: {str(e)}"
+        )
+
+    finally:
+        if os.path.exists(batch_path):
+            os.remove(batch_path)
@@ -2,9 +2,57 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-STORAGE_DIR = os.path.join(BASE_DIR, "storage")
+STORAGE_DIR = os.getenv("DQ_STORAGE_DIR", os.path.join(BASE_DIR, "storage"))
 UPLOAD_DIR = os.path.join(STORAGE_DIR, "uploads")
 CLEANED_DIR = os.path.join(STORAGE_DIR, "cleaned")
+COLUMNAR_DIR = os.path.join(STORAGE_DIR, "columnar")
+CACHE_DIR = os.path.join(STORAGE_DIR, "cache")
+
+# Result cache budgets (in-memory LRU tier / on-disk tier)
+RESULT_CACHE_MEMORY_BYTES = int(os.getenv("DQ_RESULT_CACHE_MEMORY_MB", "256")) * 1024 * 1024
+RESULT_CACHE_DISK_BYTES = int(os.getenv("DQ_RESULT_CACHE_DISK_MB", "2048")) * 1024 * 1024
+
+# Datasets whose columnar file is at least this large are profiled in chunks
+STREAMING_PROFILE_THRESHOLD_BYTES = int(os.getenv("DQ_STREAMING_PROFILE_MB", "1024")) * 1024 * 1024
+
+# IsolationForest: rows used to fit, parallel jobs, fitted models kept in memory
+ISOLATION_FOREST_FIT_ROWS = int(os.getenv("DQ_IFOREST_FIT_ROWS", "100000"))
+ISOLATION_FOREST_N_JOBS = int(os.getenv("DQ_IFOREST_N_JOBS", "-1"))
+OUTLIER_MODEL_CACHE_SIZE = int(os.getenv("DQ_OUTLIER_MODEL_CACHE_SIZE", "32"))
+
+# Background jobs: worker threads, finished jobs kept for status/result lookups
+JOB_WORKERS = int(os.getenv("DQ_JOB_WORKERS", "2"))
+JOB_HISTORY_SIZE = int(os.getenv("DQ_JOB_HISTORY_SIZE", "200"))
+
+# Simulation grid: most scenarios one request may expand to
+SIMULATION_GRID_MAX_SCENARIOS = int(os.getenv("DQ_SIMULATION_GRID_MAX_SCENARIOS", "64"))
+
+# CPU-bound engine stages: "inline" or "process" (0 processes = one per core)
+ENGINE_EXECUTOR = os.getenv("DQ_ENGINE_EXECUTOR", "inline")
+ENGINE_PROCESSES = int(os.getenv("DQ_ENGINE_PROCESSES", "0"))
+
+# Compact loader mode: narrow numerics, categorical low-cardinality text
+# (distinct values at most this share of the rows)
+COMPACT_FRAMES = os.getenv("DQ_COMPACT_FRAMES", "false").lower() == "true"
+COMPACT_CATEGORY_RATIO = float(os.getenv("DQ_COMPACT_CATEGORY_RATIO", "0.5"))
+
+# Load numeric columns as memory-mapped .npy views shared by every worker
+# process (instead of a private copy per process)
+SHARED_COLUMNS = os.getenv("DQ_SHARED_COLUMNS", "true").lower() == "true"
+
+# Add a Server-Timing header (stage spans) to API responses
+SERVER_TIMING = os.getenv("DQ_SERVER_TIMING", "false").lower() == "true"
+
+# Kendall tau-b: pairs with more shared rows use a stratified row sample
+KENDALL_MAX_ROWS = int(os.getenv("DQ_KENDALL_MAX_ROWS", "20000"))
+
+# Type inference: non-null values sampled per column
+CLASSIFY_SAMPLE_ROWS = int(os.getenv("DQ_CLASSIFY_SAMPLE_ROWS", "10000"))
+
+# Dataset registry (any SQLAlchemy URL; SQLite file in storage by default)
+REGISTRY_URL = os.getenv("DQ_REGISTRY_URL", f"sqlite:///{os.path.join(STORAGE_DIR, 'registry.db')}")
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(CLEANED_DIR, exist_ok=True)
\ No newline at end of file
+os.makedirs(CLEANED_DIR, exist_ok=True)
+os.makedirs(COLUMNAR_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
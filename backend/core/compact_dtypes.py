@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from backend.config import COMPACT_CATEGORY_RATIO
+
+
+def _is_text(series: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def compact_column(series: pd.Series, category_ratio: float = COMPACT_CATEGORY_RATIO) -> pd.Series:
+    """
+    Smallest dtype that holds the same values:
+
+    - integers downcast to the narrowest integer type
+    - floats to float32 when every value survives the round trip
+    - text with few distinct values (at most category_ratio of the
+      rows) dictionary-encoded as categorical, other text as
+      Arrow-backed strings
+    """
+
+    if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+
+    if pd.api.types.is_integer_dtype(series) and series.dtype.kind in "iu":
+        return pd.to_numeric(series, downcast="unsigned" if series.dtype.kind == "u" else "integer")
+
+    if series.dtype == np.float64:
+        values = series.to_numpy()
+        narrow = values.astype(np.float32)
+        if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+            return series.astype(np.float32)
+        return series
+
+    if _is_text(series):
+        distinct = series.nunique(dropna=True)
+
+        # All-null columns stay strings: fills may add unseen values
+        if 0 < distinct <= category_ratio * len(series):
+            return series.astype("category")
+
+        if pd.api.types.is_object_dtype(series):
+            return series.astype(pd.StringDtype("pyarrow", na_value=np.nan))
+
+    return series
+
+
+def compact_frame(df: pd.DataFrame, category_ratio: float = COMPACT_CATEGORY_RATIO):
+    """
+    Compacted copy of df and a per-column memory report (bytes before
+    and after, deep).
+    """
+
+    compacted = {}
+    columns = []
+
+    for col in df.columns:
+
+        before = df[col]
+        after = compact_column(before, category_ratio)
+        compacted[col] = after
+
+        columns.append({
+            "column": col,
+            "dtype_before": str(before.dtype),
+            "dtype_after": str(after.dtype),
+            "bytes_before": int(before.memory_usage(index=False, deep=True)),
+            "bytes_after": int(after.memory_usage(index=False, deep=True)),
+        })
+
+    compact = pd.DataFrame(compacted, index=df.index)
+
+    bytes_before = sum(c["bytes_before"] for c in columns)
+    bytes_after = sum(c["bytes_after"] for c in columns)
+
+    return compact, {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "ratio": round(bytes_before / bytes_after, 2) if bytes_after else None,
+        "columns": columns,
+    }
@@ -0,0 +1,110 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Byte offset recorded every this many data rows
+PAGE_INDEX_ROWS = 1000
+
+
+def page_index_path(csv_path: str) -> str:
+    return f"{csv_path}.pages.npz"
+
+
+# =====================================================
+# WRITE
+# =====================================================
+
+def write_csv_with_index(df: pd.DataFrame, csv_path: str):
+    """
+    Write df as CSV (same bytes as df.to_csv(index=False)) and store the
+    byte offset of every PAGE_INDEX_ROWS-th row next to it.
+
+    Offsets are taken from the file position between row blocks, so
+    quoted fields with embedded newlines never confuse the index.
+    """
+
+    offsets = []
+
+    tmp_path = f"{csv_path}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        df.iloc[:0].to_csv(f, index=False)
+
+        for start in range(0, len(df), PAGE_INDEX_ROWS):
+            offsets.append(f.tell())
+            df.iloc[start:start + PAGE_INDEX_ROWS].to_csv(f, header=False, index=False)
+
+        size = f.tell()
+
+    meta = {
+        "rows": len(df),
+        "size": size,
+        "columns": [str(col) for col in df.columns],
+        "dtypes": [str(dtype) for dtype in df.dtypes],
+    }
+
+    os.replace(tmp_path, csv_path)
+
+    index_path = page_index_path(csv_path)
+    tmp_index = f"{index_path}.tmp.npz"
+    np.savez(tmp_index, offsets=np.asarray(offsets, dtype=np.int64), meta=json.dumps(meta))
+    os.replace(tmp_index, index_path)
+
+
+# =====================================================
+# READ
+# =====================================================
+
+def read_csv_page(csv_path: str, start: int, count: int):
+    """
+    Parse only rows [start, start + count) of an indexed CSV.
+
+    Returns (page_df, total_rows), or None when the file has no index
+    or was rewritten without one.
+    """
+
+    index_path = page_index_path(csv_path)
+
+    if not os.path.exists(index_path):
+        return None
+
+    with np.load(index_path) as index:
+        offsets = index["offsets"]
+        meta = json.loads(str(index["meta"]))
+
+    if meta["size"] != os.path.getsize(csv_path):
+        return None
+
+    if start >= meta["rows"]:
+        return pd.DataFrame(columns=meta["columns"]), meta["rows"]
+
+    block = start // PAGE_INDEX_ROWS
+    skip = start - block * PAGE_INDEX_ROWS
+    count = min(count, meta["rows"] - start)
+
+    # Same dtypes as a full parse, so a page never types differently
+    dtypes = {
+        col: dtype
+        for col, dtype in zip(meta["columns"], meta["dtypes"])
+        if not dtype.startswith("datetime")
+    }
+
+    with open(csv_path, "rb") as f:
+        f.seek(int(offsets[block]))
+        page_df = pd.read_csv(
+            f,
+            header=None,
+            names=meta["columns"],
+            dtype=dtypes,
+            nrows=skip + count
+        )
+
+    # Rows before start are parsed and dropped rather than skipped as
+    # lines, which would miscount quoted multi-line fields
+    page_df = page_df.iloc[skip:]
+    page_df.index = pd.RangeIndex(start, start + len(page_df))
+
+    return page_df, meta["rows"]
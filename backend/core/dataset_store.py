@@ -0,0 +1,494 @@
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from backend.config import UPLOAD_DIR, COLUMNAR_DIR, COMPACT_FRAMES, SHARED_COLUMNS
+from backend.core.compact_dtypes import compact_frame
+from backend.core.csv_ingest import csv_to_columnar
+from backend.core.exceptions import DatasetNotFoundException
+from backend.core.metrics import span
+from backend.core.shared_columns import (
+    derived_column_arrays,
+    extend_shared_columns,
+    file_identity,
+    link_shared_columns,
+    shared_column_arrays,
+    unshare_file,
+)
+
+
+# End-of-stream marker of the Arrow IPC stream format
+STREAM_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+# =====================================================
+# PATHS
+# =====================================================
+
+def original_path(dataset_id: str) -> str:
+    return os.path.join(UPLOAD_DIR, f"{dataset_id}.csv")
+
+
+def columnar_path(dataset_id: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.arrow")
+
+
+def appended_path(dataset_id: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.append.arrows")
+
+
+def metadata_path(dataset_id: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.json")
+
+
+def shared_columns_dir(dataset_id: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.columns")
+
+
+def derived_columns_dir(dataset_id: str, kind: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.{kind}")
+
+
+def row_index_path(dataset_id: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.rows.npy")
+
+
+def first_rows_dir(dataset_id: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.firsts")
+
+
+def profile_state_path(dataset_id: str) -> str:
+    return os.path.join(COLUMNAR_DIR, f"{dataset_id}.profile.pkl")
+
+
+def dataset_exists(dataset_id: str) -> bool:
+    return (
+        os.path.exists(columnar_path(dataset_id))
+        or os.path.exists(original_path(dataset_id))
+    )
+
+
+# =====================================================
+# WRITE
+# =====================================================
+
+def convert_upload(dataset_id: str, sep: str = ",", encoding: str = "utf-8") -> int:
+    """
+    Convert the stored CSV upload to an uncompressed Arrow IPC file.
+
+    The dtypes inferred while parsing the CSV are stored in the Arrow
+    schema, so later loads skip parsing and type inference entirely.
+    """
+
+    with span("ingest.parse") as timing:
+        timing.rows = csv_to_columnar(
+            original_path(dataset_id),
+            columnar_path(dataset_id),
+            sep=sep,
+            encoding=encoding
+        )
+
+    # Written now so the first load is already zero-copy
+    if SHARED_COLUMNS:
+        with span("ingest.shared_columns", timing.rows):
+            read_shared_frame(dataset_id)
+
+    return timing.rows
+
+
+def link_dataset(source_id: str, dataset_id: str):
+    """
+    Give dataset_id the stored files of source_id (an upload with the
+    same bytes): the CSV, its columnar copy and row index are
+    hard-linked rather than rewritten, parsed or hashed again.
+
+    Appends copy a shared file before writing to it in place (see
+    unshare_file), so either dataset can change later without
+    affecting the other.
+    """
+
+    for path in (original_path, columnar_path, row_index_path):
+
+        source = path(source_id)
+        target = path(dataset_id)
+
+        if os.path.exists(target):
+            os.remove(target)
+
+        if not os.path.exists(source):
+            continue
+
+        try:
+            os.link(source, target)
+        except OSError:
+            # No hard links here (other filesystem, unsupported)
+            shutil.copyfile(source, target)
+
+    link_shared_columns(shared_columns_dir(source_id), shared_columns_dir(dataset_id))
+
+
+def append_rows(dataset_id: str, df: pd.DataFrame):
+    """
+    Write rows after the dataset's committed appended batches and
+    return them as they load back, with the metadata fields that commit
+    them.
+
+    Rows are cast to the stored schema (raising if they don't fit) and
+    written to an Arrow IPC stream next to the converted upload, in
+    place, so the work is proportional to the batch: stored rows are
+    never copied again. Shared column files are extended the same way.
+    Readers keep seeing the previous rows until the returned fields are
+    saved with save_metadata (append_batch saves them together with the
+    new fingerprint).
+    """
+
+    columnar = ensure_columnar(dataset_id)
+    metadata = load_metadata(dataset_id)
+
+    path = appended_path(dataset_id)
+    schema = dataset_schema(dataset_id)
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+    committed_rows = metadata.get("appended_rows", 0)
+
+    if committed_rows == 0:
+        # Schema message only (replaces anything never committed)
+        with ipc.new_stream(path, schema):
+            pass
+        end = os.path.getsize(path) - len(STREAM_EOS)
+    else:
+        end = metadata["appended_bytes"]
+
+    with open(path, "r+b") as f:
+        f.seek(end)
+        for batch in table.to_batches():
+            f.write(batch.serialize())
+        end = f.tell()
+
+        f.write(STREAM_EOS)
+        f.truncate()
+
+    if SHARED_COLUMNS:
+        with span("append.shared_columns", table.num_rows):
+            extend_shared_columns(
+                columnar,
+                shared_columns_dir(dataset_id),
+                pa.concat_tables([read_table(dataset_id), table]),
+                dataset_rows(dataset_id)
+            )
+
+    return table.to_pandas(), {
+        "appended_rows": committed_rows + table.num_rows,
+        "appended_bytes": end,
+    }
+
+
+def append_csv(dataset_id: str, batch_path: str, df: pd.DataFrame, sep: str, encoding: str):
+    """
+    Append a CSV batch's data rows to the stored upload. A batch in the
+    upload's own delimiter and encoding is copied byte for byte (header
+    line skipped); otherwise df is written in the upload's format.
+    """
+
+    csv_path = original_path(dataset_id)
+
+    if not os.path.exists(csv_path):
+        return
+
+    unshare_file(csv_path)
+
+    metadata = load_metadata(dataset_id)
+    same_format = (
+        metadata.get("delimiter", ",") == sep
+        and metadata.get("encoding", "utf-8") == encoding
+    )
+
+    with open(csv_path, "rb+") as out:
+
+        out.seek(0, os.SEEK_END)
+        if out.tell():
+            out.seek(-1, os.SEEK_END)
+            if out.read(1) not in (b"\n", b"\r"):
+                out.write(b"\n")
+
+        if same_format:
+            with open(batch_path, "rb") as batch:
+                batch.readline()
+                shutil.copyfileobj(batch, out)
+        else:
+            out.write(df.to_csv(
+                header=False,
+                index=False,
+                sep=metadata.get("delimiter", ",")
+            ).encode(metadata.get("encoding", "utf-8")))
+
+
+def save_metadata(dataset_id: str, **fields) -> dict:
+    """
+    Merge fields into the dataset's JSON sidecar (encoding, delimiter,
+    content fingerprint, ...).
+    """
+
+    metadata = load_metadata(dataset_id)
+    metadata.update(fields)
+
+    path = metadata_path(dataset_id)
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f)
+
+    os.replace(tmp_path, path)
+
+    return metadata
+
+
+# =====================================================
+# READ
+# =====================================================
+
+def load_metadata(dataset_id: str) -> dict:
+
+    path = metadata_path(dataset_id)
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def dataset_fingerprint(dataset_id: str) -> str:
+    """
+    SHA-256 of the uploaded bytes.
+
+    Computed while the upload streams in; older uploads are hashed once
+    on first request and the digest is stored in the sidecar.
+    """
+
+    fingerprint = load_metadata(dataset_id).get("fingerprint")
+
+    if fingerprint:
+        return fingerprint
+
+    csv_path = original_path(dataset_id)
+
+    if not os.path.exists(csv_path):
+        raise DatasetNotFoundException()
+
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+
+    fingerprint = digest.hexdigest()
+    save_metadata(dataset_id, fingerprint=fingerprint)
+
+    return fingerprint
+
+
+def dataset_schema(dataset_id: str) -> pa.Schema:
+
+    with pa.memory_map(ensure_columnar(dataset_id)) as source:
+        return ipc.open_file(source).schema
+
+
+def ensure_columnar(dataset_id: str) -> str:
+    """
+    Path of the converted upload; datasets uploaded before the columnar
+    store existed are converted on first access.
+    """
+
+    path = columnar_path(dataset_id)
+
+    if not os.path.exists(path):
+
+        if not os.path.exists(original_path(dataset_id)):
+            raise DatasetNotFoundException()
+
+        convert_upload(dataset_id)
+
+    return path
+
+
+def columnar_size(dataset_id: str) -> int:
+    """
+    Bytes of the stored columnar data (converted upload plus appended
+    batches).
+    """
+
+    return (
+        os.path.getsize(ensure_columnar(dataset_id))
+        + load_metadata(dataset_id).get("appended_bytes", 0)
+    )
+
+
+def load_dataset(dataset_id: str, columns: list = None, compact: bool = None) -> pd.DataFrame:
+    """
+    Shared loader for every router.
+
+    Reads the columnar copy of the upload and its appended rows
+    (optionally just `columns`). compact (default: COMPACT_FRAMES)
+    narrows dtypes with compact_frame, which copies.
+
+    With SHARED_COLUMNS numeric columns are copy-on-write views over
+    memory-mapped files (see read_shared_frame); in-place edits only
+    touch this frame's pages.
+    """
+
+    ensure_columnar(dataset_id)
+
+    with span("dataset.load") as timing:
+        if SHARED_COLUMNS:
+            df = read_shared_frame(dataset_id, columns)
+        else:
+            df = read_table(dataset_id, columns).to_pandas(use_threads=True)
+
+        if COMPACT_FRAMES if compact is None else compact:
+            df, _ = compact_frame(df)
+
+        timing.rows = len(df)
+
+    return df
+
+
+def read_table(dataset_id: str, columns: list = None) -> pa.Table:
+    """
+    The stored dataset as one memory-mapped Arrow table (nothing is
+    copied): the converted upload followed by the committed appended
+    batches.
+    """
+
+    with pa.memory_map(ensure_columnar(dataset_id)) as source:
+        table = ipc.open_file(source).read_all()
+
+    appended = list(_appended_batches(dataset_id))
+
+    if appended:
+        table = pa.concat_tables([table, pa.Table.from_batches(appended, schema=table.schema)])
+
+    return table if columns is None else table.select(list(columns))
+
+
+def _appended_batches(dataset_id: str):
+    """
+    Committed record batches of the appended-rows stream; batches an
+    append is still writing lie past them and are never read.
+    """
+
+    rows = load_metadata(dataset_id).get("appended_rows", 0)
+
+    if not rows:
+        return
+
+    with pa.memory_map(appended_path(dataset_id)) as source:
+        reader = ipc.open_stream(source)
+
+        while rows > 0:
+            batch = reader.read_next_batch()
+            rows -= batch.num_rows
+            yield batch
+
+
+def read_shared_frame(dataset_id: str, columns: list = None) -> pd.DataFrame:
+    """
+    The stored dataset without a private copy: numeric columns are
+    copy-on-write memory-mapped views (see shared_column_arrays) and the
+    other columns wrap the memory-mapped Arrow buffers. Worker processes
+    loading the same dataset share the page cache.
+    """
+
+    table = read_table(dataset_id)
+
+    shared = shared_column_arrays(columnar_path(dataset_id), shared_columns_dir(dataset_id), table)
+
+    names = table.column_names if columns is None else list(columns)
+    rest = [name for name in names if name not in shared]
+
+    other = table.select(rest).to_pandas() if rest else None
+
+    return pd.DataFrame(
+        {name: shared[name] if name in shared else other[name] for name in names},
+        columns=names,
+        copy=False
+    )
+
+
+def derived_columns(dataset_id: str, kind: str, names: list, compute) -> dict:
+    """
+    Arrays derived per column of the stored dataset (kind names the
+    derivation, e.g. "ranks"), computed by compute(name) once per
+    dataset content and memory-mapped afterwards.
+    """
+
+    version = f"{file_identity(ensure_columnar(dataset_id))}-{load_metadata(dataset_id).get('appended_rows', 0)}"
+
+    return derived_column_arrays(derived_columns_dir(dataset_id, kind), version, names, compute)
+
+
+def iter_batches(dataset_id: str):
+    """
+    Yield the dataset as pandas chunks, one Arrow record batch at a time.
+
+    Only one batch is materialized at once, so callers can process
+    datasets larger than memory.
+    """
+
+    for batch in iter_record_batches(dataset_id):
+        yield batch.to_pandas()
+
+
+def iter_record_batches(dataset_id: str):
+    """
+    The stored Arrow record batches, unconverted.
+    """
+
+    # Converts legacy uploads (or raises DatasetNotFoundException)
+    with pa.memory_map(ensure_columnar(dataset_id)) as source:
+        reader = ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+    yield from _appended_batches(dataset_id)
+
+
+def dataset_rows(dataset_id: str) -> int:
+    """
+    Row count from the Arrow file's batch metadata and the committed
+    appended rows (no data is read).
+    """
+
+    with pa.memory_map(ensure_columnar(dataset_id)) as source:
+        reader = ipc.open_file(source)
+        rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+    return rows + load_metadata(dataset_id).get("appended_rows", 0)
+
+
+def take_rows(dataset_id: str, positions) -> pd.DataFrame:
+    """
+    The rows at `positions` (ascending), converted on their own; the
+    rest of the memory-mapped table is never materialized.
+    """
+
+    return read_table(dataset_id).take(pa.array(positions, type=pa.int64())).to_pandas()
+
+
+def read_rows(dataset_id: str, start: int, count: int):
+    """
+    Rows [start, start + count) of the stored dataset and its total row
+    count. The memory-mapped table is sliced before conversion, so only
+    the requested rows are materialized.
+    """
+
+    table = read_table(dataset_id)
+    page_df = table.slice(start, count).to_pandas()
+
+    page_df.index = pd.RangeIndex(start, start + len(page_df))
+
+    return page_df, table.num_rows
@@ -0,0 +1,57 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.config import ENGINE_EXECUTOR, ENGINE_PROCESSES
+
+
+class EngineExecutor:
+    """
+    Runs independent CPU-bound engine stages, either inline or on a
+    process pool.
+
+    Stage functions must be module-level and take only small,
+    picklable arguments (dataset ids, column names): workers read the
+    data themselves from the memory-mapped columnar file, so no
+    DataFrame is ever pickled across the process boundary.
+    """
+
+    def __init__(self, mode: str, processes: int):
+        self.mode = mode
+        self.processes = processes or os.cpu_count() or 1
+
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def parallel(self) -> bool:
+        return self.mode == "process" and self.processes > 1
+
+    def run_all(self, calls: dict) -> dict:
+        """
+        calls maps a stage name to (fn, *args); returns name -> result.
+        """
+
+        if not self.parallel:
+            return {name: fn(*args) for name, (fn, *args) in calls.items()}
+
+        pool = self._get_pool()
+        futures = {name: pool.submit(fn, *args) for name, (fn, *args) in calls.items()}
+
+        return {name: future.result() for name, future in futures.items()}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a server that already runs worker threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+
+        return self._pool
+
+
+engine_executor = EngineExecutor(ENGINE_EXECUTOR, ENGINE_PROCESSES)
@@ -0,0 +1,193 @@
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+from backend.config import JOB_WORKERS, JOB_HISTORY_SIZE
+
+
+_current = threading.local()
+
+
+def report_progress(fraction: float, stage: str = None):
+    """
+    Update the running job's progress. No-op outside a job, so engines
+    and services can call it unconditionally.
+    """
+
+    job = getattr(_current, "job", None)
+
+    if job is not None:
+        job.progress = round(min(max(fraction, 0.0), 1.0), 3)
+        if stage:
+            job.stage = stage
+
+
+class Job:
+
+    def __init__(self, kind: str, dataset_id: str, priority: int, fn, key=None):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.dataset_id = dataset_id
+        self.priority = priority
+        self.key = key
+        self.fn = fn
+
+        self.status = "queued"
+        self.progress = 0.0
+        self.stage = None
+        self.error = None
+
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        # Resolved by the worker; awaitable from async handlers
+        self.future = Future()
+
+        # Run in the submitter's context, so stage spans reach its request
+        self.context = contextvars.copy_context()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "dataset_id": self.dataset_id,
+            "priority": self.priority,
+            "status": self.status,
+            "progress": self.progress,
+            "stage": self.stage,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    Priority queue served by a fixed pool of worker threads.
+
+    Heavy work (analytics, simulation) runs here instead of in the
+    server's request threadpool, so a few large datasets can't starve
+    lightweight endpoints. Higher priority runs first; equal priorities
+    run in submission order. Submitting a keyed job while an identical
+    one is still pending returns the pending job.
+    """
+
+    def __init__(self, workers: int, history_size: int):
+        self.workers = workers
+        self.history_size = history_size
+
+        self._heap = []
+        self._counter = itertools.count()
+        self._jobs = {}
+        self._pending_keys = {}
+        self._finished = []
+
+        self._cond = threading.Condition()
+        self._threads = []
+
+    # =====================================================
+    # PUBLIC API
+    # =====================================================
+    def submit(self, kind: str, dataset_id: str, fn, priority: int = 0, key=None) -> Job:
+
+        with self._cond:
+            self._start_workers()
+
+            if key is not None and key in self._pending_keys:
+                return self._pending_keys[key]
+
+            job = Job(kind, dataset_id, priority, fn, key)
+
+            self._jobs[job.id] = job
+            if key is not None:
+                self._pending_keys[key] = job
+
+            heapq.heappush(self._heap, (-priority, next(self._counter), job))
+            self._cond.notify()
+
+        return job
+
+    def get(self, job_id: str) -> Job:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def position(self, job: Job) -> int:
+        """
+        Jobs ahead of this one in the queue (0 once it is running).
+        """
+
+        with self._cond:
+            if job.status != "queued":
+                return 0
+            entry = next(e for e in self._heap if e[2] is job)
+            return sum(1 for e in self._heap if e[:2] < entry[:2])
+
+    # =====================================================
+    # WORKERS
+    # =====================================================
+    def _start_workers(self):
+
+        if self._threads:
+            return
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                _, _, job = heapq.heappop(self._heap)
+
+                job.status = "running"
+                job.started_at = time.time()
+
+            _current.job = job
+
+            try:
+                result = job.context.run(job.fn)
+            except BaseException as e:
+                self._finish(job, "failed", error=e)
+            else:
+                self._finish(job, "done", result=result)
+            finally:
+                _current.job = None
+
+    def _finish(self, job: Job, status: str, result=None, error=None):
+
+        with self._cond:
+            job.status = status
+            job.finished_at = time.time()
+            job.fn = None
+            job.context = None
+
+            if status == "done":
+                job.progress = 1.0
+            else:
+                job.error = getattr(error, "detail", None) or getattr(error, "message", None) or str(error)
+
+            if job.key is not None and self._pending_keys.get(job.key) is job:
+                del self._pending_keys[job.key]
+
+            # Forget the oldest finished jobs beyond the history size
+            self._finished.append(job.id)
+            while len(self._finished) > self.history_size:
+                self._jobs.pop(self._finished.pop(0), None)
+
+        if status == "done":
+            job.future.set_result(result)
+        else:
+            job.future.set_exception(error)
+
+
+job_queue = JobQueue(JOB_WORKERS, JOB_HISTORY_SIZE)
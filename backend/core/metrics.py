@@ -0,0 +1,290 @@
+import contextvars
+import threading
+import time
+
+from backend.config import SERVER_TIMING
+
+
+# Seconds; Prometheus client defaults plus room for slow analytics
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Upper bounds of the dataset size label
+SIZE_BUCKETS = ((1_000, "<1k"), (10_000, "<10k"), (100_000, "<100k"), (1_000_000, "<1M"), (10_000_000, "<10M"))
+
+
+# =====================================================
+# METRIC TYPES
+# =====================================================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per label combination, rendered in the
+    Prometheus text format.
+    """
+
+    def __init__(self, name: str, description: str, label_names: tuple, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+
+        with self._lock:
+            series = self._series.get(label_values)
+
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            series = sorted(self._series.items())
+
+        for label_values, (counts, total, count) in series:
+
+            for bound, bucket_count in zip(self.buckets, counts):
+                le = _labels(self.label_names, label_values, f'le="{_number(float(bound))}"')
+                lines.append(f"{self.name}_bucket{le} {bucket_count}")
+
+            labels = _labels(self.label_names, label_values)
+            inf = _labels(self.label_names, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {count}")
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+
+        return lines
+
+
+class Counter:
+
+    def __init__(self, name: str, description: str, label_names: tuple):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+
+        with self._lock:
+            values = sorted(self._values.items())
+
+        for label_values, value in values:
+            lines.append(f"{self.name}{_labels(self.label_names, label_values)} {_number(value)}")
+
+        return lines
+
+
+# =====================================================
+# REGISTRY
+# =====================================================
+
+REQUEST_DURATION = Histogram(
+    "dq_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status")
+)
+
+STAGE_DURATION = Histogram(
+    "dq_stage_duration_seconds",
+    "Time spent in an engine or service stage, by dataset size.",
+    ("stage", "size")
+)
+
+STAGE_ROWS = Counter(
+    "dq_stage_rows_total",
+    "Dataset rows processed by a stage.",
+    ("stage",)
+)
+
+METRICS = [REQUEST_DURATION, STAGE_DURATION, STAGE_ROWS]
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def size_label(rows) -> str:
+
+    if rows is None:
+        return "unknown"
+
+    for bound, label in SIZE_BUCKETS:
+        if rows < bound:
+            return label
+
+    return ">=10M"
+
+
+# =====================================================
+# SPANS
+# =====================================================
+
+# Stage timings of the current request, for its Server-Timing header.
+# Job queue workers run in the submitting request's context.
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+class span:
+    """
+    Time a block as `stage`:
+
+        with span("analytics.correlation", rows=stats.rows):
+            ...
+
+    rows (the dataset size) sets the size label and the rows counter;
+    it can also be set on the span inside the block once known.
+    """
+
+    def __init__(self, stage: str, rows: int = None):
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self) -> "span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+
+        elapsed = time.perf_counter() - self._start
+
+        STAGE_DURATION.observe(elapsed, self.stage, size_label(self.rows))
+        if self.rows is not None:
+            STAGE_ROWS.inc(self.rows, self.stage)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((self.stage, elapsed))
+
+
+def server_timing(timings: list, total: float) -> str:
+    """
+    Server-Timing header value: each stage's summed duration (ms) in
+    first-seen order, then the whole request.
+    """
+
+    durations = {}
+    for stage, elapsed in timings:
+        durations[stage] = durations.get(stage, 0.0) + elapsed
+
+    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in durations.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+
+    return ", ".join(entries)
+
+
+# =====================================================
+# MIDDLEWARE
+# =====================================================
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template (once
+    the response body is sent) and, when SERVER_TIMING is on, adding a
+    Server-Timing header with the stage spans that finished before the
+    response started.
+    """
+
+    def __init__(self, app, server_timing: bool = SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = []
+        token = _request_timings.set(timings)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+                if self.server_timing:
+                    header = server_timing(timings, time.perf_counter() - start)
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"server-timing", header.encode())]
+                    }
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+
+            REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                route_template(scope),
+                str(status)
+            )
+
+
+def route_template(scope) -> str:
+    """
+    The matched route with its parameters as placeholders
+    ("/analytics/{dataset_id}"), rebuilt from the request path so the
+    router prefix is included. "unmatched" when no route matched.
+    """
+
+    if scope.get("route") is None:
+        return "unmatched"
+
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+
+    return "/".join(
+        f"{{{names[segment]}}}" if segment in names else segment
+        for segment in scope["path"].split("/")
+    )
@@ -0,0 +1,264 @@
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, create_engine, event, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+
+from backend.config import REGISTRY_URL
+from backend.core.dataset_store import (
+    columnar_path,
+    dataset_exists,
+    dataset_fingerprint,
+    dataset_rows,
+    dataset_schema,
+    load_metadata,
+    original_path,
+)
+from backend.core.exceptions import DatasetNotFoundException
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class DatasetRecord(Base):
+    """
+    One stored dataset: where its files live, what it contains and the
+    statistics already computed for its current content.
+    """
+
+    __tablename__ = "datasets"
+
+    dataset_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=True)
+
+    source_path: Mapped[str] = mapped_column(String(1024))
+    columnar_path: Mapped[str] = mapped_column(String(1024))
+    encoding: Mapped[str] = mapped_column(String(32), nullable=True)
+    delimiter: Mapped[str] = mapped_column(String(8), nullable=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=True)
+
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
+    rows: Mapped[int] = mapped_column(BigInteger)
+    columns: Mapped[int] = mapped_column(Integer)
+    schema: Mapped[list] = mapped_column(JSON)
+
+    # Filled on first use; reset whenever the content changes
+    column_types: Mapped[dict] = mapped_column(JSON, nullable=True)
+    stats: Mapped[dict] = mapped_column(JSON, default=dict)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    def to_dict(self) -> dict:
+        return {
+            "dataset_id": self.dataset_id,
+            "filename": self.filename,
+            "source_path": self.source_path,
+            "columnar_path": self.columnar_path,
+            "encoding": self.encoding,
+            "delimiter": self.delimiter,
+            "size_bytes": self.size_bytes,
+            "fingerprint": self.fingerprint,
+            "rows": self.rows,
+            "columns": self.columns,
+            "schema": self.schema,
+            "column_types": self.column_types,
+            "stats": self.stats or {},
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class DatasetRegistry:
+    """
+    Dataset records in a SQL database (SQLite by default), shared by
+    every worker process and kept across restarts.
+
+    Lookups are by primary key; the stored files stay the source of
+    truth and a record is rebuilt from them whenever they change.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._engine = None
+        self._sessions = None
+        self._lock = threading.Lock()
+
+    # Created on first use, so importing the app never touches the database
+    def _session(self):
+
+        with self._lock:
+            if self._sessions is None:
+                self._engine = create_engine(
+                    self.url,
+                    connect_args={"check_same_thread": False, "timeout": 30}
+                    if self.url.startswith("sqlite") else {}
+                )
+
+                if self.url.startswith("sqlite"):
+                    event.listen(self._engine, "connect", _sqlite_pragmas)
+
+                Base.metadata.create_all(self._engine)
+                self._sessions = sessionmaker(self._engine, expire_on_commit=False)
+
+        return self._sessions()
+
+    # =====================================================
+    # PUBLIC API
+    # =====================================================
+    def get(self, dataset_id: str) -> dict:
+
+        with self._session() as session:
+            record = session.get(DatasetRecord, dataset_id)
+            return record.to_dict() if record else None
+
+    def list(self, limit: int = 100, offset: int = 0) -> list:
+
+        with self._session() as session:
+            records = session.scalars(
+                select(DatasetRecord)
+                .order_by(DatasetRecord.created_at.desc())
+                .limit(limit)
+                .offset(offset)
+            )
+            return [record.to_dict() for record in records]
+
+    def find(self, fingerprint: str) -> dict:
+        """
+        The newest dataset with this content, or None.
+        """
+
+        with self._session() as session:
+            record = session.scalars(
+                select(DatasetRecord)
+                .where(DatasetRecord.fingerprint == fingerprint)
+                .order_by(DatasetRecord.created_at.desc())
+                .limit(1)
+            ).first()
+            return record.to_dict() if record else None
+
+    def upsert(self, dataset_id: str, **fields) -> dict:
+
+        now = datetime.now(timezone.utc)
+
+        with self._session() as session, session.begin():
+            record = session.get(DatasetRecord, dataset_id)
+
+            if record is None:
+                record = DatasetRecord(dataset_id=dataset_id, created_at=now, stats={})
+                session.add(record)
+
+            for name, value in fields.items():
+                setattr(record, name, value)
+            record.updated_at = now
+
+        return record.to_dict()
+
+    def save_column_types(self, dataset_id: str, column_types: dict, fingerprint: str):
+        self._update_current(dataset_id, fingerprint, column_types=column_types)
+
+    def save_stats(self, dataset_id: str, name: str, value, fingerprint: str):
+        self._update_current(dataset_id, fingerprint, stats={name: value})
+
+    def _update_current(self, dataset_id: str, fingerprint: str, column_types=None, stats=None):
+        """
+        Store results computed for the content with `fingerprint`;
+        skipped if the dataset has changed since.
+        """
+
+        with self._session() as session, session.begin():
+            record = session.get(DatasetRecord, dataset_id)
+
+            if record is None or record.fingerprint != fingerprint:
+                return
+
+            if column_types is not None:
+                record.column_types = column_types
+
+            # Reassigned so the JSON column is marked dirty
+            if stats:
+                record.stats = {**(record.stats or {}), **stats}
+
+    def delete(self, dataset_id: str):
+
+        with self._session() as session, session.begin():
+            record = session.get(DatasetRecord, dataset_id)
+            if record is not None:
+                session.delete(record)
+
+
+def _sqlite_pragmas(connection, _):
+
+    # WAL lets readers in other workers proceed during a write
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+registry = DatasetRegistry(REGISTRY_URL)
+
+
+# =====================================================
+# DATASET RECORDS
+# =====================================================
+
+def register_dataset(dataset_id: str) -> dict:
+    """
+    (Re)build a dataset's record from its stored files. Any column
+    types and statistics on the record are dropped, as they described
+    the previous content.
+    """
+
+    schema = dataset_schema(dataset_id)
+    fingerprint = dataset_fingerprint(dataset_id)
+    metadata = load_metadata(dataset_id)
+
+    return registry.upsert(
+        dataset_id,
+        filename=metadata.get("filename"),
+        source_path=original_path(dataset_id),
+        columnar_path=columnar_path(dataset_id),
+        encoding=metadata.get("encoding"),
+        delimiter=metadata.get("delimiter"),
+        size_bytes=metadata.get("size_bytes"),
+        fingerprint=fingerprint,
+        rows=dataset_rows(dataset_id),
+        columns=len(schema.names),
+        schema=[{"name": field.name, "type": str(field.type)} for field in schema],
+        column_types=None,
+        stats={}
+    )
+
+
+def register_copy(dataset_id: str, source: dict) -> dict:
+    """
+    Record for an upload identical to `source`; its inferred types and
+    cached statistics carry over.
+    """
+
+    register_dataset(dataset_id)
+
+    return registry.upsert(
+        dataset_id,
+        column_types=source["column_types"],
+        stats=source["stats"]
+    )
+
+
+def dataset_record(dataset_id: str) -> dict:
+    """
+    The dataset's record; datasets stored before the registry existed
+    are registered on first lookup.
+    """
+
+    record = registry.get(dataset_id)
+
+    if record is not None:
+        return record
+
+    if not dataset_exists(dataset_id):
+        raise DatasetNotFoundException()
+
+    return register_dataset(dataset_id)
@@ -0,0 +1,243 @@
+import os
+import pickle
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+
+from backend.config import (
+    CACHE_DIR,
+    RESULT_CACHE_MEMORY_BYTES,
+    RESULT_CACHE_DISK_BYTES,
+)
+from backend.core.dataset_store import dataset_fingerprint
+
+
+# Bump when cached responses change so stale disk entries are ignored
+RESULT_CACHE_VERSION = 2
+
+
+class ResultCache:
+    """
+    Two-tier cache for computed responses.
+
+    Entries are keyed on (namespace, content fingerprint), so datasets
+    uploaded with identical bytes share them. The memory tier is an LRU
+    bounded by pickled size; the disk tier survives restarts and evicts
+    the least recently used files once it grows past its byte budget.
+    """
+
+    def __init__(self, cache_dir: str, max_memory_bytes: int, max_disk_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        # Disk tier size, measured on the first write and tracked after
+        self._disk_bytes = None
+
+    # =====================================================
+    # PUBLIC API
+    # =====================================================
+    def get(self, namespace: str, fingerprint: str):
+
+        key = (namespace, fingerprint)
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key][0]
+
+        path = self._disk_path(*key)
+
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+
+        # Refresh mtime so disk eviction stays LRU
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        value = pickle.loads(payload)
+        self._remember(key, value, len(payload))
+
+        return value
+
+    def set(self, namespace: str, fingerprint: str, value):
+
+        key = (namespace, fingerprint)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._remember(key, value, len(payload))
+
+        # The disk tier is best effort: a failed write (full disk, the
+        # directory invalidated meanwhile, ...) must not fail the request
+        # that computed the value
+        try:
+            self._write_disk(key, payload)
+        except OSError:
+            pass
+
+    def get_or_compute(self, dataset_id: str, namespace: str, compute):
+        """
+        Return the cached value for this dataset's current content,
+        computing and storing it on a miss.
+        """
+
+        fingerprint = dataset_fingerprint(dataset_id)
+
+        value = self.get(namespace, fingerprint)
+
+        if value is None:
+            value = compute()
+            self.set(namespace, fingerprint, value)
+
+        return value
+
+    def lookup(self, dataset_id: str, namespace: str):
+        """
+        Cached value for this dataset's current content, or None.
+        """
+        return self.get(namespace, dataset_fingerprint(dataset_id))
+
+    def invalidate(self, dataset_id: str):
+        """
+        Drop every entry for the dataset's current content (including
+        those shared with identical uploads).
+        """
+
+        fingerprint = dataset_fingerprint(dataset_id)
+        directory = os.path.join(self.cache_dir, fingerprint[:32])
+
+        with self._lock:
+            for key in [k for k in self._memory if k[1] == fingerprint]:
+                _, size = self._memory.pop(key)
+                self._memory_bytes -= size
+
+        removed = sum(size for _, size, _ in _disk_entries(directory))
+        shutil.rmtree(directory, ignore_errors=True)
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes = max(self._disk_bytes - removed, 0)
+
+    # =====================================================
+    # MEMORY TIER
+    # =====================================================
+    def _remember(self, key, value, size: int):
+
+        # Entries bigger than the whole budget only live on disk
+        if size > self.max_memory_bytes:
+            return
+
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+
+            self._memory[key] = (value, size)
+            self._memory_bytes += size
+
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+
+    # =====================================================
+    # DISK TIER
+    # =====================================================
+    def _disk_path(self, namespace: str, fingerprint: str) -> str:
+        return os.path.join(
+            self.cache_dir,
+            fingerprint[:32],
+            f"{namespace}-v{RESULT_CACHE_VERSION}.pkl"
+        )
+
+    def _write_disk(self, key, payload: bytes):
+
+        path = self._disk_path(*key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+
+        # Unique, so concurrent misses on one key don't share a temp file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(payload) - replaced
+                over_budget = self._disk_bytes > self.max_disk_bytes
+            else:
+                over_budget = True
+
+        # Walk the directory only to (re)measure it or to pick victims
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """
+        Remove the least recently used files until the disk tier fits its
+        budget. Also resyncs the tracked size with what other workers
+        have written.
+        """
+
+        entries = _disk_entries(self.cache_dir)
+        total = sum(size for _, size, _ in entries)
+
+        if total > self.max_disk_bytes:
+
+            # Oldest first
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                if total <= self.max_disk_bytes:
+                    break
+
+        with self._lock:
+            self._disk_bytes = total
+
+
+def _disk_entries(directory: str) -> list:
+    """
+    (mtime, size, path) for every file under directory.
+    """
+
+    entries = []
+
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    return entries
+
+
+result_cache = ResultCache(
+    CACHE_DIR,
+    RESULT_CACHE_MEMORY_BYTES,
+    RESULT_CACHE_DISK_BYTES
+)
@@ -0,0 +1,359 @@
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from backend.core.dataset_store import dataset_rows, first_rows_dir, iter_batches, row_index_path
+from backend.core.metrics import span
+from backend.core.shared_columns import append_to_npy
+
+
+# One record per row: its 64-bit content hash and the position of the
+# first row with the same hash
+ROW_INDEX_DTYPE = np.dtype([("hash", "<u8"), ("first", "<i8")])
+
+# Rows per block when scanning a memory-mapped index
+SCAN_BLOCK_ROWS = 1_000_000
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit hash of every row's values (index ignored).
+
+    Rows that compare equal under DataFrame.duplicated() (NaN == NaN)
+    hash equal, and a row's hash does not depend on the other rows, so
+    subsets can be re-hashed on their own.
+    """
+
+    if len(df.columns) == 0:
+        # duplicated() reports no duplicates without columns
+        return np.arange(len(df), dtype=np.uint64)
+
+    # -0.0 == 0.0 for duplicated() but not for the hash; compact
+    # (narrowed) numerics hash as their full-width values
+    float_cols = df.select_dtypes(include=["floating"]).columns
+    narrow_ints = [
+        col for col, dtype in df.dtypes.items()
+        if isinstance(dtype, np.dtype) and dtype.kind in "iu" and dtype.itemsize < 8
+    ]
+
+    if len(float_cols) or narrow_ints:
+        df = df.copy(deep=False)
+        if len(float_cols):
+            df[float_cols] = df[float_cols].astype(np.float64) + 0.0
+        for col in narrow_ints:
+            df[col] = df[col].astype(np.int64)
+
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+class RowHashIndex:
+    """
+    Row hashes plus a hash -> first-occurrence index.
+
+    Built once per dataset and persisted next to it, so duplicate
+    counts, duplicate masks and drop_duplicates become integer array
+    operations instead of re-hashing every row of the frame. Filtered
+    or edited frames derive their index from this one and only hash
+    the rows whose values actually changed; appends extend the stored
+    index in place (see append_row_index).
+    """
+
+    def __init__(self, hashes: np.ndarray, first: np.ndarray = None):
+        self.hashes = hashes
+        self._first = first
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "RowHashIndex":
+        return cls(hash_rows(df))
+
+    def __len__(self):
+        return len(self.hashes)
+
+    # =====================================================
+    # FIRST OCCURRENCES
+    # =====================================================
+    @property
+    def first(self) -> np.ndarray:
+
+        if self._first is None:
+            self._first = self._first_occurrence(self.hashes)
+
+        return self._first
+
+    @staticmethod
+    def _first_occurrence(hashes: np.ndarray) -> np.ndarray:
+
+        if hashes.size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # factorize numbers hashes in order of first appearance, so a row
+        # is a first occurrence exactly where its code is a new maximum
+        codes, _ = pd.factorize(hashes)
+        seen = np.maximum.accumulate(codes)
+        is_first = np.empty(codes.size, dtype=bool)
+        is_first[0] = True
+        is_first[1:] = codes[1:] > seen[:-1]
+
+        return np.flatnonzero(is_first)[codes]
+
+    # =====================================================
+    # DUPLICATES
+    # =====================================================
+    @property
+    def duplicate_mask(self) -> np.ndarray:
+        """
+        Same as DataFrame.duplicated(keep="first").
+        """
+        return self.first != np.arange(len(self))
+
+    @property
+    def duplicate_count(self) -> int:
+
+        first = self.first
+        count = 0
+
+        # Blockwise so a memory-mapped index is never fully materialized
+        for start in range(0, len(first), SCAN_BLOCK_ROWS):
+            block = first[start:start + SCAN_BLOCK_ROWS]
+            count += int((block != np.arange(start, start + len(block))).sum())
+
+        return count
+
+    # =====================================================
+    # DERIVED INDEXES
+    # =====================================================
+    def take(self, positions: np.ndarray) -> "RowHashIndex":
+        """
+        Index of a row subset (filtering, drop_duplicates, ...).
+        """
+        return RowHashIndex(np.asarray(self.hashes)[positions])
+
+    def replace(self, positions: np.ndarray, df_rows: pd.DataFrame) -> "RowHashIndex":
+        """
+        Index after the rows at `positions` were edited in place;
+        df_rows holds those rows' new values.
+        """
+
+        hashes = np.array(self.hashes)
+        hashes[positions] = hash_rows(df_rows)
+
+        return RowHashIndex(hashes)
+
+    # =====================================================
+    # PERSISTENCE
+    # =====================================================
+    def save(self, path: str):
+
+        records = np.empty(len(self), dtype=ROW_INDEX_DTYPE)
+        records["hash"] = self.hashes
+        records["first"] = self.first
+
+        # Unique, so concurrent first builds don't share a temp file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.npy"
+        np.save(tmp_path, records)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, rows: int = None) -> "RowHashIndex":
+        """
+        Memory-mapped index of the first `rows` records (default: all).
+        """
+
+        records = np.load(path, mmap_mode="r")[:rows]
+
+        return cls(records["hash"], records["first"])
+
+
+# =====================================================
+# FIRST OCCURRENCES BY HASH
+# =====================================================
+
+class FirstRowMap:
+    """
+    Persisted hash -> first-row map of a dataset's distinct rows, so an
+    append matches its rows without rebuilding the map over the whole
+    history.
+
+    Stored as sorted runs (one .npy per run: hashes, then first rows)
+    that are looked up with binary search. Each append adds a run of its
+    new distinct hashes and merges it into the previous runs while they
+    are no more than twice its size, so every row is merged O(log n)
+    times overall and there are O(log n) runs.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str, rows: int, runs: list):
+        self.directory = directory
+        self.rows = rows
+        self.runs = runs
+
+    @classmethod
+    def load(cls, directory: str, index: RowHashIndex) -> "FirstRowMap":
+        """
+        The map of the rows in `index`; rebuilt from it when missing or
+        written for other rows (an append that was never committed).
+        """
+
+        try:
+            with open(os.path.join(directory, cls.MANIFEST)) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            manifest = None
+
+        if manifest is not None and manifest["rows"] == len(index):
+            return cls(directory, manifest["rows"], manifest["runs"])
+
+        # Only appends use the map (one at a time per dataset)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        first_rows = cls(directory, 0, [])
+
+        # Blockwise, like duplicate_count
+        firsts = np.concatenate([np.empty(0, dtype=np.int64)] + [
+            start + np.flatnonzero(
+                np.asarray(index.first[start:start + SCAN_BLOCK_ROWS])
+                == np.arange(start, min(start + SCAN_BLOCK_ROWS, len(index)))
+            )
+            for start in range(0, len(index), SCAN_BLOCK_ROWS)
+        ])
+
+        first_rows.add(len(index), np.asarray(index.hashes)[firsts], firsts)
+
+        return first_rows
+
+    def _run(self, run: dict) -> np.ndarray:
+        return np.load(os.path.join(self.directory, run["file"]), mmap_mode="r")
+
+    def lookup(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        First row of each hash, -1 where the hash is new.
+        """
+
+        first = np.full(len(hashes), -1, dtype=np.int64)
+
+        for run in self.runs:
+
+            keys = self._run(run)
+            positions = np.minimum(np.searchsorted(keys[0], hashes), run["size"] - 1)
+            found = keys[0][positions] == hashes
+
+            first[found] = keys[1][positions[found]].astype(np.int64)
+
+        return first
+
+    def add(self, rows: int, hashes: np.ndarray, first: np.ndarray):
+        """
+        Record hashes not in the map yet (first: their first rows) and
+        mark the map as covering `rows` dataset rows.
+        """
+
+        runs = list(self.runs)
+        merged = []
+
+        order = np.argsort(hashes, kind="stable")
+        keys = np.stack([hashes[order], first[order].astype(np.uint64)])
+
+        while runs and 2 * keys.shape[1] >= runs[-1]["size"]:
+            run = runs.pop()
+            merged.append(run)
+
+            keys = np.concatenate([self._run(run), keys], axis=1)
+            keys = keys[:, np.argsort(keys[0], kind="stable")]
+
+        if keys.shape[1]:
+            filename = f"{uuid.uuid4().hex}.npy"
+            np.save(os.path.join(self.directory, filename), keys)
+            runs.append({"file": filename, "size": keys.shape[1]})
+
+        path = os.path.join(self.directory, self.MANIFEST)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump({"rows": rows, "runs": runs}, f)
+
+        os.replace(tmp_path, path)
+
+        for run in merged:
+            try:
+                os.remove(os.path.join(self.directory, run["file"]))
+            except FileNotFoundError:
+                pass
+
+        self.rows = rows
+        self.runs = runs
+
+
+def build_row_index(dataset_id: str) -> RowHashIndex:
+    """
+    Hash the stored dataset batch by batch and persist its index.
+    """
+
+    with span("ingest.row_index") as timing:
+        hashes = [hash_rows(chunk) for chunk in iter_batches(dataset_id)]
+
+        index = RowHashIndex(
+            np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+        )
+        index.save(row_index_path(dataset_id))
+
+        timing.rows = len(index)
+
+    return index
+
+
+def load_row_index(dataset_id: str) -> RowHashIndex:
+    """
+    Memory-mapped row index of the stored dataset, built on first use
+    for datasets uploaded before indexes existed.
+
+    Only the stored rows are mapped; records an append wrote but never
+    committed are ignored.
+    """
+
+    path = row_index_path(dataset_id)
+    rows = dataset_rows(dataset_id)
+
+    if not os.path.exists(path) or len(np.load(path, mmap_mode="r")) < rows:
+        return build_row_index(dataset_id)
+
+    return RowHashIndex.load(path, rows)
+
+
+def append_row_index(dataset_id: str, df_rows: pd.DataFrame) -> int:
+    """
+    Extend the stored row index with rows being appended (df_rows) and
+    return how many of them are duplicates.
+
+    Only the new rows are hashed; they are matched against the
+    persisted FirstRowMap and written after the stored records in place
+    (see append_to_npy), so the cost does not grow with the dataset.
+    Call before the append is committed.
+    """
+
+    index = load_row_index(dataset_id)
+    offset = len(index)
+
+    first_rows = FirstRowMap.load(first_rows_dir(dataset_id), index)
+
+    hashes = hash_rows(df_rows)
+
+    # Unmatched rows first-occur among themselves
+    first = RowHashIndex._first_occurrence(hashes) + offset
+    matches = first_rows.lookup(hashes)
+    first[matches >= 0] = matches[matches >= 0]
+
+    records = np.empty(len(hashes), dtype=ROW_INDEX_DTYPE)
+    records["hash"] = hashes
+    records["first"] = first
+
+    append_to_npy(row_index_path(dataset_id), offset, records)
+
+    is_first = first == np.arange(offset, offset + len(hashes))
+    first_rows.add(offset + len(hashes), hashes[is_first], first[is_first])
+
+    return int((~is_first).sum())
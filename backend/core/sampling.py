@@ -0,0 +1,115 @@
+import numpy as np
+import pyarrow as pa
+
+from backend.core.dataset_store import dataset_rows, iter_record_batches, take_rows
+
+
+SAMPLE_METHODS = ("stratified", "reservoir")
+
+
+def parse_sample_size(sample: str, population: int) -> int:
+    """
+    Rows to sample: a row count ("100000") or a fraction of the
+    dataset ("0.05"). Capped at the population.
+    """
+
+    try:
+        value = float(sample)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid sample: {sample!r} (use a row count or a fraction)")
+
+    if value <= 0:
+        raise ValueError("sample must be positive")
+
+    if value < 1 or (value == 1 and "." in str(sample)):
+        size = int(round(value * population))
+    elif value.is_integer():
+        size = int(value)
+    else:
+        raise ValueError(f"Invalid sample: {sample!r} (use a row count or a fraction)")
+
+    return min(max(size, 1), population)
+
+
+# =====================================================
+# STRATIFIED
+# =====================================================
+
+def stratified_positions(length: int, size: int, seed: int = 0) -> np.ndarray:
+    """
+    One position drawn from each of `size` equal strata of
+    range(length), ascending (all positions when length fits).
+    """
+
+    if length <= size:
+        return np.arange(length)
+
+    rng = np.random.default_rng(seed)
+    width = length / size
+    starts = np.arange(size) * width
+
+    return np.minimum((starts + rng.random(size) * width).astype(np.int64), length - 1)
+
+
+# =====================================================
+# RESERVOIR
+# =====================================================
+
+def reservoir_sample(batches, size: int, seed: int = 0) -> pa.Table:
+    """
+    Uniform sample of `size` rows from a stream of Arrow record batches
+    of unknown total length, in one pass.
+
+    Every row gets a uniform random key and the reservoir keeps the
+    rows with the smallest keys, so memory is bounded by the sample plus
+    one batch. Rows come back in stream order. None for an empty stream.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    reservoir = None
+    keys = np.empty(0)
+
+    for batch in batches:
+
+        table = pa.Table.from_batches([batch])
+
+        reservoir = table if reservoir is None else pa.concat_tables([reservoir, table])
+        keys = np.concatenate([keys, rng.random(batch.num_rows)])
+
+        if len(keys) > size:
+            keep = np.sort(np.argpartition(keys, size)[:size])
+            reservoir = reservoir.take(pa.array(keep))
+            keys = keys[keep]
+
+    # Kept positions stay ascending, so rows are already in stream order
+    return reservoir
+
+
+# =====================================================
+# DATASETS
+# =====================================================
+
+def sample_dataset(dataset_id: str, size: int, method: str = "stratified", seed: int = 0):
+    """
+    (sample frame, population rows) for a stored dataset.
+
+    stratified takes one row from each of `size` equal blocks of the
+    file, reading only those rows; reservoir streams every record batch
+    once and keeps a uniform random subset.
+    """
+
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f"Unknown sample method: {method} (use {', '.join(SAMPLE_METHODS)})")
+
+    population = dataset_rows(dataset_id)
+
+    if method == "stratified":
+        return take_rows(dataset_id, stratified_positions(population, size, seed)), population
+
+    table = reservoir_sample(iter_record_batches(dataset_id), size, seed)
+
+    if table is None:
+        return take_rows(dataset_id, []), population
+
+    return table.to_pandas(), population
@@ -0,0 +1,374 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pyarrow as pa
+
+
+MANIFEST = "manifest.json"
+
+# Superseded derived versions are removed once this old (no process
+# still resolving their paths)
+STALE_VERSION_SECONDS = 3600
+
+
+def _is_numeric(arrow_type) -> bool:
+    return (
+        pa.types.is_integer(arrow_type)
+        or pa.types.is_floating(arrow_type)
+        or pa.types.is_boolean(arrow_type)
+    )
+
+
+def file_identity(path: str) -> str:
+    """
+    Changes whenever the file is replaced; hard links of the same file
+    share it.
+    """
+
+    stat = os.stat(path)
+    return f"{stat.st_ino}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _map(path: str, dtype: str, offset: int, rows: int) -> np.ndarray:
+    """
+    Copy-on-write mapping: pages are shared with every process mapping
+    the file until one is written, and writes never reach the file. A
+    plain ndarray view, so np.memmap never leaks into results.
+    """
+
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+
+    return np.asarray(np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=(rows,)))
+
+
+def unshare_file(path: str):
+    """
+    Replace a hard-linked file (see link_dataset) with a private copy
+    before writing to it in place.
+    """
+
+    if os.path.exists(path) and os.stat(path).st_nlink > 1:
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, path)
+
+
+def append_to_npy(path: str, rows: int, values: np.ndarray) -> int:
+    """
+    Write values after the first `rows` elements of the 1-D .npy file
+    at path, in place, and return where its data starts.
+
+    Readers only map the rows they know about, which this never
+    touches; anything past them (a write that was never committed) is
+    overwritten. The header keeps its size as the shape grows (numpy
+    pads it for that); files whose header cannot grow are rewritten.
+    """
+
+    unshare_file(path)
+
+    existing = np.load(path, mmap_mode="r")
+    offset = existing.offset
+
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, {
+        "descr": np.lib.format.dtype_to_descr(existing.dtype),
+        "fortran_order": False,
+        "shape": (rows + len(values),),
+    })
+
+    if header.tell() != offset:
+        combined = np.concatenate([existing[:rows], values.astype(existing.dtype, copy=False)])
+        del existing
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.npy"
+        np.save(tmp_path, combined)
+        os.replace(tmp_path, path)
+
+        return os.path.getsize(path) - combined.nbytes
+
+    with open(path, "r+b") as f:
+        f.seek(offset + rows * existing.dtype.itemsize)
+        f.write(values.astype(existing.dtype, copy=False).tobytes())
+        f.truncate()
+
+        f.seek(0)
+        f.write(header.getvalue())
+
+    return offset
+
+
+# =====================================================
+# PER-COLUMN .npy FILES
+# =====================================================
+
+def shared_column_arrays(arrow_path: str, directory: str, table: pa.Table) -> dict:
+    """
+    Memory-mapped array per numeric column of the Arrow file at
+    arrow_path (`table` is that file, memory-mapped).
+
+    Arrow stores columns in record batches with validity bitmaps, so
+    converting them to pandas allocates a private copy in every
+    process. Each numeric column is instead written once, as pandas
+    would load it (NaN for missing), to a .npy file; every process
+    then maps the same page-cache pages.
+
+    Files live in a subdirectory named after the Arrow file's identity
+    and are never modified or removed while the dataset exists, so a
+    process that has read a manifest can always map its files.
+    """
+
+    version = os.path.join(directory, file_identity(arrow_path))
+    manifest = _read_manifest(version)
+
+    if manifest is None:
+        manifest = _build(table, version)
+
+    # Behind the appended rows (see extend_shared_columns): load from Arrow
+    if manifest is None or manifest["rows"] < table.num_rows:
+        return {}
+
+    # Only the rows in `table`; an append in progress may have written more
+    return {
+        name: _map(os.path.join(version, column["file"]), column["dtype"], column["offset"], table.num_rows)
+        for name, column in manifest["columns"].items()
+    }
+
+
+def _read_manifest(directory: str):
+
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_manifest(directory: str, manifest: dict):
+
+    path = os.path.join(directory, MANIFEST)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+
+    os.replace(tmp_path, path)
+
+
+def _build(table: pa.Table, version: str):
+
+    # Empty arrays cannot be memory-mapped
+    if table.num_rows == 0:
+        return None
+
+    tmp_dir = f"{version}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(tmp_dir)
+
+    try:
+        columns = {}
+
+        # One column in memory at a time
+        for i, field in enumerate(table.schema):
+
+            if not _is_numeric(field.type):
+                continue
+
+            values = table.column(i).to_pandas().to_numpy()
+
+            # Booleans with missing values load as object
+            if values.dtype.kind not in "iufb":
+                continue
+
+            filename = f"{i}.npy"
+            columns[field.name] = {
+                "file": filename,
+                "dtype": values.dtype.str,
+                "offset": _save(os.path.join(tmp_dir, filename), values),
+            }
+
+        manifest = {"rows": table.num_rows, "columns": columns}
+
+        with open(os.path.join(tmp_dir, MANIFEST), "w") as f:
+            json.dump(manifest, f)
+
+        # Fails if another process published its build of the same file
+        os.rename(tmp_dir, version)
+
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        existing = _read_manifest(version)
+        if existing is None:
+            raise
+        return existing
+
+    return manifest
+
+
+def _save(path: str, values: np.ndarray) -> int:
+    """
+    Write values as a .npy file; returns where the data starts.
+    """
+
+    np.save(path, values)
+
+    # The data follows the header
+    return os.path.getsize(path) - values.nbytes
+
+
+def extend_shared_columns(arrow_path: str, directory: str, table: pa.Table, start: int):
+    """
+    Bring the column files of the Arrow file's version up to `table`
+    (the dataset including rows being appended from `start`), writing
+    only the rows they are missing (see append_to_npy); rows past
+    `start` left by an append that was never committed are overwritten.
+
+    A column whose new values no longer fit its stored dtype (missing
+    values in an integer column, ...) is promoted the way pandas would
+    load the whole column, into a new file; if that is not numeric it
+    is loaded from Arrow from then on. Nothing to do before the files
+    are first built.
+    """
+
+    version = os.path.join(directory, file_identity(arrow_path))
+    manifest = _read_manifest(version)
+
+    if manifest is None:
+        return
+
+    rows = min(manifest["rows"], start)
+    tail = table.slice(rows)
+
+    columns = {}
+
+    for name, column in manifest["columns"].items():
+
+        path = os.path.join(version, column["file"])
+        values = tail.column(name).to_pandas().to_numpy()
+        dtype = np.result_type(np.dtype(column["dtype"]), values.dtype)
+
+        if dtype.kind not in "iufb":
+            continue
+
+        if dtype == np.dtype(column["dtype"]):
+            columns[name] = {**column, "offset": append_to_npy(path, rows, values)}
+            continue
+
+        # The old file stays for readers still mapping it
+        existing = _map(path, column["dtype"], column["offset"], rows)
+        filename = f"{uuid.uuid4().hex[:8]}-{column['file']}"
+
+        columns[name] = {
+            "file": filename,
+            "dtype": dtype.str,
+            "offset": _save(
+                os.path.join(version, filename),
+                np.concatenate([existing.astype(dtype), values.astype(dtype)])
+            ),
+        }
+
+    _write_manifest(version, {"rows": table.num_rows, "columns": columns})
+
+
+# =====================================================
+# DERIVED COLUMNS
+# =====================================================
+
+def derived_column_arrays(directory: str, version: str, names: list, compute) -> dict:
+    """
+    Per-column arrays derived from one version of a dataset (ranks,
+    ...): compute(name) runs once per column and version, after which
+    every process memory-maps the saved .npy (copy-on-write).
+    """
+
+    version_dir = os.path.join(directory, version)
+
+    try:
+        # Marks the version as in use (see _discard_stale_versions)
+        os.utime(version_dir)
+    except FileNotFoundError:
+        os.makedirs(version_dir, exist_ok=True)
+        _discard_stale_versions(directory, version)
+
+    arrays = {}
+
+    for name in names:
+
+        path = os.path.join(version_dir, hashlib.sha1(str(name).encode()).hexdigest()[:16] + ".npy")
+
+        if not os.path.exists(path):
+            values = compute(name)
+
+            # Empty arrays cannot be memory-mapped
+            if values.size == 0:
+                arrays[name] = values
+                continue
+
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.npy"
+            np.save(tmp_path, values)
+            os.replace(tmp_path, path)
+
+        arrays[name] = np.asarray(np.load(path, mmap_mode="c"))
+
+    return arrays
+
+
+def _discard_stale_versions(directory: str, current: str):
+    """
+    Remove superseded versions nothing has used for a while, so appends
+    do not accumulate them; recent ones may still be in use.
+    """
+
+    cutoff = time.time() - STALE_VERSION_SECONDS
+
+    for name in os.listdir(directory):
+
+        path = os.path.join(directory, name)
+
+        try:
+            stale = name != current and os.path.getmtime(path) < cutoff
+        except FileNotFoundError:
+            continue
+
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def discard_shared_columns(directory: str):
+    """
+    Remove every version of a dataset's column files (only once nothing
+    can load the dataset any more, e.g. a failed upload).
+    """
+
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def link_shared_columns(source: str, target: str):
+    """
+    Hard-link another dataset's column files (same Arrow file, so the
+    version directories stay valid).
+    """
+
+    if not os.path.isdir(source):
+        return
+
+    discard_shared_columns(target)
+    shutil.copytree(
+        source,
+        target,
+        ignore=shutil.ignore_patterns("*.tmp"),
+        copy_function=_link_or_copy
+    )
+
+
+def _link_or_copy(source: str, target: str):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
@@ -1,65 +1,285 @@
+import math
+
 import pandas as pd
 import numpy as np
+from pandas.tseries.api import guess_datetime_format
+
+from backend.config import CLASSIFY_SAMPLE_ROWS
+from backend.core.sampling import stratified_positions
 
 
 class ClassificationEngine:
+    """
+    Column type inference on a bounded sample.
+
+    Each column is judged on up to CLASSIFY_SAMPLE_ROWS of its non-null
+    values, drawn one per equal-sized stratum of rows so every part of
+    the file is represented. The sample is converted to strings once and
+    every pattern check runs vectorized over that conversion.
+
+    Every rule outcome carries a confidence. Outcomes settled by the
+    sample alone (a counterexample to an "every value" rule, a match for
+    an "any value" rule) are certain; the rest are estimates, and a rule
+    whose estimate is below MIN_CONFIDENCE is re-run over the full
+    column. A column's confidence is that of its weakest rule outcome.
+    """
+
+    MIN_CONFIDENCE = 0.95
+
+    BOOLEAN_VALUES = [0, 1, True, False]
+    IDENTIFIER_RATIO = 0.95
+    DATETIME_SHARE = 0.95
+    TEXT_LENGTH = 30
+
+    TYPES = [
+        "numeric",
+        "categorical",
+        "alphanumeric",
+        "boolean",
+        "identifier",
+        "datetime",
+        "text"
+    ]
 
     @staticmethod
-    def classify(df: pd.DataFrame):
-
-        classification = {
-            "numeric": [],
-            "categorical": [],
-            "alphanumeric": [],
-            "boolean": [],
-            "identifier": [],
-            "datetime": [],
-            "text": []
+    def classify(df: pd.DataFrame, sample_rows: int = CLASSIFY_SAMPLE_ROWS):
+        """
+        Column names grouped by inferred type.
+        """
+
+        return ClassificationEngine.group(
+            ClassificationEngine.infer(df, sample_rows)
+        )
+
+    @staticmethod
+    def infer(df: pd.DataFrame, sample_rows: int = CLASSIFY_SAMPLE_ROWS) -> dict:
+        """
+        {column: {"type", "confidence", "sampled"}} for every column.
+        """
+
+        return {
+            col: ClassificationEngine.infer_column(df[col], sample_rows)
+            for col in df.columns
         }
 
-        total_rows = len(df)
+    @staticmethod
+    def group(types: dict) -> dict:
 
-        for col in df.columns:
+        classification = {name: [] for name in ClassificationEngine.TYPES}
 
-            series = df[col]
+        for col, inferred in types.items():
+            classification[inferred["type"]].append(col)
+
+        return classification
+
+    # =====================================================
+    # PER COLUMN
+    # =====================================================
+    @staticmethod
+    def infer_column(series: pd.Series, sample_rows: int = CLASSIFY_SAMPLE_ROWS) -> dict:
 
-            # Boolean
-            if series.dropna().isin([0, 1, True, False]).all():
-                classification["boolean"].append(col)
-                continue
+        total_rows = len(series)
+        present = np.flatnonzero(series.notna().to_numpy())
+        positions = stratified_positions(len(present), sample_rows)
 
-            # Numeric
-            if pd.api.types.is_numeric_dtype(series):
-                classification["numeric"].append(col)
-                continue
+        sampled = len(positions) < len(present)
+        sample = series.iloc[present[positions]] if sampled else series.iloc[present]
+        n = len(sample)
 
-            # Datetime
-            try:
-                pd.to_datetime(series.dropna().iloc[:5])
-                classification["datetime"].append(col)
-                continue
-            except:
-                pass
+        # Without sampling the sample test is exact; with it, an unsure
+        # answer is replaced by the full-column one
+        def settle(evidence, sample_test, full_test):
+            decided, confidence = sample_test(evidence)
+            if not sampled:
+                return decided, 1.0
+            if confidence < ClassificationEngine.MIN_CONFIDENCE:
+                return full_test(), 1.0
+            return decided, confidence
 
-            # High uniqueness → Identifier
-            unique_ratio = series.nunique() / total_rows
-            if unique_ratio > 0.95:
-                classification["identifier"].append(col)
-                continue
+        def result(column_type, *confidences):
+            return {
+                "type": column_type,
+                "confidence": round(min(confidences, default=1.0), 4),
+                "sampled": sampled,
+            }
+
+        E = ClassificationEngine
+
+        # Boolean: every value in BOOLEAN_VALUES. Integer columns are
+        # settled exactly by their range, which is cheaper than matching
+        if pd.api.types.is_bool_dtype(series):
+            is_boolean, c_boolean = True, 1.0
+        elif pd.api.types.is_integer_dtype(series):
+            is_boolean, c_boolean = n == 0 or (series.min() >= 0 and series.max() <= 1), 1.0
+        else:
+            is_boolean, c_boolean = settle(
+                int(sample.isin(E.BOOLEAN_VALUES).sum()),
+                lambda k: (True, E._laplace(k, n)) if k == n else (False, 1.0),
+                lambda: bool(series.iloc[present].isin(E.BOOLEAN_VALUES).all())
+            )
+
+        if is_boolean:
+            return result("boolean", c_boolean)
+
+        # Numeric
+        if pd.api.types.is_numeric_dtype(series):
+            return result("numeric", c_boolean)
+
+        text = sample.astype(str)
+        has_letter = text.str.contains(r"[a-zA-Z]", regex=True).to_numpy(dtype=bool)
+        has_digit = text.str.contains(r"[0-9]", regex=True).to_numpy(dtype=bool)
+
+        # Datetime: nearly every value parses (dates always have digits,
+        # so columns mostly without them are not parsed at all)
+        parsed = E._datetime_hits(text, has_digit)
+        is_datetime, c_datetime = settle(
+            parsed,
+            lambda k: E._share_test(k, n, E.DATETIME_SHARE),
+            lambda: E._datetime_hits(series.iloc[present].astype(str)) >= E.DATETIME_SHARE * len(present)
+        )
+        if is_datetime:
+            return result("datetime", c_boolean, c_datetime)
+
+        # Identifier: distinct values > IDENTIFIER_RATIO of the rows.
+        # A sample never has a smaller distinct share than its column,
+        # so a low sample share is final and a high one is checked
+        distinct_rows = text.nunique() / n * len(present)
+        is_identifier, c_identifier = settle(
+            distinct_rows > E.IDENTIFIER_RATIO * total_rows,
+            lambda high: (high, 0.0 if high else 1.0),
+            lambda: series.nunique() / total_rows > E.IDENTIFIER_RATIO
+        )
+        if is_identifier:
+            return result("identifier", c_boolean, c_datetime, c_identifier)
+
+        # Alphanumeric: some value has a letter and some value a digit
+        alphanumeric = bool(has_letter.any() and has_digit.any())
+        is_alphanumeric, c_alphanumeric = settle(
+            alphanumeric,
+            lambda found: (True, 1.0) if found else (False, E._laplace(n, n)),
+            lambda: E._full_alphanumeric(series)
+        )
+        if is_alphanumeric:
+            return result("alphanumeric", c_boolean, c_datetime, c_identifier, c_alphanumeric)
+
+        # Text: mean length above TEXT_LENGTH
+        lengths = text.str.len().to_numpy(dtype=np.float64)
+        is_text, c_text = settle(
+            lengths,
+            lambda values: E._mean_test(values, E.TEXT_LENGTH),
+            lambda: E._full_mean_length(series) > E.TEXT_LENGTH
+        )
+        confidences = (c_boolean, c_datetime, c_identifier, c_alphanumeric, c_text)
+
+        return result("text" if is_text else "categorical", *confidences)
+
+    # =====================================================
+    # SAMPLING
+    # =====================================================
+    @staticmethod
+    def _laplace(support: int, n: int) -> float:
+        # Rule of succession: chance the next value agrees
+        return (support + 1) / (n + 2)
+
+    @staticmethod
+    def _share_test(hits: int, n: int, threshold: float):
+        """
+        Whether the column share is at least threshold, and the normal
+        approximation's confidence in that answer.
+        """
 
-            # Alphanumeric
-            if series.dropna().astype(str).str.contains(r"[a-zA-Z]").any() and \
-               series.dropna().astype(str).str.contains(r"[0-9]").any():
-                classification["alphanumeric"].append(col)
-                continue
+        share = hits / n if n else 0.0
+        smoothed = ClassificationEngine._laplace(hits, n)
+        error = math.sqrt(smoothed * (1 - smoothed) / max(n, 1))
+
+        z = abs(share - threshold) / error
+        confidence = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+        return share >= threshold, confidence
+
+    @staticmethod
+    def _mean_test(values: np.ndarray, threshold: float):
+        """
+        Whether the column mean is above threshold, with confidence as
+        in _share_test.
+        """
+
+        if values.size == 0:
+            return False, 1.0
+
+        mean = values.mean()
+        error = values.std() / math.sqrt(values.size)
+
+        if error == 0:
+            return mean > threshold, 1.0
+
+        z = abs(mean - threshold) / error
+        confidence = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+        return bool(mean > threshold), confidence
+
+    # =====================================================
+    # PATTERN CHECKS
+    # =====================================================
+    @staticmethod
+    def _datetime_hits(text: pd.Series, has_digit: np.ndarray = None) -> int:
+        """
+        Number of values that parse as dates, in the format of the
+        first one when it has a recognisable format.
+
+        Without one, values are parsed one by one, which is slow, so
+        only after the first few all parsed that way.
+        """
+
+        if text.empty:
+            return 0
+
+        if has_digit is not None and has_digit.mean() < ClassificationEngine.DATETIME_SHARE:
+            return 0
+
+        fmt = guess_datetime_format(text.iloc[0])
+
+        try:
+            if fmt is None and pd.to_datetime(text.iloc[:5], errors="coerce", format="mixed").isna().any():
+                return 0
+
+            parsed = pd.to_datetime(text, errors="coerce", format=fmt or "mixed")
+        except (ValueError, TypeError, OverflowError):
+            return 0
+
+        return int(parsed.notna().sum())
+
+    @staticmethod
+    def _full_alphanumeric(series: pd.Series) -> bool:
+
+        values, _ = ClassificationEngine._text_values(series)
+
+        return bool(
+            values.str.contains(r"[a-zA-Z]").any() and
+            values.str.contains(r"[0-9]").any()
+        )
+
+    @staticmethod
+    def _full_mean_length(series: pd.Series) -> float:
+
+        values, counts = ClassificationEngine._text_values(series)
+
+        return np.average(values.str.len(), weights=counts) if counts.sum() else 0
+
+    @staticmethod
+    def _text_values(series: pd.Series):
+        """
+        Non-null values as strings, with how often each occurs.
 
-            # Text (long strings)
-            avg_len = series.dropna().astype(str).str.len().mean()
-            if avg_len and avg_len > 30:
-                classification["text"].append(col)
-                continue
+        Categoricals are answered from their categories, so compact
+        frames are never expanded back to one string per row.
+        """
 
-            # Default → categorical
-            classification["categorical"].append(col)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+            used = counts > 0
+            return pd.Series(series.cat.categories[used]).astype(str), counts[used]
 
-        return classification
\ No newline at end of file
+        values = series.dropna().astype(str)
+        return values, np.ones(len(values))
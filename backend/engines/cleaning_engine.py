@@ -17,22 +17,21 @@ class CleaningEngine:
         elif strategy == "remove_both":
             df = df.dropna().drop_duplicates()
 
+        # Fill values go through one fillna call: chained inplace fills
+        # on df[col] are silently dropped under copy-on-write
         elif strategy == "fill_mean":
             numeric_cols = df.select_dtypes(include="number").columns
-            for col in numeric_cols:
-                df[col].fillna(df[col].mean(), inplace=True)
+            df = df.fillna({col: df[col].mean() for col in numeric_cols})
 
         elif strategy == "fill_mode":
-            for col in df.columns:
-                df[col].fillna(df[col].mode()[0], inplace=True)
+            modes = {col: df[col].mode() for col in df.columns}
+            df = df.fillna({col: mode[0] for col, mode in modes.items() if not mode.empty})
 
         return df
 
     @staticmethod
     def simulate_cleaning(df: pd.DataFrame, strategy: str, outlier_method: str = "iqr"):
 
-        df_copy = df.copy()
-
         rows_before = len(df)
         missing_ratio_before = df.isnull().mean().mean()
         duplicate_ratio_before = df.duplicated().mean()
@@ -48,7 +47,8 @@ class CleaningEngine:
             outlier_percent_before / 100
         )
 
-        df_copy = CleaningEngine.apply_cleaning(df_copy, strategy)
+        # apply_cleaning never mutates its input
+        df_copy = CleaningEngine.apply_cleaning(df, strategy)
 
         rows_after = len(df_copy)
         missing_ratio_after = df_copy.isnull().mean().mean()
@@ -0,0 +1,293 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from backend.core.row_index import RowHashIndex
+from backend.engines.iqr_kernel import IQRKernel
+from backend.engines.outlier_engine import OutlierEngine
+
+
+class CleaningPlan:
+    """
+    Cleaning steps recorded against an unmodified frame instead of
+    applied to copies of it.
+
+    The plan is a column projection, per-column fill values and a
+    boolean row mask over the original rows. Metrics are read straight
+    from the plan; materialize() builds the cleaned frame once, at the
+    end. Steps return the plan, so they chain.
+    """
+
+    def __init__(self, df: pd.DataFrame, row_index: RowHashIndex = None, dataset_id: str = None):
+        self.df = df
+        self.dataset_id = dataset_id
+
+        self.columns = list(df.columns)
+        self.fills = {}
+        self.keep = np.ones(len(df), dtype=bool)
+        self.row_index = row_index if row_index is not None else RowHashIndex.from_frame(df)
+
+        # Per-projection arrays, shared with branches
+        self._cache = {}
+
+    def branch(self) -> "CleaningPlan":
+        """
+        Independent copy of the plan that shares its cached arrays.
+        """
+
+        plan = copy.copy(self)
+        plan.columns = list(self.columns)
+        plan.fills = dict(self.fills)
+        plan.keep = self.keep.copy()
+
+        return plan
+
+    # =====================================================
+    # STEPS
+    # =====================================================
+    def drop_columns(self, columns: list) -> "CleaningPlan":
+
+        dropped = set(columns)
+        remaining = [col for col in self.columns if col not in dropped]
+
+        if len(remaining) != len(self.columns):
+            self.columns = remaining
+            self.fills = {col: value for col, value in self.fills.items() if col not in dropped}
+            self.row_index = RowHashIndex.from_frame(self._frame())
+            self._cache = {}
+
+        return self
+
+    def fill_missing(self) -> "CleaningPlan":
+        """
+        Median for numeric columns, mode (or "Unknown") for the rest,
+        taken over the kept rows.
+        """
+
+        kept_all = self.keep.all()
+        numeric = set(self.numeric_columns)
+        filled_rows = np.zeros(len(self.df), dtype=bool)
+
+        for col in self.columns:
+
+            if col in self.fills:
+                continue
+
+            series = self.df[col] if kept_all else self.df[col][self.keep]
+            nulls = series.isna()
+
+            if not nulls.any():
+                continue
+
+            if col in numeric:
+                # In float64 even for compact float32 columns
+                value = series.astype(np.float64).median()
+                if pd.isna(value):
+                    continue
+            else:
+                mode_series = series.mode()
+                value = mode_series.iloc[0] if not mode_series.empty else "Unknown"
+
+            self.fills[col] = value
+            filled_rows |= self.df[col].isna().to_numpy() & self.keep
+
+        positions = np.flatnonzero(filled_rows)
+
+        if positions.size:
+            self.row_index = self.row_index.replace(positions, self._frame(positions))
+            self._cache = {}
+
+        return self
+
+    def remove_duplicates(self) -> "CleaningPlan":
+
+        positions = np.flatnonzero(self.keep)
+        self.keep[positions[self._kept_index().duplicate_mask]] = False
+
+        return self
+
+    def remove_outliers(self, method: str = "iqr") -> "CleaningPlan":
+
+        self.keep &= ~self.outlier_mask(method)
+
+        return self
+
+    # =====================================================
+    # METRICS
+    # =====================================================
+    @property
+    def rows(self) -> int:
+        return int(self.keep.sum())
+
+    @property
+    def missing_percentage(self) -> float:
+
+        cells = self.rows * len(self.columns)
+
+        if cells == 0:
+            return 0
+
+        missing = sum(
+            int(self.df[col].isna().to_numpy()[self.keep].sum())
+            for col in self.columns
+            if col not in self.fills
+        )
+
+        return (missing / cells) * 100
+
+    @property
+    def duplicate_percentage(self) -> float:
+
+        if self.rows == 0:
+            return 0
+
+        return (self._kept_index().duplicate_count / self.rows) * 100
+
+    def outlier_percentage(self, method: str = "iqr") -> float:
+
+        if self.rows == 0 or not self.numeric_columns:
+            return 0.0
+
+        return round((self.outlier_mask(method).sum() / self.rows) * 100, 2)
+
+    def outlier_mask(self, method: str = "iqr") -> np.ndarray:
+        """
+        Outlier rows among the kept ones, by the same rules as
+        OutlierEngine on the cleaned frame.
+        """
+
+        mask = np.zeros(len(self.keep), dtype=bool)
+        rows = self.rows
+
+        if rows == 0 or not self.numeric_columns:
+            return mask
+
+        if method == "iqr":
+            values = self.numeric_values[self.keep]
+            q1, q3 = IQRKernel.quartiles(values)
+            mask[self.keep] = IQRKernel.compute(values, q1, q3)["row_mask"]
+            return mask
+
+        if rows < 5:
+            return mask
+
+        # A stored dataset's model scores rows independently of the rest,
+        # so its mask over all rows is computed once per projection
+        if self.dataset_id is not None:
+            if "isolation" not in self._cache:
+                model = OutlierEngine.isolation_model(self._numeric_frame(), self.dataset_id)
+                self._cache["isolation"] = model.outlier_mask(self.numeric_values)
+            return self._cache["isolation"] & self.keep
+
+        values = self.numeric_values[self.keep]
+        numeric_df = pd.DataFrame(values, columns=self.numeric_columns)
+        mask[self.keep] = OutlierEngine.isolation_model(numeric_df).outlier_mask(values)
+
+        return mask
+
+    # =====================================================
+    # ARRAYS
+    # =====================================================
+    @property
+    def numeric_columns(self) -> list:
+
+        if "numeric_columns" not in self._cache:
+            numeric = set(self.df.select_dtypes(include=[np.number]).columns)
+            self._cache["numeric_columns"] = [col for col in self.columns if col in numeric]
+
+        return self._cache["numeric_columns"]
+
+    @property
+    def numeric_values(self) -> np.ndarray:
+        """
+        2D float64 array of the numeric columns over all original rows,
+        fills applied (NaN where still missing).
+        """
+
+        if "numeric_values" not in self._cache:
+            values = self._numeric_frame().to_numpy(dtype=np.float64, na_value=np.nan)
+
+            # A single float64 block comes back as a read-only view
+            if not values.flags.writeable:
+                values = values.copy()
+
+            for j, col in enumerate(self.numeric_columns):
+                if col in self.fills:
+                    column = values[:, j]
+                    column[np.isnan(column)] = self.fills[col]
+
+            self._cache["numeric_values"] = values
+
+        return self._cache["numeric_values"]
+
+    def _numeric_frame(self) -> pd.DataFrame:
+        numeric = set(self.numeric_columns)
+        return self.df.drop(columns=[col for col in self.df.columns if col not in numeric])
+
+    def _kept_index(self) -> RowHashIndex:
+
+        if self.keep.all():
+            return self.row_index
+
+        return RowHashIndex(np.asarray(self.row_index.hashes)[self.keep])
+
+    # =====================================================
+    # MATERIALIZE
+    # =====================================================
+    def _frame(self, positions: np.ndarray = None) -> pd.DataFrame:
+
+        df = self.df if positions is None else self.df.iloc[positions]
+
+        projected = set(self.columns)
+        df = df.drop(columns=[col for col in df.columns if col not in projected])
+
+        if self.fills:
+            df = self._fillable(df).fillna(self.fills)
+
+        return df
+
+    def _fillable(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compact columns (see compact_dtypes) made able to take their
+        fill value as-is: float32 widened, new categories added.
+        """
+
+        widened = {}
+
+        for col, value in self.fills.items():
+            series = df[col]
+
+            if series.dtype == np.float32:
+                widened[col] = series.astype(np.float64)
+            elif isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+                widened[col] = series.cat.add_categories([value])
+
+        if widened:
+            df = df.copy(deep=False)
+            for col, series in widened.items():
+                df[col] = series
+
+        return df
+
+    def materialize(self) -> pd.DataFrame:
+        """
+        The cleaned frame: kept rows, projected columns, fills applied.
+        """
+
+        if self.keep.all():
+            return self._frame()
+
+        return self._frame(np.flatnonzero(self.keep))
+
+    def iter_chunks(self, chunk_rows: int):
+        """
+        The cleaned frame in blocks of up to chunk_rows kept rows (at
+        least one block, possibly empty, so the schema always comes
+        through).
+        """
+
+        positions = np.flatnonzero(self.keep)
+
+        for start in range(0, max(len(positions), 1), chunk_rows):
+            yield self._frame(positions[start:start + chunk_rows])
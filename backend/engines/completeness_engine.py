@@ -1,16 +1,19 @@
 import pandas as pd
 
+from backend.engines.dataset_stats import DatasetStats, SummaryStats
+
 
 class CompletenessEngine:
 
     @staticmethod
-    def calculate(df: pd.DataFrame) -> float:
-        total_cells = len(df) * len(df.columns)
+    def calculate(df: pd.DataFrame, stats: SummaryStats = None) -> float:
+        stats = stats or DatasetStats(df)
+        total_cells = stats.total_cells
 
         if total_cells == 0:
             return 0.0
 
-        total_missing = df.isna().sum().sum()
+        total_missing = stats.total_missing
 
         completeness = (1 - (total_missing / total_cells)) * 100
 
@@ -1,6 +1,10 @@
-def calculate_consistency(df):
-    total_cells = len(df) * len(df.columns)
-    total_missing = df.isna().sum().sum()
+from backend.engines.dataset_stats import DatasetStats
+
+
+def calculate_consistency(df, stats: DatasetStats = None):
+    stats = stats or DatasetStats(df)
+    total_cells = stats.total_cells
+    total_missing = stats.total_missing
 
     if total_cells == 0:
         return 0
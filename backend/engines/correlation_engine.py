@@ -0,0 +1,337 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
+from scipy.stats import kendalltau, rankdata
+
+from backend.config import KENDALL_MAX_ROWS
+from backend.core.sampling import stratified_positions
+
+
+class CorrelationEngine:
+    """
+    Pairwise-complete Pearson correlation computed with matrix products.
+
+    Matches DataFrame.corr() (each pair uses the rows where both columns
+    are present) but never loops over column pairs in Python. Missing
+    values are handled with mask products, and very wide tables are
+    processed in column blocks in float32.
+
+    Spearman is the same computation over column ranks; Kendall tau-b
+    runs scipy's O(n log n) algorithm per pair.
+    """
+
+    METHODS = ("pearson", "spearman", "kendall")
+
+    # Switch to float32 blocks from this many numeric columns on
+    WIDE_TABLE_COLUMNS = 1000
+    BLOCK_SIZE = 512
+
+    # =====================================================
+    # MATRIX
+    # =====================================================
+    @staticmethod
+    def compute(df: pd.DataFrame) -> pd.DataFrame:
+
+        numeric_df = df.select_dtypes(include=["number"])
+        columns = numeric_df.columns
+
+        values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        corr = CorrelationEngine.pearson(values)
+
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    @staticmethod
+    def pearson(values: np.ndarray) -> np.ndarray:
+
+        n, k = values.shape
+        wide = k >= CorrelationEngine.WIDE_TABLE_COLUMNS
+        dtype = np.float32 if wide else np.float64
+
+        mask = ~np.isnan(values)
+        has_missing = not mask.all()
+
+        # Standardize in float64 first so float32 products don't lose
+        # precision to large offsets
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(values, axis=0)
+            std = np.nanstd(values, axis=0)
+
+        mean = np.nan_to_num(mean)
+        std = np.where((std > 0) & np.isfinite(std), std, 1.0)
+
+        z = (values - mean) / std
+        z[~mask] = 0
+        z = z.astype(dtype, copy=False)
+
+        m = mask.astype(dtype) if has_missing else None
+
+        corr = np.empty((k, k), dtype=dtype)
+        step = CorrelationEngine.BLOCK_SIZE if wide else max(k, 1)
+
+        for i in range(0, k, step):
+            zi = z[:, i:i + step]
+            mi = m[:, i:i + step] if has_missing else None
+
+            for j in range(i, k, step):
+                zj = z[:, j:j + step]
+
+                if has_missing:
+                    block = CorrelationEngine._masked_block(zi, mi, zj, m[:, j:j + step])
+                else:
+                    block = CorrelationEngine._dense_block(zi, zj)
+
+                corr[i:i + step, j:j + step] = block
+                corr[j:j + step, i:i + step] = block.T
+
+        np.clip(corr, -1, 1, out=corr)
+
+        return corr
+
+    @staticmethod
+    def _dense_block(zi: np.ndarray, zj: np.ndarray) -> np.ndarray:
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ss_i = np.einsum("ij,ij->j", zi, zi)
+            ss_j = np.einsum("ij,ij->j", zj, zj)
+            return (zi.T @ zj) / np.sqrt(np.outer(ss_i, ss_j))
+
+    @staticmethod
+    def _masked_block(zi, mi, zj, mj) -> np.ndarray:
+
+        # Per-pair sums restricted to the rows where both columns exist
+        n = mi.T @ mj
+        sx = zi.T @ mj
+        sy = mi.T @ zj
+        sxx = (zi * zi).T @ mj
+        syy = mi.T @ (zj * zj)
+        sxy = zi.T @ zj
+
+        return CorrelationEngine._from_sums(n, sx, sy, sxx, syy, sxy)
+
+    @staticmethod
+    def _from_sums(n, sx, sy, sxx, syy, sxy) -> np.ndarray:
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = sxy - sx * sy / n
+            var_x = sxx - sx * sx / n
+            var_y = syy - sy * sy / n
+            corr = cov / np.sqrt(var_x * var_y)
+
+        # A single shared row carries no correlation (pandas gives NaN)
+        corr[n < 2] = np.nan
+
+        return corr
+
+    # =====================================================
+    # RANK CORRELATIONS
+    # =====================================================
+    @staticmethod
+    def rank_column(values: np.ndarray) -> np.ndarray:
+        """
+        Average ranks (ties share their mean rank) of the present
+        values; NaN stays NaN.
+        """
+        return rankdata(values, nan_policy="omit")
+
+    @staticmethod
+    def spearman(ranks: np.ndarray) -> np.ndarray:
+        """
+        Spearman matrix from per-column ranks: one Pearson pass.
+
+        Each column is ranked over all its present values, so with
+        missing values a pair's ranks are not re-ranked over just their
+        shared rows (as DataFrame.corr("spearman") does); without
+        missing values the two agree.
+        """
+        return CorrelationEngine.pearson(ranks)
+
+    @staticmethod
+    def kendall(values: np.ndarray, max_rows: int = KENDALL_MAX_ROWS) -> np.ndarray:
+        """
+        Kendall tau-b per pair over the rows where both columns are
+        present. Pairs sharing more than max_rows rows are estimated
+        from a stratified sample of them.
+        """
+
+        n, k = values.shape
+        mask = ~np.isnan(values)
+
+        corr = np.full((k, k), np.nan)
+
+        for i in range(k):
+
+            # Constant or (nearly) empty columns correlate with nothing
+            present = values[mask[:, i], i]
+            if len(present) > 1 and present.min() != present.max():
+                corr[i, i] = 1.0
+
+            for j in range(i + 1, k):
+
+                rows = np.flatnonzero(mask[:, i] & mask[:, j])
+
+                if len(rows) > max_rows:
+                    rows = rows[stratified_positions(len(rows), max_rows)]
+
+                if len(rows) < 2:
+                    continue
+
+                with warnings.catch_warnings():
+                    # Constant inputs give NaN, same as pandas
+                    warnings.simplefilter("ignore")
+                    tau = kendalltau(values[rows, i], values[rows, j], variant="b").statistic
+
+                corr[i, j] = corr[j, i] = tau
+
+        return corr
+
+    # =====================================================
+    # STRONG PAIRS
+    # =====================================================
+    @staticmethod
+    def top_pairs(corr: pd.DataFrame, threshold: float = 0.8, max_pairs: int = 20):
+
+        k = corr.shape[0]
+
+        if k < 2:
+            return []
+
+        values = np.nan_to_num(corr.to_numpy(), nan=0.0, posinf=0.0, neginf=0.0)
+
+        rows, cols = np.triu_indices(k, 1)
+        raw_values = values[rows, cols]
+
+        # Threshold on the raw value; round only for output
+        selected = np.flatnonzero(np.abs(raw_values) >= threshold)
+        pair_values = np.round(raw_values, 3)
+
+        # Strongest first (as rounded); stable so ties keep matrix order
+        order = np.argsort(-np.abs(pair_values[selected]), kind="stable")
+        selected = selected[order][:max_pairs]
+
+        columns = corr.columns
+
+        return [
+            {
+                "feature_1": columns[rows[idx]],
+                "feature_2": columns[cols[idx]],
+                "correlation": float(pair_values[idx])
+            }
+            for idx in selected
+        ]
+
+    # =====================================================
+    # HEATMAP
+    # =====================================================
+    @staticmethod
+    def heatmap_features(corr: pd.DataFrame, variances: pd.Series, max_features: int = 25):
+        """
+        Pick the highest-variance features, then order them by
+        hierarchical clustering so correlated blocks sit together.
+        """
+
+        variances = variances.reindex(corr.columns).fillna(0)
+        features = variances.sort_values(ascending=False, kind="stable").index[:max_features]
+
+        if len(features) <= 2:
+            return list(features)
+
+        sub = corr.loc[features, features].to_numpy(dtype=np.float64)
+        distance = 1 - np.abs(np.nan_to_num(sub, nan=0.0))
+        np.fill_diagonal(distance, 0)
+
+        order = leaves_list(
+            linkage(squareform(distance, checks=False), method="average")
+        )
+
+        return [features[i] for i in order]
+
+    @staticmethod
+    def heatmap(corr: pd.DataFrame, variances: pd.Series, max_features: int = 25):
+
+        features = CorrelationEngine.heatmap_features(corr, variances, max_features)
+
+        if len(features) < 2:
+            return []
+
+        sub = corr.loc[features, features]
+        values = np.round(
+            np.nan_to_num(sub.to_numpy(dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0),
+            3
+        ).ravel().tolist()
+
+        k = len(features)
+        xs = np.repeat(np.arange(k), k)
+        ys = np.tile(np.arange(k), k)
+
+        return [
+            {"x": features[x], "y": features[y], "value": value}
+            for x, y, value in zip(xs, ys, values)
+        ]
+
+
+class CorrelationAccumulator:
+    """
+    Mergeable pairwise sufficient statistics for Pearson correlation.
+
+    Keeps per-pair row counts, sums, sums of squares and cross products
+    over the rows where both columns are present. Values are shifted by
+    a per-column constant taken from the first chunk to keep the sums
+    well conditioned. Memory is O(columns^2), independent of rows.
+    """
+
+    def __init__(self, columns):
+        k = len(columns)
+        self.columns = list(columns)
+        self.shift = None
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def update(self, values: np.ndarray):
+
+        if self.shift is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0))
+
+        mask = ~np.isnan(values)
+        m = mask.astype(np.float64)
+        z = np.where(mask, values - self.shift, 0.0)
+
+        self.n += m.T @ m
+        self.sx += z.T @ m
+        self.sxx += (z * z).T @ m
+        self.sxy += z.T @ z
+
+    def merge(self, other: "CorrelationAccumulator"):
+
+        if other.shift is None:
+            return
+
+        if self.shift is None:
+            self.shift = other.shift
+
+        # Re-express the other side's sums around our shift
+        d = (other.shift - self.shift)[:, None]
+        sx = other.sx + d * other.n
+        sxx = other.sxx + 2 * d * other.sx + d * d * other.n
+        sxy = other.sxy + d * other.sx.T + other.sx * d.T + (d @ d.T) * other.n
+
+        self.n += other.n
+        self.sx += sx
+        self.sxx += sxx
+        self.sxy += sxy
+
+    def correlation(self) -> pd.DataFrame:
+
+        corr = CorrelationEngine._from_sums(
+            self.n, self.sx, self.sx.T, self.sxx, self.sxx.T, self.sxy
+        )
+        np.clip(corr, -1, 1, out=corr)
+
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
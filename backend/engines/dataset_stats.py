@@ -0,0 +1,411 @@
+import warnings
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from backend.core.dataset_store import derived_columns, load_dataset
+from backend.core.executor import engine_executor
+from backend.core.result_cache import result_cache
+from backend.core.row_index import RowHashIndex, load_row_index
+from backend.engines.correlation_engine import CorrelationEngine
+from backend.engines.iqr_kernel import IQRKernel
+
+
+class SummaryStats:
+    """
+    The aggregate statistics the engines read: per-column counts,
+    moments, quartiles, outlier counts and the Pearson matrix. Nothing
+    here needs row-level data.
+
+    Subclasses provide rows, columns, total_cells, dataset_id,
+    null_counts, all_null_rows, duplicate_count, nunique,
+    numeric_columns, _moments, iqr_outliers (column_counts and
+    cell_count), noisy_percentage and correlation.
+    """
+
+    @cached_property
+    def total_missing(self) -> int:
+        return int(self.null_counts.sum())
+
+    # =====================================================
+    # NUMERIC MOMENTS + QUARTILES
+    # =====================================================
+    @property
+    def mean(self) -> pd.Series:
+        return self._moments["mean"]
+
+    @property
+    def std(self) -> pd.Series:
+        return self._moments["std"]
+
+    @property
+    def var(self) -> pd.Series:
+        return self._moments["var"]
+
+    @property
+    def skew(self) -> pd.Series:
+        return self._moments["skew"]
+
+    @property
+    def q1(self) -> pd.Series:
+        return self._moments["q1"]
+
+    @property
+    def q3(self) -> pd.Series:
+        return self._moments["q3"]
+
+    # =====================================================
+    # IQR OUTLIERS
+    # =====================================================
+    @property
+    def iqr_outlier_counts(self) -> pd.Series:
+        """
+        Per numeric column: values outside [Q1 - 1.5*IQR, Q3 + 1.5*IQR].
+
+        Constant columns are not special-cased here; callers decide
+        whether IQR == 0 should count.
+        """
+        return pd.Series(
+            self.iqr_outliers["column_counts"],
+            index=self.numeric_columns,
+            dtype="int64"
+        )
+
+    @property
+    def iqr_outlier_cells(self) -> int:
+        return self.iqr_outliers["cell_count"]
+
+    # =====================================================
+    # CORRELATION
+    # =====================================================
+    def correlation_for(self, method: str = "pearson") -> pd.DataFrame:
+        """
+        Correlation matrix by method. Only Pearson can be built from
+        aggregates; DatasetStats adds the rank methods.
+        """
+
+        if method == "pearson":
+            return self.correlation
+
+        raise ValueError(f"Unsupported correlation method: {method}")
+
+    # =====================================================
+    # DERIVED PERCENTAGES (used for scoring)
+    # =====================================================
+    @property
+    def missing_percentage(self) -> float:
+        if self.total_cells == 0:
+            return 0
+        return (self.total_missing / self.total_cells) * 100
+
+    @property
+    def duplicate_percentage(self) -> float:
+        if self.rows == 0:
+            return 0
+        return (self.duplicate_count / self.rows) * 100
+
+
+class DatasetStats(SummaryStats):
+    """
+    Shared per-column statistics for one DataFrame.
+
+    Each group of statistics is computed in a single vectorized pass the
+    first time it is needed and then reused by every engine, so one
+    request never rescans the frame for the same numbers.
+
+    Pass dataset_id only when df is the unmodified stored dataset; the
+    expensive pieces (correlation, row hashes) are then reused across
+    requests. A frame derived from a stored dataset can pass the
+    RowHashIndex it derived alongside it instead.
+    """
+
+    # Independent groups precompute() can run concurrently; numeric-only
+    # groups load just the numeric columns
+    STAT_GROUPS = {
+        "nulls": (["null_counts", "all_null_rows"], False),
+        "distinct": (["nunique"], False),
+        "moments": (["_moments", "iqr_outliers", "noisy_percentage"], True),
+        "correlation": (["correlation"], True),
+    }
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        dataset_id: str = None,
+        row_index: RowHashIndex = None
+    ):
+        self.df = df
+        self.dataset_id = dataset_id
+        self._row_index = row_index
+        self.rows = len(df)
+        self.columns = list(df.columns)
+        self.total_cells = self.rows * len(self.columns)
+
+    # =====================================================
+    # NULLS
+    # =====================================================
+    @cached_property
+    def null_mask(self) -> np.ndarray:
+        return self.df.isna().to_numpy()
+
+    @cached_property
+    def null_counts(self) -> pd.Series:
+        return pd.Series(self.null_mask.sum(axis=0), index=self.columns)
+
+    @cached_property
+    def all_null_rows(self) -> int:
+        if not self.columns:
+            return 0
+        return int(self.null_mask.all(axis=1).sum())
+
+    # =====================================================
+    # DUPLICATES
+    # =====================================================
+    @cached_property
+    def row_index(self) -> RowHashIndex:
+
+        if self._row_index is not None:
+            return self._row_index
+
+        if self.dataset_id is not None:
+            return load_row_index(self.dataset_id)
+
+        return RowHashIndex.from_frame(self.df)
+
+    @cached_property
+    def duplicate_mask(self) -> np.ndarray:
+        return self.row_index.duplicate_mask
+
+    @cached_property
+    def duplicate_count(self) -> int:
+        return self.row_index.duplicate_count
+
+    # =====================================================
+    # DISTINCT COUNTS
+    # =====================================================
+    @cached_property
+    def nunique(self) -> pd.Series:
+        return self.df.nunique(dropna=True)
+
+    # =====================================================
+    # NUMERIC MOMENTS + QUARTILES
+    # =====================================================
+    @cached_property
+    def numeric_columns(self) -> list:
+        return self.df.select_dtypes(include=["number"]).columns.tolist()
+
+    @cached_property
+    def numeric_values(self) -> np.ndarray:
+        """
+        2D float64 view of the numeric columns (NaN for missing).
+        """
+        return self.df[self.numeric_columns].to_numpy(
+            dtype=np.float64,
+            na_value=np.nan
+        )
+
+    @cached_property
+    def _moments(self) -> dict:
+
+        values = self.numeric_values
+        cols = self.numeric_columns
+
+        if not cols or self.rows == 0:
+            empty = pd.Series(dtype=float, index=cols)
+            return {
+                "count": empty, "mean": empty, "std": empty, "var": empty,
+                "skew": empty, "q1": empty, "q3": empty
+            }
+
+        # All-NaN columns legitimately produce NaN statistics
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+
+            count = (~np.isnan(values)).sum(axis=0)
+            mean = np.nanmean(values, axis=0)
+
+            centered = values - mean
+            m2 = np.nansum(centered ** 2, axis=0)
+            m3 = np.nansum(centered ** 3, axis=0)
+
+            # Sample variance (ddof=1), same as pandas
+            var = np.where(count > 1, m2 / (count - 1), np.nan)
+
+            # Adjusted Fisher-Pearson skew, same as pandas
+            skew = (count * np.sqrt(count - 1) / (count - 2)) * (m3 / m2 ** 1.5)
+            skew = np.where(m2 == 0, 0.0, skew)
+            skew = np.where(count < 3, np.nan, skew)
+
+        q1, q3 = IQRKernel.quartiles(values)
+
+        def series(arr):
+            return pd.Series(arr, index=cols, dtype=float)
+
+        return {
+            "count": series(count),
+            "mean": series(mean),
+            "std": series(np.sqrt(var)),
+            "var": series(var),
+            "skew": series(skew),
+            "q1": series(q1),
+            "q3": series(q3),
+        }
+
+    # =====================================================
+    # IQR OUTLIERS
+    # =====================================================
+    @cached_property
+    def iqr_outliers(self) -> dict:
+        """
+        Row mask, per-column counts and cell count from one IQRKernel
+        pass over the numeric values.
+        """
+        return IQRKernel.compute(
+            self.numeric_values,
+            self.q1.to_numpy(),
+            self.q3.to_numpy()
+        )
+
+    @property
+    def iqr_row_mask(self) -> np.ndarray:
+        return self.iqr_outliers["row_mask"]
+
+    # =====================================================
+    # CORRELATION
+    # =====================================================
+    @cached_property
+    def correlation(self) -> pd.DataFrame:
+        """
+        Pearson matrix of the numeric columns (NaN where undefined).
+        """
+
+        if self.dataset_id is None:
+            return CorrelationEngine.compute(self.df)
+
+        return result_cache.get_or_compute(
+            self.dataset_id,
+            "correlation-pearson",
+            lambda: CorrelationEngine.compute(self.df)
+        )
+
+    @cached_property
+    def ranks(self) -> np.ndarray:
+        """
+        Average ranks of each numeric column (NaN where missing). For a
+        stored dataset they are computed once per content and then
+        memory-mapped.
+        """
+
+        cols = self.numeric_columns
+
+        def rank(col):
+            return CorrelationEngine.rank_column(
+                self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            )
+
+        if self.dataset_id is None:
+            ranked = [rank(col) for col in cols]
+        else:
+            arrays = derived_columns(self.dataset_id, "ranks", cols, rank)
+            ranked = [arrays[col] for col in cols]
+
+        if not ranked:
+            return np.empty((self.rows, 0))
+
+        return np.column_stack(ranked)
+
+    @cached_property
+    def spearman_correlation(self) -> pd.DataFrame:
+        return self._rank_correlation("spearman", CorrelationEngine.spearman)
+
+    @cached_property
+    def kendall_correlation(self) -> pd.DataFrame:
+        # Ranks keep each column's order, so tau-b is unchanged
+        return self._rank_correlation("kendall", CorrelationEngine.kendall)
+
+    def _rank_correlation(self, method: str, compute) -> pd.DataFrame:
+
+        cols = self.numeric_columns
+
+        def matrix():
+            return pd.DataFrame(compute(self.ranks), index=cols, columns=cols)
+
+        if self.dataset_id is None:
+            return matrix()
+
+        return result_cache.get_or_compute(self.dataset_id, f"correlation-{method}", matrix)
+
+    def correlation_for(self, method: str = "pearson") -> pd.DataFrame:
+        """
+        Correlation matrix by method (one of CorrelationEngine.METHODS).
+        """
+
+        if method == "spearman":
+            return self.spearman_correlation
+
+        if method == "kendall":
+            return self.kendall_correlation
+
+        return super().correlation_for(method)
+
+    # =====================================================
+    # NOISE
+    # =====================================================
+    @cached_property
+    def noisy_percentage(self) -> float:
+        """
+        Share of numeric cells with |z-score| > 3.
+        """
+
+        values = self.numeric_values
+
+        if values.size == 0:
+            return 0
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z_scores = np.abs((values - self.mean.to_numpy()) / self.std.to_numpy())
+
+        noisy_cells = int((z_scores > 3).sum())
+
+        return (noisy_cells / values.size) * 100
+
+    # =====================================================
+    # PARALLEL PRECOMPUTE
+    # =====================================================
+    def precompute(self):
+        """
+        Compute the heavy statistic groups concurrently on the engine
+        executor. Only applies to stored datasets (dataset_id set) with
+        a process executor; otherwise everything stays lazy.
+        """
+
+        if self.dataset_id is None or not engine_executor.parallel:
+            return
+
+        numeric = self.numeric_columns
+
+        results = engine_executor.run_all({
+            group: (
+                compute_stat_group,
+                self.dataset_id,
+                group,
+                numeric if numeric_only else None
+            )
+            for group, (_, numeric_only) in self.STAT_GROUPS.items()
+        })
+
+        for values in results.values():
+            self.__dict__.update(values)
+
+
+def compute_stat_group(dataset_id: str, group: str, columns: list = None) -> dict:
+    """
+    Executor stage: one statistic group, read straight from the
+    memory-mapped columnar file.
+    """
+
+    stats = DatasetStats(load_dataset(dataset_id, columns), dataset_id)
+    names, _ = DatasetStats.STAT_GROUPS[group]
+
+    return {name: getattr(stats, name) for name in names}
@@ -1,13 +1,15 @@
 import pandas as pd
-import numpy as np
+
+from backend.engines.dataset_stats import DatasetStats, SummaryStats
 
 
 class ImportanceEngine:
 
     @staticmethod
-    def calculate(df: pd.DataFrame):
+    def calculate(df: pd.DataFrame, stats: SummaryStats = None):
 
-        total_rows = len(df)
+        stats = stats or DatasetStats(df)
+        total_rows = stats.rows
 
         if total_rows == 0:
             return {}
@@ -21,12 +23,12 @@ class ImportanceEngine:
             # =====================
             # Missing Ratio
             # =====================
-            missing_ratio = series.isnull().mean()
+            missing_ratio = stats.null_counts[col] / total_rows
 
             # =====================
             # Unique Ratio
             # =====================
-            unique_count = series.nunique(dropna=True)
+            unique_count = stats.nunique[col]
             unique_ratio = unique_count / total_rows if total_rows > 0 else 0
 
             # =====================
@@ -52,8 +54,9 @@ class ImportanceEngine:
             # =====================
             variance_bonus = 0
             if pd.api.types.is_numeric_dtype(series) and not is_constant:
-                variance = series.var()
-                if variance > 0:
+                # Bool columns have no moments (numeric_columns leaves
+                # them out); one with both values always varies
+                if col not in stats.numeric_columns or stats.var[col] > 0:
                     variance_bonus = 10
 
             # =====================
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from backend.config import (
+    ISOLATION_FOREST_FIT_ROWS,
+    ISOLATION_FOREST_N_JOBS,
+    OUTLIER_MODEL_CACHE_SIZE,
+)
+from backend.core.dataset_store import dataset_fingerprint
+
+
+class IsolationForestModel:
+    """
+    IsolationForest fitted on a bounded row sample.
+
+    Trees only ever see max_samples (256) rows each, so fitting on a
+    sample of at most ISOLATION_FOREST_FIT_ROWS rows keeps the fit cost
+    flat while the contamination threshold still reflects the whole
+    column distribution. Scoring runs in fixed-size row batches.
+    """
+
+    PREDICT_BATCH_ROWS = 100_000
+
+    def __init__(self, columns, forest: IsolationForest):
+        self.columns = list(columns)
+        self.forest = forest
+
+    @classmethod
+    def fit(cls, columns, values: np.ndarray) -> "IsolationForestModel":
+
+        if len(values) > ISOLATION_FOREST_FIT_ROWS:
+            rng = np.random.default_rng(42)
+            sample = np.sort(rng.choice(len(values), ISOLATION_FOREST_FIT_ROWS, replace=False))
+            values = values[sample]
+
+        forest = IsolationForest(
+            contamination=0.05,
+            random_state=42,
+            n_jobs=ISOLATION_FOREST_N_JOBS
+        )
+        forest.fit(values)
+
+        return cls(columns, forest)
+
+    def outlier_mask(self, values: np.ndarray) -> np.ndarray:
+
+        mask = np.zeros(len(values), dtype=bool)
+
+        for start in range(0, len(values), self.PREDICT_BATCH_ROWS):
+            batch = values[start:start + self.PREDICT_BATCH_ROWS]
+            mask[start:start + len(batch)] = self.forest.predict(batch) == -1
+
+        return mask
+
+
+class OutlierModelCache:
+    """
+    Fitted models per (dataset content, column set), least recently
+    used dropped first.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_fit(self, dataset_id: str, columns, fit) -> IsolationForestModel:
+
+        # Content only, so identical uploads share a model
+        key = (dataset_fingerprint(dataset_id), tuple(columns))
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+
+        model = fit()
+
+        with self._lock:
+            self._models[key] = model
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+        return model
+
+
+outlier_model_cache = OutlierModelCache(OUTLIER_MODEL_CACHE_SIZE)
@@ -1,15 +1,31 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import IsolationForest
+
+from backend.core.dataset_store import load_dataset
+from backend.engines.dataset_stats import DatasetStats, SummaryStats
+from backend.engines.isolation_forest import IsolationForestModel, outlier_model_cache
 
 
 class OutlierEngine:
+    """
+    IQR and IsolationForest outlier detection.
+
+    Methods take an optional dataset_id when the frame is (or was
+    derived from) a stored dataset: IsolationForest models are then
+    fitted once on that dataset's columns and reused across requests
+    and across the before/after frames of a simulation.
+    """
 
     # =====================================================
     # OVERALL OUTLIER %
     # =====================================================
     @staticmethod
-    def detect_percentage(df: pd.DataFrame, method: str = "iqr") -> float:
+    def detect_percentage(
+        df: pd.DataFrame,
+        method: str = "iqr",
+        stats: DatasetStats = None,
+        dataset_id: str = None
+    ) -> float:
 
         numeric_df = df.select_dtypes(include=[np.number])
 
@@ -17,9 +33,9 @@ class OutlierEngine:
             return 0.0
 
         if method == "iqr":
-            mask = OutlierEngine._iqr_mask(numeric_df)
+            mask = OutlierEngine._iqr_mask(numeric_df, stats)
         else:
-            mask = OutlierEngine._isolation_mask(numeric_df)
+            mask = OutlierEngine._isolation_mask(numeric_df, dataset_id)
 
         return round((mask.sum() / len(numeric_df)) * 100, 2)
 
@@ -27,7 +43,12 @@ class OutlierEngine:
     # COLUMN-WISE OUTLIERS
     # =====================================================
     @staticmethod
-    def detect_column_outliers(df: pd.DataFrame, method: str = "iqr"):
+    def detect_column_outliers(
+        df: pd.DataFrame,
+        method: str = "iqr",
+        stats: SummaryStats = None,
+        dataset_id: str = None
+    ):
 
         numeric_df = df.select_dtypes(include=[np.number])
 
@@ -38,9 +59,9 @@ class OutlierEngine:
 
         if method == "iqr":
 
-            Q1 = numeric_df.quantile(0.25)
-            Q3 = numeric_df.quantile(0.75)
-            IQR = Q3 - Q1
+            stats = stats or DatasetStats(df)
+            IQR = stats.q3 - stats.q1
+            counts = stats.iqr_outlier_counts
 
             for col in numeric_df.columns:
 
@@ -49,12 +70,7 @@ class OutlierEngine:
                     column_outliers[col] = 0.0
                     continue
 
-                lower = Q1[col] - 1.5 * IQR[col]
-                upper = Q3[col] + 1.5 * IQR[col]
-
-                mask = (numeric_df[col] < lower) | (numeric_df[col] > upper)
-
-                percentage = (mask.sum() / len(numeric_df)) * 100
+                percentage = (counts[col] / stats.rows) * 100
                 column_outliers[col] = round(float(percentage), 2)
 
         else:
@@ -67,13 +83,8 @@ class OutlierEngine:
                     column_outliers[col] = 0.0
                     continue
 
-                model = IsolationForest(
-                    contamination=0.05,
-                    random_state=42
-                )
-
-                preds = model.fit_predict(series)
-                mask = preds == -1
+                model = OutlierEngine.isolation_model(series, dataset_id)
+                mask = model.outlier_mask(series.to_numpy(dtype=np.float64))
 
                 percentage = (mask.sum() / len(series)) * 100
                 column_outliers[col] = round(float(percentage), 2)
@@ -100,7 +111,12 @@ class OutlierEngine:
     # REMOVE OUTLIERS (ROW LEVEL)
     # =====================================================
     @staticmethod
-    def remove_outliers(df: pd.DataFrame, method: str = "iqr") -> pd.DataFrame:
+    def remove_outliers(
+        df: pd.DataFrame,
+        method: str = "iqr",
+        stats: DatasetStats = None,
+        dataset_id: str = None
+    ) -> pd.DataFrame:
 
         numeric_df = df.select_dtypes(include=[np.number])
 
@@ -108,9 +124,9 @@ class OutlierEngine:
             return df
 
         if method == "iqr":
-            mask = OutlierEngine._iqr_mask(numeric_df)
+            mask = OutlierEngine._iqr_mask(numeric_df, stats)
         else:
-            mask = OutlierEngine._isolation_mask(numeric_df)
+            mask = OutlierEngine._isolation_mask(numeric_df, dataset_id)
 
         return df.loc[~mask]
 
@@ -118,38 +134,48 @@ class OutlierEngine:
     # INTERNAL METHODS
     # =====================================================
     @staticmethod
-    def _iqr_mask(numeric_df: pd.DataFrame):
-
-        Q1 = numeric_df.quantile(0.25)
-        Q3 = numeric_df.quantile(0.75)
-        IQR = Q3 - Q1
-
-        mask = pd.Series(False, index=numeric_df.index)
+    def _iqr_mask(numeric_df: pd.DataFrame, stats: DatasetStats = None):
 
-        for col in numeric_df.columns:
+        stats = stats or DatasetStats(numeric_df)
 
-            if IQR[col] == 0:
-                continue
-
-            lower = Q1[col] - 1.5 * IQR[col]
-            upper = Q3[col] + 1.5 * IQR[col]
-
-            col_mask = (numeric_df[col] < lower) | (numeric_df[col] > upper)
-
-            mask = mask | col_mask
-
-        return mask
+        return pd.Series(stats.iqr_row_mask, index=numeric_df.index)
 
     @staticmethod
-    def _isolation_mask(numeric_df: pd.DataFrame):
+    def _isolation_mask(numeric_df: pd.DataFrame, dataset_id: str = None):
 
         if len(numeric_df) < 5:
             return pd.Series([False] * len(numeric_df), index=numeric_df.index)
 
-        model = IsolationForest(
-            contamination=0.05,
-            random_state=42
+        model = OutlierEngine.isolation_model(numeric_df, dataset_id)
+        mask = model.outlier_mask(
+            numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
         )
 
-        preds = model.fit_predict(numeric_df)
-        return pd.Series(preds == -1, index=numeric_df.index)
\ No newline at end of file
+        return pd.Series(mask, index=numeric_df.index)
+
+    @staticmethod
+    def isolation_model(numeric_df: pd.DataFrame, dataset_id: str = None):
+        """
+        Fitted model for these columns. With a dataset_id it is fitted on
+        the stored dataset (NaN rows dropped for a single column, like
+        the per-column scores) and cached; otherwise on numeric_df.
+        """
+
+        columns = list(numeric_df.columns)
+
+        def training_values(frame):
+            if len(columns) == 1:
+                frame = frame.dropna()
+            return frame.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        if dataset_id is None:
+            return IsolationForestModel.fit(columns, training_values(numeric_df))
+
+        return outlier_model_cache.get_or_fit(
+            dataset_id,
+            columns,
+            lambda: IsolationForestModel.fit(
+                columns,
+                training_values(load_dataset(dataset_id)[columns])
+            )
+        )
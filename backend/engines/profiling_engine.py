@@ -1,25 +1,29 @@
 import pandas as pd
 import numpy as np
 
+from backend.engines.dataset_stats import DatasetStats
+
 
 class ProfilingEngine:
 
     @staticmethod
-    def generate_profile(df: pd.DataFrame):
+    def generate_profile(df: pd.DataFrame, stats: DatasetStats = None):
         """
         Generate complete dataset profile
         """
 
-        rows = len(df)
-        columns = len(df.columns)
+        stats = stats or DatasetStats(df)
+
+        rows = stats.rows
+        columns = len(stats.columns)
 
         # Missing values
-        total_missing = df.isnull().sum().sum()
+        total_missing = stats.total_missing
         total_cells = rows * columns if rows * columns > 0 else 1
         missing_ratio = total_missing / total_cells
 
         # Duplicate rows
-        duplicate_count = df.duplicated().sum()
+        duplicate_count = stats.duplicate_count
         duplicate_ratio = duplicate_count / rows if rows > 0 else 0
 
         # Data type breakdown
@@ -37,11 +41,10 @@ class ProfilingEngine:
 
         # Correlation matrix
         correlation = {}
-        numeric_df = df.select_dtypes(include=np.number)
 
-        if not numeric_df.empty:
+        if stats.numeric_columns:
             correlation = (
-                numeric_df.corr()
+                stats.correlation
                 .round(2)
                 .fillna(0)
                 .to_dict()
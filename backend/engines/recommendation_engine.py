@@ -1,21 +1,24 @@
 import pandas as pd
-import numpy as np
+
+from backend.engines.dataset_stats import DatasetStats
 
 
 class RecommendationEngine:
 
     @staticmethod
-    def analyze(df: pd.DataFrame):
+    def analyze(df: pd.DataFrame, stats: DatasetStats = None):
+
+        stats = stats or DatasetStats(df)
 
-        total_rows = len(df)
-        total_cols = len(df.columns)
+        total_rows = stats.rows
+        total_cols = len(stats.columns)
         total_cells = total_rows * total_cols
 
         recommendations = []
 
         # ================= MISSING VALUES =================
         for col in df.columns:
-            missing_ratio = df[col].isnull().mean()
+            missing_ratio = stats.null_counts[col] / total_rows
 
             if missing_ratio > 0.3:
                 recommendations.append({
@@ -34,7 +37,7 @@ class RecommendationEngine:
 
         # ================= HIGH UNIQUENESS =================
         for col in df.columns:
-            unique_ratio = df[col].nunique() / total_rows
+            unique_ratio = stats.nunique[col] / total_rows
 
             if unique_ratio > 0.95:
                 recommendations.append({
@@ -45,10 +48,7 @@ class RecommendationEngine:
                 })
 
         # ================= SKEW DETECTION =================
-        numeric_cols = df.select_dtypes(include=np.number).columns
-
-        for col in numeric_cols:
-            skewness = df[col].skew()
+        for col, skewness in stats.skew.items():
 
             if abs(skewness) > 1:
                 recommendations.append({
@@ -59,7 +59,7 @@ class RecommendationEngine:
                 })
 
         # ================= DUPLICATE CHECK =================
-        duplicate_ratio = df.duplicated().mean()
+        duplicate_ratio = stats.duplicate_count / total_rows
 
         if duplicate_ratio > 0.05:
             recommendations.append({
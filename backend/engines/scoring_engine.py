@@ -26,6 +26,20 @@ class ScoringEngine:
 
         return round(score, 2)
 
+    @staticmethod
+    def calculate_score_from_stats(stats, outlier_pct, noisy_pct=0):
+        """
+        Quality score using the cell-level missing and row-level
+        duplicate percentages already held in a DatasetStats.
+        """
+
+        return ScoringEngine.calculate_score(
+            stats.missing_percentage,
+            stats.duplicate_percentage,
+            outlier_pct,
+            noisy_pct
+        )
+
     @staticmethod
     def get_ml_readiness(score):
         """
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+
+
+# =====================================================
+# MOMENTS (Welford / Chan, vectorized over columns)
+# =====================================================
+
+class MomentAccumulator:
+    """
+    Mergeable count / mean / M2 / M3 per column.
+
+    Each chunk is reduced with NumPy and folded in with the parallel
+    update formulas, so the result does not depend on how rows were
+    split into chunks.
+    """
+
+    def __init__(self, width: int):
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.m3 = np.zeros(width)
+
+    def update(self, values: np.ndarray):
+
+        count = (~np.isnan(values)).sum(axis=0).astype(np.float64)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(values, axis=0) / count
+            centered = values - mean
+            m2 = np.nansum(centered ** 2, axis=0)
+            m3 = np.nansum(centered ** 3, axis=0)
+
+        mean = np.nan_to_num(mean)
+        self._combine(count, mean, m2, m3)
+
+    def merge(self, other: "MomentAccumulator"):
+        self._combine(other.count, other.mean, other.m2, other.m3)
+
+    def _combine(self, n_b, mean_b, m2_b, m3_b):
+
+        n_a, mean_a, m2_a, m3_a = self.count, self.mean, self.m2, self.m3
+        n = n_a + n_b
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean_b - mean_a
+            mean = mean_a + delta * n_b / n
+            m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+            m3 = (
+                m3_a + m3_b
+                + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                + 3 * delta * (n_a * m2_b - n_b * m2_a) / n
+            )
+
+        empty = n == 0
+        self.count = n
+        self.mean = np.where(empty, 0.0, mean)
+        self.m2 = np.where(empty, 0.0, m2)
+        self.m3 = np.where(empty, 0.0, m3)
+
+    @property
+    def var(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    @property
+    def skew(self) -> np.ndarray:
+        # Adjusted Fisher-Pearson, same as pandas
+        n = self.count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            skew = (n * np.sqrt(n - 1) / (n - 2)) * (self.m3 / self.m2 ** 1.5)
+        skew = np.where(self.m2 == 0, 0.0, skew)
+        return np.where(n < 3, np.nan, skew)
+
+
+# =====================================================
+# QUANTILES (KLL-style compactor sketch)
+# =====================================================
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch for one column.
+
+    Level h holds items of weight 2**h. When a level outgrows its
+    capacity it is sorted and every other item (random offset) moves
+    up a level. Exact while fewer than `capacity` values were seen.
+    """
+
+    def __init__(self, capacity: int = 4096, seed: int = 0):
+        self.capacity = capacity
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+
+        values = values[~np.isnan(values)]
+
+        if values.size:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+
+        for h, items in enumerate(other.levels):
+            if h >= len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+
+        self._compress()
+
+    def _compress(self):
+
+        h = 0
+        while h < len(self.levels):
+
+            items = self.levels[h]
+
+            if items.size > self.capacity:
+                items = np.sort(items)
+
+                # Odd leftovers stay on this level
+                keep = items[-1:] if items.size % 2 else items[:0]
+                paired = items[:items.size - keep.size]
+
+                promoted = paired[self._rng.integers(2)::2]
+
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+            h += 1
+
+    def quantiles(self, qs) -> np.ndarray:
+
+        if len(self.levels) == 1:
+            # Nothing compacted yet: exact, with linear interpolation like pandas
+            if self.levels[0].size == 0:
+                return np.full(len(qs), np.nan)
+            return np.quantile(self.levels[0], qs)
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(level.size, 2.0 ** h)
+            for h, level in enumerate(self.levels)
+        ])
+
+        order = np.argsort(items, kind="stable")
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+
+        targets = np.asarray(qs) * cumulative[-1]
+        idx = np.searchsorted(cumulative, targets, side="left")
+
+        return items[np.clip(idx, 0, items.size - 1)]
+
+    def count_outside(self, lower: float, upper: float) -> float:
+        """
+        (Weighted) number of values below lower or above upper; exact
+        while nothing has been compacted.
+        """
+
+        return float(sum(
+            ((level < lower) | (level > upper)).sum() * 2.0 ** h
+            for h, level in enumerate(self.levels)
+        ))
+
+
+# =====================================================
+# DISTINCT COUNTS (exact set, then HyperLogLog)
+# =====================================================
+
+class DistinctCounter:
+    """
+    Mergeable distinct-value counter over 64-bit value hashes.
+
+    Keeps the exact set of hashes until it grows past `exact_limit`,
+    then switches to a HyperLogLog with 2**precision registers, so
+    low-cardinality columns stay exact and memory stays bounded.
+    """
+
+    def __init__(self, exact_limit: int = 8192, precision: int = 14):
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self.exact = np.empty(0, dtype=np.uint64)
+        self.registers = None
+
+    @staticmethod
+    def hash_values(values) -> np.ndarray:
+        return pd.util.hash_array(np.asarray(values), categorize=False)
+
+    def update(self, hashes: np.ndarray):
+
+        if self.registers is None:
+            self.exact = np.union1d(self.exact, hashes)
+            if self.exact.size > self.exact_limit:
+                self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+                self._update_registers(self.exact)
+                self.exact = None
+        else:
+            self._update_registers(hashes)
+
+    def merge(self, other: "DistinctCounter"):
+
+        if other.registers is None:
+            self.update(other.exact)
+            return
+
+        if self.registers is None:
+            exact = self.exact
+            self.registers = other.registers.copy()
+            self.exact = None
+            self._update_registers(exact)
+        else:
+            np.maximum(self.registers, other.registers, out=self.registers)
+
+    def _update_registers(self, hashes: np.ndarray):
+
+        if hashes.size == 0:
+            return
+
+        p = self.precision
+        hashes = hashes.astype(np.uint64, copy=False)
+
+        idx = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+
+        # Bit length via frexp on two exact 32-bit halves
+        hi = (rest >> np.uint64(32)).astype(np.float64)
+        lo = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+
+        rank = ((64 - p) - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def count(self) -> int:
+
+        if self.registers is None:
+            return int(self.exact.size)
+
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+
+        return int(round(estimate))
+
@@ -1,6 +1,10 @@
-def calculate_uniqueness(df):
-    total_rows = len(df)
-    duplicate_rows = df.duplicated().sum()
+from backend.engines.dataset_stats import DatasetStats
+
+
+def calculate_uniqueness(df, stats: DatasetStats = None):
+    stats = stats or DatasetStats(df)
+    total_rows = stats.rows
+    duplicate_rows = stats.duplicate_count
 
     if total_rows == 0:
         return 0
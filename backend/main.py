@@ -1,15 +1,23 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from backend.core.exceptions import DatasetNotFoundException
+from backend.core.metrics import MetricsMiddleware
 
 # ================= ROUTER IMPORTS =================
 
 from backend.api.upload import router as upload_router
 from backend.api.profile import router as profile_router
 from backend.api.classification import router as classification_router
+from backend.api.correlation import router as correlation_router
 from backend.api.simulate import router as simulate_router
 from backend.api.recommend import router as recommend_router
 from backend.api.download import router as download_router
 from backend.api.analytics import router as analytics_router   # ✅ NEW
+from backend.api.jobs import router as jobs_router
+from backend.api.metrics import router as metrics_router
+from backend.api.datasets import router as datasets_router
 
 
 # ================= APP INITIALIZATION =================
@@ -32,19 +40,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
 
+# ================= METRICS =================
+# Request latency per route, stage spans (and Server-Timing if enabled)
+
+app.add_middleware(MetricsMiddleware)
+
+
+# ================= EXCEPTION HANDLERS =================
+
+@app.exception_handler(DatasetNotFoundException)
+def dataset_not_found_handler(request: Request, exc: DatasetNotFoundException):
+    return JSONResponse(status_code=404, content={"detail": exc.message})
+
+
 # ================= ROUTERS =================
 # IMPORTANT:
 # Prefixes are defined ONLY here (NOT inside router files)
 
 app.include_router(upload_router, prefix="/upload", tags=["Upload"])
+app.include_router(datasets_router, prefix="/datasets", tags=["Datasets"])
 app.include_router(profile_router, prefix="/profile", tags=["Profile"])
 app.include_router(classification_router, prefix="/classify", tags=["Classification"])
+app.include_router(correlation_router, prefix="/correlation", tags=["Correlation"])
 app.include_router(simulate_router, prefix="/simulate", tags=["Simulation"])
 app.include_router(recommend_router, prefix="/recommend", tags=["Recommendation"])
 app.include_router(download_router, prefix="/download", tags=["Download"])
+app.include_router(jobs_router, prefix="/jobs", tags=["Jobs"])
+app.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
 
 # 🚀 Unified Analytics Endpoint
 app.include_router(analytics_router)   # already has prefix="/analytics" inside file
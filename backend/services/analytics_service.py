@@ -0,0 +1,176 @@
+import pandas as pd
+import numpy as np
+
+from backend.core.job_queue import report_progress
+from backend.core.metrics import span
+from backend.engines.classification_engine import ClassificationEngine
+from backend.engines.dataset_stats import DatasetStats, SummaryStats
+from backend.engines.scoring_engine import ScoringEngine
+from backend.engines.outlier_engine import OutlierEngine
+from backend.engines.importance_engine import ImportanceEngine
+from backend.engines.completeness_engine import CompletenessEngine
+from backend.services.classification_service import column_types as dataset_column_types
+from backend.services.correlation import (
+    calculate_correlation_matrix,
+    detect_strong_correlations
+)
+from backend.services.recommendation_service import RecommendationService
+
+
+# ✅ Helper function to clean NaN safely from any object
+def clean_nan(obj):
+    if isinstance(obj, dict):
+        return {k: clean_nan(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [clean_nan(i) for i in obj]
+    elif isinstance(obj, float) and (np.isnan(obj) or np.isinf(obj)):
+        return None
+    else:
+        return obj
+
+
+# ✅ NEW: Precise Cell-wise Outlier Percentage (IQR)
+def calculate_outlier_percentage(df, stats: SummaryStats = None):
+    stats = stats or DatasetStats(df)
+
+    if not stats.numeric_columns:
+        return 0.0
+
+    total_cells = stats.rows * len(stats.numeric_columns)
+
+    # Constant columns (IQR == 0) are not counted
+    outlier_cells = stats.iqr_outlier_cells
+
+    return round((outlier_cells / total_cells) * 100, 2)
+
+
+
+def build_analytics_response(df: pd.DataFrame, stats: SummaryStats):
+    """
+    Assemble the /analytics payload from a DatasetStats (or any
+    SummaryStats: only aggregates are read).
+
+    df is only used for its schema and the first rows of the preview,
+    so a frame holding just the head of the dataset is enough.
+    """
+
+    total_rows = stats.rows
+    total_cols = len(stats.columns)
+    total_cells = stats.total_cells
+
+    # ================= CHANGED TO COUNTS =================
+    with span("analytics.missing_duplicates", total_rows):
+        missing_count = stats.all_null_rows
+        duplicate_count = stats.duplicate_count
+
+    # ================= KEEP PERCENTAGE FOR SCORING =================
+    missing_percentage = (missing_count / total_cells) * 100 if total_cells else 0
+    duplicate_percentage = (duplicate_count / total_rows) * 100 if total_rows else 0
+
+    # ✅ UPDATED: Using precise cell-wise IQR calculation
+    with span("analytics.iqr", total_rows):
+        outlier_pct = calculate_outlier_percentage(df, stats)
+
+    # ================= NOISY DATA (Cell-wise using Z-score) =================
+    with span("analytics.noise", total_rows):
+        noisy_percentage = stats.noisy_percentage
+
+    quality_score = ScoringEngine.calculate_score(
+        missing_percentage,
+        duplicate_percentage,
+        outlier_pct,
+        noisy_percentage
+    )
+
+    with span("analytics.completeness", total_rows):
+        completeness = CompletenessEngine.calculate(df, stats)
+
+    # Advanced Data Type Classification (inferred once per stored dataset)
+    with span("analytics.classification", total_rows):
+        if stats.dataset_id is not None:
+            column_types = dataset_column_types(stats.dataset_id)
+        else:
+            column_types = ClassificationEngine.infer(df)
+
+    classification = ClassificationEngine.group(column_types)
+
+    report_progress(0.5, "importance")
+    with span("analytics.importance", total_rows):
+        importance = ImportanceEngine.calculate(df, stats)
+
+    with span("analytics.column_outliers", total_rows):
+        column_outliers = OutlierEngine.detect_column_outliers(df, "iqr", stats)
+
+    report_progress(0.6, "correlation")
+    with span("analytics.correlation", total_rows):
+        correlation_matrix = calculate_correlation_matrix(df, stats)
+        strong_pairs = detect_strong_correlations(df, stats=stats)
+
+        correlation_matrix = {
+            k: {kk: float(vv) for kk, vv in v.items()}
+            for k, v in correlation_matrix.items()
+        }
+
+    report_progress(0.8, "recommendations")
+    with span("analytics.recommendations", total_rows):
+        recommendations = RecommendationService.generate(df, stats)
+
+    # ================= ML READINESS =================
+    if quality_score < 60:
+        readiness = "Not Ready"
+        badge_color = "red"
+    elif quality_score < 75:
+        readiness = "Needs Work"
+        badge_color = "orange"
+    elif quality_score < 90:
+        readiness = "Good"
+        badge_color = "blue"
+    else:
+        readiness = "ML Ready"
+        badge_color = "green"
+
+    # ================= SAFE JSON CLEANING =================
+    df_clean = df.head(20).replace([np.inf, -np.inf], np.nan)
+    preview_rows = df_clean.where(
+        pd.notnull(df_clean), None
+    ).to_dict(orient="records")
+
+    # ================= RETURN RESPONSE =================
+    response = {
+        "profile": {
+            "rows": total_rows,
+            "columns": total_cols,
+            "missing_count": missing_count,
+            "duplicate_count": duplicate_count,
+            "quality_score": round(quality_score, 2),
+            "completeness": round(completeness, 2),
+        },
+        "ml_readiness": {
+            "label": readiness,
+            "color": badge_color
+        },
+        "data_types": {
+            "numeric": classification["numeric"],
+            "categorical": (
+                classification["categorical"] + classification["alphanumeric"] +
+                classification["identifier"] + classification["text"]
+            ),
+            "boolean": classification["boolean"],
+            "datetime": classification["datetime"],
+            "inferred": column_types,
+        },
+        "importance": importance,
+        "outliers": {
+            "overall_percentage": outlier_pct,
+            "noisy_percentage": round(noisy_percentage, 2),
+            "column_outliers": column_outliers,
+        },
+        "correlation": {
+            "matrix": correlation_matrix,
+            "strong_pairs": strong_pairs,
+        },
+        "ai_review": recommendations
+    }
+
+    with span("analytics.serialize", total_rows):
+        return clean_nan(response)
\ No newline at end of file
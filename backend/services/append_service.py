@@ -0,0 +1,243 @@
+import hashlib
+import os
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from backend.core.dataset_store import (
+    append_csv,
+    append_rows,
+    dataset_fingerprint,
+    dataset_rows,
+    dataset_schema,
+    iter_batches,
+    load_metadata,
+    profile_state_path,
+    save_metadata,
+)
+from backend.core.metrics import span
+from backend.core.registry import register_dataset
+from backend.core.row_index import append_row_index, load_row_index
+from backend.engines.scoring_engine import ScoringEngine
+from backend.services.export_service import discard_cleaned_file
+from backend.services.simulation_service import readiness_after
+from backend.services.streaming_profiler import ProfileAccumulators
+
+
+# One append at a time per dataset
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _dataset_lock(dataset_id: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(dataset_id, threading.Lock())
+
+
+# =====================================================
+# PERSISTED PROFILE STATE
+# =====================================================
+
+class IncrementalProfile:
+    """
+    Mergeable profile accumulators plus the duplicate row count,
+    persisted next to the dataset.
+
+    Built with one chunked pass the first time a dataset is appended
+    to; after that each batch is folded in on its own, and the quality
+    metrics are read from the accumulators without touching the
+    stored rows. Outlier and noise shares come from the quantile
+    sketches, so they are exact on small columns and estimates on
+    large ones (same as the streaming profiler).
+    """
+
+    def __init__(self, accumulators: ProfileAccumulators, duplicate_count: int):
+        self.accumulators = accumulators
+        self.duplicate_count = duplicate_count
+
+    @classmethod
+    def build(cls, dataset_id: str) -> "IncrementalProfile":
+
+        accumulators = None
+
+        for chunk in iter_batches(dataset_id):
+            if accumulators is None:
+                accumulators = ProfileAccumulators(chunk)
+            accumulators.update(chunk)
+
+        if accumulators is None:
+            accumulators = ProfileAccumulators(dataset_schema(dataset_id).empty_table().to_pandas())
+
+        return cls(accumulators, load_row_index(dataset_id).duplicate_count)
+
+    @classmethod
+    def load(cls, dataset_id: str) -> "IncrementalProfile":
+
+        path = profile_state_path(dataset_id)
+
+        if not os.path.exists(path):
+            return cls.build(dataset_id)
+
+        with open(path, "rb") as f:
+            profile = pickle.load(f)
+
+        # Saved for other rows than the committed ones (an append that
+        # failed around its commit): rebuilt like a missing state
+        if profile.accumulators.rows != dataset_rows(dataset_id):
+            return cls.build(dataset_id)
+
+        return profile
+
+    def save(self, dataset_id: str):
+
+        path = profile_state_path(dataset_id)
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_path, path)
+
+    def update(self, batch: pd.DataFrame, new_duplicates: int):
+        self.accumulators.update(batch)
+        self.duplicate_count += new_duplicates
+
+    # =====================================================
+    # METRICS (same definitions as /analytics)
+    # =====================================================
+    def metrics(self) -> dict:
+
+        acc = self.accumulators
+
+        rows = acc.rows
+        total_cells = rows * len(acc.columns)
+        numeric_cells = rows * len(acc.numeric_columns)
+
+        q = np.array([
+            sketch.quantiles([0.25, 0.75]) for sketch in acc.sketches
+        ]).reshape(len(acc.sketches), 2)
+
+        mean = acc.moments.mean
+        std = np.sqrt(acc.moments.var)
+
+        outlier_cells = 0.0
+        noisy_cells = 0.0
+
+        for i, sketch in enumerate(acc.sketches):
+
+            q1, q3 = q[i]
+            iqr = q3 - q1
+
+            # Constant columns are not counted
+            if iqr != 0 and not np.isnan(iqr):
+                outlier_cells += sketch.count_outside(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+
+            if std[i] > 0:
+                noisy_cells += sketch.count_outside(mean[i] - 3 * std[i], mean[i] + 3 * std[i])
+
+        missing_percentage = (acc.all_null_rows / total_cells) * 100 if total_cells else 0
+        duplicate_percentage = (self.duplicate_count / rows) * 100 if rows else 0
+        outlier_percentage = round((outlier_cells / numeric_cells) * 100, 2) if numeric_cells else 0.0
+        noisy_percentage = (noisy_cells / numeric_cells) * 100 if numeric_cells else 0
+
+        score = ScoringEngine.calculate_score(
+            missing_percentage,
+            duplicate_percentage,
+            outlier_percentage,
+            noisy_percentage
+        )
+
+        return {
+            "total_rows": rows,
+            "total_columns": len(acc.columns),
+            "missing_percentage": round(missing_percentage, 2),
+            "duplicate_percentage": round(duplicate_percentage, 2),
+            "outlier_percentage": outlier_percentage,
+            "noisy_percentage": round(noisy_percentage, 2),
+            "quality_score": score,
+            "ml_readiness": readiness_after(score),
+        }
+
+
+# =====================================================
+# APPEND
+# =====================================================
+
+def read_batch(dataset_id: str, batch_path: str, sep: str, encoding: str) -> pd.DataFrame:
+    """
+    Parse an appended CSV batch against the stored schema: the columns
+    must match, and string columns are read as strings.
+    """
+
+    schema = dataset_schema(dataset_id)
+
+    string_columns = {
+        field.name: "str"
+        for field in schema
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+    }
+
+    batch = pd.read_csv(batch_path, sep=sep, encoding=encoding, dtype=string_columns)
+
+    if sorted(map(str, batch.columns)) != sorted(schema.names):
+        raise ValueError("Batch columns do not match the dataset")
+
+    return batch[schema.names]
+
+
+def append_batch(
+    dataset_id: str,
+    batch_path: str,
+    sep: str = ",",
+    encoding: str = "utf-8",
+    fingerprint: str = "",
+    size_bytes: int = 0
+) -> dict:
+    """
+    Append a parsed CSV batch to a stored dataset and return the
+    refreshed quality metrics.
+
+    Work on the metrics is proportional to the batch: only new rows are
+    hashed (and matched against the persisted first-row map), written
+    after the stored rows in place and folded into the persisted
+    profile accumulators.
+    """
+
+    with _dataset_lock(dataset_id), span("append.batch") as timing:
+
+        batch = read_batch(dataset_id, batch_path, sep, encoding)
+        timing.rows = len(batch)
+        profile = IncrementalProfile.load(dataset_id)
+
+        metadata = load_metadata(dataset_id)
+        previous_fingerprint = dataset_fingerprint(dataset_id)
+
+        rows, appended = append_rows(dataset_id, batch)
+        append_csv(dataset_id, batch_path, batch, sep, encoding)
+
+        profile.update(rows, append_row_index(dataset_id, rows))
+
+        # Commits the rows; chained, so every cache keyed on the
+        # fingerprint sees new content
+        save_metadata(
+            dataset_id,
+            **appended,
+            fingerprint=hashlib.sha256(f"{previous_fingerprint}:{fingerprint}".encode()).hexdigest(),
+            size_bytes=metadata.get("size_bytes", 0) + size_bytes
+        )
+
+        # Only describes committed rows (see IncrementalProfile.load)
+        profile.save(dataset_id)
+        register_dataset(dataset_id)
+
+        # A cleaned file would miss the new rows; the plan rebuilds it
+        discard_cleaned_file(dataset_id)
+
+    return {
+        "dataset_id": dataset_id,
+        "rows_appended": len(rows),
+        **profile.metrics()
+    }
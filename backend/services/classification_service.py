@@ -0,0 +1,37 @@
+from backend.core.dataset_store import dataset_schema, load_dataset
+from backend.core.registry import dataset_record, registry
+from backend.core.result_cache import result_cache
+from backend.engines.classification_engine import ClassificationEngine
+
+
+def column_types(dataset_id: str) -> dict:
+    """
+    Inferred type and confidence per column of a stored dataset,
+    inferred once per dataset content and shared by /classify and
+    /analytics. Kept on the registry record, so later calls (in any
+    worker) never touch the data.
+    """
+
+    record = dataset_record(dataset_id)
+
+    if record["column_types"] is not None:
+        return record["column_types"]
+
+    types = result_cache.get_or_compute(
+        dataset_id,
+        "column-types",
+        lambda: infer_column_types(dataset_id)
+    )
+
+    registry.save_column_types(dataset_id, types, record["fingerprint"])
+
+    return types
+
+
+def infer_column_types(dataset_id: str) -> dict:
+
+    # One column in memory at a time
+    return {
+        name: ClassificationEngine.infer_column(load_dataset(dataset_id, columns=[name])[name])
+        for name in dataset_schema(dataset_id).names
+    }
@@ -0,0 +1,264 @@
+import json
+import os
+import threading
+import uuid
+import zlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from backend.config import CLEANED_DIR
+from backend.core.csv_pages import page_index_path, write_csv_with_index
+from backend.core.dataset_store import load_dataset
+from backend.core.metrics import span
+from backend.core.row_index import load_row_index
+from backend.services.simulation_service import build_cleaning_plan
+
+
+# Kept rows converted and encoded per block when streaming an export
+EXPORT_CHUNK_ROWS = 50_000
+
+# format -> (media type, file suffix)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "csv.gz": ("application/gzip", "csv.gz"),
+    "csv.zst": ("application/zstd", "csv.zst"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+# One cleaned-file build or plan swap at a time per dataset
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _materialize_lock(dataset_id: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(dataset_id, threading.Lock())
+
+
+# =====================================================
+# PATHS
+# =====================================================
+
+def cleaned_path(dataset_id: str) -> str:
+    return os.path.join(CLEANED_DIR, f"{dataset_id}.csv")
+
+
+def cleaning_plan_path(dataset_id: str) -> str:
+    return os.path.join(CLEANED_DIR, f"{dataset_id}.plan.json")
+
+
+# =====================================================
+# CLEANING PLAN
+# =====================================================
+
+def save_cleaning_plan(dataset_id: str, payload: dict):
+    """
+    Record the latest simulation's cleaning steps. Any cleaned file
+    built from an earlier plan is discarded.
+    """
+
+    path = cleaning_plan_path(dataset_id)
+
+    # Unique, as other worker processes don't share the lock
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+    with _materialize_lock(dataset_id):
+
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f)
+
+        os.replace(tmp_path, path)
+        discard_cleaned_file(dataset_id)
+
+
+def has_cleaning_plan(dataset_id: str) -> bool:
+    return os.path.exists(cleaning_plan_path(dataset_id))
+
+
+def load_cleaning_plan(dataset_id: str):
+    """
+    Replay the recorded steps on the stored dataset.
+    """
+
+    with open(cleaning_plan_path(dataset_id)) as f:
+        payload = json.load(f)
+
+    return build_cleaning_plan(
+        load_dataset(dataset_id),
+        payload,
+        load_row_index(dataset_id),
+        dataset_id
+    )
+
+
+def discard_cleaned_file(dataset_id: str):
+    """
+    Drop a materialized cleaned file (the plan, if any, is kept and
+    rebuilds it on demand).
+    """
+
+    path = cleaned_path(dataset_id)
+
+    for stale in (path, page_index_path(path)):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+# =====================================================
+# MATERIALIZE
+# =====================================================
+
+def cleaned_chunks(dataset_id: str, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """
+    The cleaned dataset in blocks: replayed from the cleaning plan, or
+    read from a cleaned CSV written before plans were recorded.
+    """
+
+    if has_cleaning_plan(dataset_id):
+        for chunk in load_cleaning_plan(dataset_id).iter_chunks(chunk_rows):
+            yield chunk.replace([np.inf, -np.inf], np.nan)
+        return
+
+    with pd.read_csv(cleaned_path(dataset_id), chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def materialize_cleaned(dataset_id: str):
+    """
+    Path of the cleaned CSV (with its page index), written from the plan
+    on first use. None when the dataset was never simulated.
+    """
+
+    path = cleaned_path(dataset_id)
+
+    with _materialize_lock(dataset_id):
+
+        if os.path.exists(path):
+            return path
+
+        if not has_cleaning_plan(dataset_id):
+            return None
+
+        with span("export.materialize") as timing:
+            df_clean = load_cleaning_plan(dataset_id).materialize()
+            write_csv_with_index(df_clean.replace([np.inf, -np.inf], np.nan), path)
+            timing.rows = len(df_clean)
+
+    return path
+
+
+# =====================================================
+# STREAMING EXPORT
+# =====================================================
+
+class _ChunkSink:
+    """
+    Write-only file object for pyarrow writers; drain() hands back what
+    was written since the last call.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _csv_blocks(chunks):
+
+    header = True
+
+    for chunk in chunks:
+        yield chunk.to_csv(header=header, index=False).encode()
+        header = False
+
+
+def _gzip_blocks(chunks):
+
+    compressor = zlib.compressobj(wbits=31)
+
+    for block in _csv_blocks(chunks):
+        yield compressor.compress(block)
+
+    yield compressor.flush()
+
+
+def _zstd_blocks(chunks):
+
+    # One zstd frame per block; concatenated frames are a valid stream
+    codec = pa.Codec("zstd")
+
+    for block in _csv_blocks(chunks):
+        yield codec.compress(block, asbytes=True)
+
+
+def _table_blocks(chunks, open_writer):
+
+    sink = _ChunkSink()
+    writer = None
+    schema = None
+
+    for chunk in chunks:
+
+        table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+        if writer is None:
+            schema = table.schema
+            writer = open_writer(sink, schema)
+
+        writer.write_table(table)
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+def export_cleaned(dataset_id: str, fmt: str = "csv"):
+    """
+    Encoded bytes of the cleaned dataset in `fmt`, generated block by
+    block so the response never holds the whole file.
+    """
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    if fmt == "csv.zst" and not pa.Codec.is_available("zstd"):
+        raise ValueError("zstd compression is not available")
+
+    chunks = cleaned_chunks(dataset_id)
+
+    if fmt == "csv":
+        return _csv_blocks(chunks)
+
+    if fmt == "csv.gz":
+        return _gzip_blocks(chunks)
+
+    if fmt == "csv.zst":
+        return _zstd_blocks(chunks)
+
+    if fmt == "parquet":
+        return _table_blocks(chunks, pq.ParquetWriter)
+
+    return _table_blocks(chunks, ipc.new_file)
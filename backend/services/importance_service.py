@@ -1,5 +1,7 @@
 import pandas as pd
 
+from backend.engines.correlation_engine import CorrelationEngine
+
 
 def calculate_importance(file_path: str):
 
@@ -11,7 +13,7 @@ def calculate_importance(file_path: str):
     if numeric_df.empty:
         return []
 
-    corr_matrix = numeric_df.corr()
+    corr_matrix = CorrelationEngine.compute(numeric_df)
     max_variance = numeric_df.var().max()
 
     for col in numeric_df.columns:
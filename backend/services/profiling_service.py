@@ -1,40 +1,48 @@
 import pandas as pd
 
+from backend.engines.dataset_stats import DatasetStats, SummaryStats
+
+
 def profile_dataset(file_path):
 
     df = pd.read_csv(file_path)
 
+    return build_profile_response(df, DatasetStats(df))
+
+
+def build_profile_response(df: pd.DataFrame, stats: SummaryStats):
+    """
+    Per-column profile from a SummaryStats. df only supplies dtypes.
+    """
+
     column_profiles = []
 
-    for col in df.columns:
-        col_data = df[col]
+    for col in stats.columns:
+
+        missing = int(stats.null_counts[col])
+
+        # Column-level duplicated() counts every repeat, NaN included
+        distinct = int(stats.nunique[col]) + (1 if missing else 0)
+        duplicates = stats.rows - distinct
 
-        missing = col_data.isna().sum()
-        duplicates = col_data.duplicated().sum()
         outliers = 0
 
-        if pd.api.types.is_numeric_dtype(col_data):
-            series = col_data.dropna()
-            if len(series) > 5:
-                Q1 = series.quantile(0.25)
-                Q3 = series.quantile(0.75)
-                IQR = Q3 - Q1
-                lower = Q1 - 1.5 * IQR
-                upper = Q3 + 1.5 * IQR
-                outliers = len(series[(series < lower) | (series > upper)])
+        if col in stats.iqr_outlier_counts.index:
+            if stats.rows - missing > 5:
+                outliers = stats.iqr_outlier_counts[col]
 
         column_profiles.append({
             "name": col,
-            "type": str(col_data.dtype),
+            "type": str(df[col].dtype),
             "missing_count": int(missing),
             "duplicate_count": int(duplicates),
             "outlier_count": int(outliers)
         })
 
     return {
-        "rows": len(df),
-        "columns": len(df.columns),
+        "rows": stats.rows,
+        "columns": len(stats.columns),
         "column_profiles": column_profiles,
-        "total_missing": int(df.isna().sum().sum()),
-        "total_duplicates": int(df.duplicated().sum())
-    }
\ No newline at end of file
+        "total_missing": int(stats.total_missing),
+        "total_duplicates": int(stats.duplicate_count)
+    }
@@ -1,18 +1,18 @@
-import numpy as np
-import pandas as pd
+from backend.engines.dataset_stats import DatasetStats, SummaryStats
 
 
 class RecommendationService:
 
     @staticmethod
-    def generate(df):
+    def generate(df, stats: SummaryStats = None):
 
         recommendations = []
 
-        total_rows = len(df)
+        stats = stats or DatasetStats(df)
+        total_rows = stats.rows
 
         # Missing
-        missing_pct = (df.isnull().sum() / total_rows) * 100
+        missing_pct = (stats.null_counts / total_rows) * 100
 
         for col, pct in missing_pct.items():
             if pct > 30:
@@ -21,26 +21,23 @@ class RecommendationService:
                 )
 
         # Skew detection
-        numeric_cols = df.select_dtypes(include=np.number)
-
-        for col in numeric_cols.columns:
-            skew = df[col].skew()
+        for col, skew in stats.skew.items():
             if abs(skew) > 1:
                 recommendations.append(
                     f"Column '{col}' is highly skewed — consider log transformation."
                 )
 
         # High uniqueness (likely ID)
-        for col in df.columns:
-            uniqueness = df[col].nunique() / total_rows
+        for col, unique_count in stats.nunique.items():
+            uniqueness = unique_count / total_rows
             if uniqueness > 0.95:
                 recommendations.append(
                     f"Column '{col}' has high uniqueness — likely identifier."
                 )
 
         # High correlation warning
-        if len(numeric_cols.columns) > 1:
-            corr_matrix = numeric_cols.corr().abs()
+        if len(stats.numeric_columns) > 1:
+            corr_matrix = stats.correlation.abs()
             high_corr = (corr_matrix > 0.85) & (corr_matrix < 1)
 
             if high_corr.any().any():
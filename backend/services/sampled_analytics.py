@@ -0,0 +1,420 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from backend.core.metrics import span
+from backend.core.row_index import load_row_index
+from backend.core.sampling import sample_dataset
+from backend.engines.dataset_stats import DatasetStats
+from backend.engines.scoring_engine import ScoringEngine
+from backend.services.analytics_service import build_analytics_response, clean_nan
+
+
+CONFIDENCE = 0.95
+
+
+class SampledDatasetStats(DatasetStats):
+    """
+    DatasetStats for a row sample standing in for the whole dataset.
+
+    Every statistic is computed on the sample; counts are then scaled up
+    to the population so the engines report dataset-level figures.
+    Duplicates stay exact (from the persisted row index) and distinct
+    counts are estimated from the sample's value frequencies.
+
+    rows is the population while the frame is only the sample, so the
+    row masks (null_mask, duplicate_mask, iqr_row_mask) raise instead
+    of returning arrays that don't line up with it; sample_null_mask
+    and numeric_values hold the sample rows.
+    """
+
+    def __init__(self, sample: pd.DataFrame, population: int, dataset_id: str):
+
+        # No dataset_id: sample statistics must not land in the dataset's cache
+        super().__init__(sample)
+
+        self.sample_rows = len(sample)
+        self.sample_null_mask = sample.isna().to_numpy()
+
+        scale = population / self.sample_rows if self.sample_rows else 0
+
+        def scaled(counts):
+            return np.rint(np.asarray(counts) * scale).astype(np.int64)
+
+        iqr = self.iqr_outliers
+        null_counts = self.sample_null_mask.sum(axis=0)
+        all_null_rows = self.sample_null_mask.all(axis=1).sum() if self.columns else 0
+
+        self.__dict__.update({
+            "null_counts": pd.Series(scaled(null_counts), index=self.columns),
+            "all_null_rows": int(scaled(all_null_rows)),
+            "duplicate_count": load_row_index(dataset_id).duplicate_count,
+            "nunique": pd.Series(
+                [estimate_distinct(sample[col], population) for col in self.columns],
+                index=self.columns,
+                dtype="int64"
+            ),
+            # No row_mask (see iqr_row_mask)
+            "iqr_outliers": {
+                "column_counts": scaled(iqr["column_counts"]),
+                "cell_count": int(scaled(iqr["cell_count"])),
+            },
+        })
+
+        self.rows = population
+        self.total_cells = population * len(self.columns)
+
+    # =====================================================
+    # ROW MASKS
+    # =====================================================
+    @property
+    def null_mask(self) -> np.ndarray:
+        raise TypeError("Sampled statistics have no null mask over the dataset rows")
+
+    @property
+    def duplicate_mask(self) -> np.ndarray:
+        raise TypeError("Sampled statistics have no duplicate mask over the dataset rows")
+
+    @property
+    def iqr_row_mask(self) -> np.ndarray:
+        raise TypeError("Sampled statistics have no outlier mask over the dataset rows")
+
+    # =====================================================
+    # PER-ROW SHARES (for the intervals)
+    # =====================================================
+    def row_shares(self) -> dict:
+        """
+        Each dataset-level percentage as the mean of a per-sample-row
+        value, with the largest value one row can contribute.
+        """
+
+        cols = len(self.columns)
+        null_mask = self.sample_null_mask
+
+        shares = {
+            "missing_percentage": (
+                null_mask.all(axis=1) * (100 / cols) if cols else np.zeros(self.sample_rows),
+                100 / cols if cols else 0
+            ),
+            "completeness": (
+                (1 - null_mask.mean(axis=1)) * 100 if cols else np.zeros(self.sample_rows),
+                100
+            ),
+        }
+
+        numeric = self.numeric_columns
+        values = self.numeric_values
+
+        if not numeric:
+            zeros = np.zeros(self.sample_rows)
+            shares["outlier_percentage"] = (zeros, 100)
+            shares["noisy_percentage"] = (zeros, 100)
+            return shares
+
+        q1 = self.q1.to_numpy()
+        q3 = self.q3.to_numpy()
+        iqr = q3 - q1
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            outside = (values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)
+            noisy = np.abs((values - self.mean.to_numpy()) / self.std.to_numpy()) > 3
+
+        # Constant columns are not outliers (see IQRKernel.compute)
+        outside = outside[:, iqr != 0]
+
+        shares["outlier_percentage"] = (outside.sum(axis=1) * (100 / len(numeric)), 100)
+        shares["noisy_percentage"] = (noisy.sum(axis=1) * (100 / len(numeric)), 100)
+
+        return shares
+
+
+def estimate_distinct(series: pd.Series, population: int) -> int:
+    """
+    Distinct non-null values in the population, from a sample
+    (bias-corrected Chao1: values seen once hint at unseen ones), capped
+    at the estimated non-null rows.
+    """
+
+    counts = series.value_counts(dropna=True)
+
+    if population <= len(series):
+        return len(counts)
+
+    once = int((counts == 1).sum())
+    twice = int((counts == 2).sum())
+
+    estimate = len(counts) + once * (once - 1) / (2 * (twice + 1))
+    present = int(series.notna().sum()) * population / len(series)
+
+    return int(round(min(estimate, present)))
+
+
+# =====================================================
+# INTERVALS
+# =====================================================
+
+def mean_interval(
+    values: np.ndarray,
+    estimate: float,
+    population: int,
+    row_max: float,
+    confidence: float = CONFIDENCE
+) -> dict:
+    """
+    Normal interval for a population mean from a simple random sample,
+    with the finite-population correction, centred on `estimate`.
+
+    A sample without variation (e.g. no missing rows at all) would give
+    a zero-width interval; the rule of three (-ln(1 - confidence) / n
+    rows at most) bounds the side with room instead.
+    """
+
+    n = len(values)
+
+    if n == 0 or population <= n:
+        return interval(estimate, estimate, estimate)
+
+    fpc = math.sqrt((population - n) / (population - 1))
+    std = float(values.std(ddof=1)) if n > 1 else 0.0
+
+    if std > 0:
+        half = NormalDist().inv_cdf((1 + confidence) / 2) * std / math.sqrt(n) * fpc
+        return interval(estimate, estimate - half, estimate + half, upper_bound=row_max)
+
+    bound = -math.log(1 - confidence) / n * row_max * fpc
+
+    if estimate <= 0:
+        return interval(estimate, estimate, estimate + bound, upper_bound=row_max)
+
+    return interval(estimate, estimate - bound, estimate, upper_bound=row_max)
+
+
+def correlation_interval(r: float, pairs: int, confidence: float = CONFIDENCE) -> dict:
+    """
+    Fisher z interval for a Pearson coefficient over `pairs` rows.
+    """
+
+    if np.isnan(r):
+        return interval(r, r, r, digits=4)
+
+    if pairs <= 3:
+        return interval(r, -1.0, 1.0, upper_bound=1.0, lower_bound=-1.0, digits=4)
+
+    z = math.atanh(max(min(r, 0.999999), -0.999999))
+    half = NormalDist().inv_cdf((1 + confidence) / 2) / math.sqrt(pairs - 3)
+
+    return interval(
+        r, math.tanh(z - half), math.tanh(z + half),
+        upper_bound=1.0, lower_bound=-1.0, digits=4
+    )
+
+
+def interval(
+    estimate: float,
+    lower: float,
+    upper: float,
+    upper_bound: float = None,
+    lower_bound: float = 0.0,
+    digits: int = 2
+) -> dict:
+
+    if upper_bound is not None:
+        upper = min(upper, upper_bound)
+    lower = max(lower, lower_bound)
+
+    return {
+        "estimate": round(float(estimate), digits),
+        "lower": round(float(lower), digits),
+        "upper": round(float(upper), digits),
+    }
+
+
+# =====================================================
+# RESPONSE
+# =====================================================
+
+def sample_full_analytics(dataset_id: str, size: int, method: str = "stratified"):
+    """
+    The /analytics payload computed from a `size`-row sample, plus a
+    "sampling" section with a confidence interval per metric.
+    """
+
+    with span("analytics.sample") as timing:
+        sample, population = sample_dataset(dataset_id, size, method)
+        timing.rows = len(sample)
+
+    stats = SampledDatasetStats(sample, population, dataset_id)
+    response = build_analytics_response(sample, stats)
+
+    with span("analytics.intervals", len(sample)):
+        response["sampling"] = {
+            "method": method,
+            "sample_rows": stats.sample_rows,
+            "population_rows": population,
+            "confidence": CONFIDENCE,
+            "intervals": clean_nan(sampling_intervals(stats, response)),
+        }
+
+    return response
+
+
+def sampling_intervals(stats: SampledDatasetStats, response: dict) -> dict:
+
+    population = stats.rows
+    shares = stats.row_shares()
+
+    estimates = {
+        "missing_percentage": (stats.all_null_rows / stats.total_cells) * 100 if stats.total_cells else 0,
+        "completeness": response["profile"]["completeness"],
+        "outlier_percentage": response["outliers"]["overall_percentage"],
+        "noisy_percentage": response["outliers"]["noisy_percentage"],
+    }
+
+    intervals = {
+        name: mean_interval(shares[name][0], estimate, population, shares[name][1])
+        for name, estimate in estimates.items()
+    }
+
+    # Counted over every row, not sampled
+    duplicate_pct = (stats.duplicate_count / population) * 100 if population else 0
+    intervals["duplicate_percentage"] = interval(duplicate_pct, duplicate_pct, duplicate_pct)
+
+    def score(bound):
+        return ScoringEngine.calculate_score(
+            intervals["missing_percentage"][bound],
+            duplicate_pct,
+            intervals["outlier_percentage"][bound],
+            intervals["noisy_percentage"][bound]
+        )
+
+    # The score falls as each input rises
+    intervals["quality_score"] = interval(
+        response["profile"]["quality_score"], score("upper"), score("lower"), upper_bound=100
+    )
+
+    intervals["column_means"] = column_mean_intervals(stats)
+    intervals["column_skew"] = column_skew_intervals(stats)
+    intervals["correlation_matrix"] = matrix_intervals(stats, response["correlation"]["matrix"])
+    intervals["strong_pairs"] = pair_intervals(stats, response["correlation"]["strong_pairs"])
+
+    return intervals
+
+
+def column_mean_intervals(stats: SampledDatasetStats) -> dict:
+
+    z = NormalDist().inv_cdf((1 + CONFIDENCE) / 2)
+    fraction = stats.sample_rows / stats.rows if stats.rows else 1
+
+    result = {}
+
+    for col in stats.numeric_columns:
+
+        count = stats._moments["count"][col]
+        mean = stats.mean[col]
+        std = stats.std[col]
+
+        if count == 0 or np.isnan(mean):
+            continue
+
+        if count < 2 or np.isnan(std):
+            result[col] = {"estimate": float(mean), "lower": None, "upper": None}
+            continue
+
+        half = z * std / math.sqrt(count) * math.sqrt(max(1 - fraction, 0))
+
+        result[col] = {
+            "estimate": float(mean),
+            "lower": float(mean - half),
+            "upper": float(mean + half),
+        }
+
+    return result
+
+
+def column_skew_intervals(stats: SampledDatasetStats) -> dict:
+    """
+    Normal interval per column skew, from the standard error of the
+    adjusted Fisher-Pearson coefficient under normality (a rough guide
+    for skewed columns), with the finite-population correction.
+    """
+
+    z = NormalDist().inv_cdf((1 + CONFIDENCE) / 2)
+    fraction = stats.sample_rows / stats.rows if stats.rows else 1
+
+    result = {}
+
+    for col in stats.numeric_columns:
+
+        n = stats._moments["count"][col]
+        skew = stats.skew[col]
+
+        if n < 3 or np.isnan(skew):
+            continue
+
+        se = math.sqrt(6 * n * (n - 1) / ((n - 2) * (n + 1) * (n + 3)))
+        half = z * se * math.sqrt(max(1 - fraction, 0))
+
+        result[col] = {
+            "estimate": float(skew),
+            "lower": float(skew - half),
+            "upper": float(skew + half),
+        }
+
+    return result
+
+
+def pair_counts(stats: SampledDatasetStats) -> np.ndarray:
+    """
+    Rows where both columns are present, per pair of numeric columns
+    (the rows each pairwise correlation is computed over).
+    """
+
+    valid = (~np.isnan(stats.numeric_values)).astype(np.int64)
+    return valid.T @ valid
+
+
+def matrix_intervals(stats: SampledDatasetStats, matrix: dict) -> dict:
+    """
+    Fisher z interval for every entry of the reported correlation
+    matrix, around the unrounded coefficient (None where undefined).
+    """
+
+    if not matrix:
+        return {}
+
+    position = {col: i for i, col in enumerate(stats.numeric_columns)}
+    pairs = pair_counts(stats)
+
+    return {
+        col: {
+            other: correlation_interval(
+                float(stats.correlation.loc[other, col]),
+                int(pairs[position[col], position[other]])
+            )
+            for other in row
+        }
+        for col, row in matrix.items()
+    }
+
+
+def pair_intervals(stats: SampledDatasetStats, strong_pairs: list) -> list:
+
+    if not strong_pairs:
+        return []
+
+    position = {col: i for i, col in enumerate(stats.numeric_columns)}
+    pairs = pair_counts(stats)
+
+    return [
+        {
+            "feature_1": pair["feature_1"],
+            "feature_2": pair["feature_2"],
+            **correlation_interval(
+                pair["correlation"],
+                int(pairs[position[pair["feature_1"]], position[pair["feature_2"]]])
+            ),
+        }
+        for pair in strong_pairs
+    ]
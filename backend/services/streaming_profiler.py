@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+from backend.core.dataset_store import load_dataset, iter_batches
+from backend.core.metrics import span
+from backend.core.row_index import load_row_index
+from backend.engines.correlation_engine import CorrelationAccumulator
+from backend.engines.dataset_stats import SummaryStats
+from backend.engines.iqr_kernel import IQRKernel
+from backend.engines.sketches import (
+    MomentAccumulator,
+    QuantileSketch,
+    DistinctCounter,
+)
+from backend.services.analytics_service import build_analytics_response
+from backend.services.profiling_service import build_profile_response
+
+
+HEAD_ROWS = 20
+
+
+class StreamingDatasetStats(SummaryStats):
+    """
+    SummaryStats built from two chunked passes over the columnar store.
+
+    Pass 1 folds each record batch into mergeable accumulators (nulls,
+    moments, quantile and distinct-count sketches and correlation sums).
+    Pass 2 counts IQR outliers and z-score noise against the bounds from
+    pass 1. Only one batch is in memory at a time and accumulator size
+    depends only on the column count; duplicates come from the persisted
+    row index.
+
+    Quartiles and distinct counts are exact on small columns and
+    sketch estimates on large ones. There are no row-level arrays, so
+    only engines that read aggregates accept these stats; df holds the
+    first HEAD_ROWS rows for the schema and preview.
+    """
+
+    def __init__(self, dataset_id: str):
+
+        head = None
+        accumulators = None
+
+        with span("analytics.streaming_pass") as timing:
+
+            for chunk in iter_batches(dataset_id):
+
+                if head is None:
+                    head = chunk.head(HEAD_ROWS)
+                    accumulators = ProfileAccumulators(chunk)
+
+                accumulators.update(chunk)
+
+            timing.rows = accumulators.rows if accumulators else 0
+
+        if head is None:
+            # No record batches: an empty frame still carries the schema
+            head = load_dataset(dataset_id)
+            accumulators = ProfileAccumulators(head)
+
+        acc = accumulators
+
+        self.df = head
+        self.dataset_id = dataset_id
+        self.rows = acc.rows
+        self.columns = list(head.columns)
+        self.total_cells = self.rows * len(self.columns)
+
+        cols = acc.numeric_columns
+        quartiles = np.array([
+            sketch.quantiles([0.25, 0.75]) for sketch in acc.sketches
+        ]).reshape(len(cols), 2)
+
+        def series(values):
+            return pd.Series(values, index=cols, dtype=float)
+
+        self.null_counts = pd.Series(acc.null_counts, index=self.columns)
+        self.all_null_rows = acc.all_null_rows
+        self.duplicate_count = load_row_index(dataset_id).duplicate_count
+        self.nunique = pd.Series(
+            [counter.count() for counter in acc.distinct],
+            index=self.columns
+        )
+        self.numeric_columns = cols
+        self._moments = {
+            "count": series(acc.moments.count),
+            "mean": series(acc.moments.mean),
+            "std": series(np.sqrt(acc.moments.var)),
+            "var": series(acc.moments.var),
+            "skew": series(acc.moments.skew),
+            "q1": series(quartiles[:, 0]),
+            "q3": series(quartiles[:, 1]),
+        }
+        self.correlation = acc.correlation.correlation()
+
+        self._second_pass(dataset_id)
+
+    def _second_pass(self, dataset_id: str):
+
+        cols = self.numeric_columns
+
+        q1 = self.q1.to_numpy()
+        q3 = self.q3.to_numpy()
+
+        mean = self.mean.to_numpy()
+        std = self.std.to_numpy()
+
+        outliers = np.zeros(len(cols), dtype=np.int64)
+        outlier_cells = 0
+        noisy_cells = 0
+
+        if cols:
+            for chunk in iter_batches(dataset_id):
+                values = chunk[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+                iqr = IQRKernel.compute(values, q1, q3)
+                outliers += iqr["column_counts"]
+                outlier_cells += iqr["cell_count"]
+
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    noisy_cells += int((np.abs((values - mean) / std) > 3).sum())
+
+        numeric_cells = self.rows * len(cols)
+
+        self.iqr_outliers = {
+            "column_counts": outliers,
+            "cell_count": outlier_cells,
+        }
+        self.noisy_percentage = (noisy_cells / numeric_cells) * 100 if numeric_cells else 0
+
+
+class ProfileAccumulators:
+    """
+    Pass-1 state for one dataset; every member is mergeable.
+    """
+
+    def __init__(self, first_chunk: pd.DataFrame):
+
+        self.columns = list(first_chunk.columns)
+        self.numeric_columns = first_chunk.select_dtypes(include=["number"]).columns.tolist()
+
+        self.rows = 0
+        self.null_counts = np.zeros(len(self.columns), dtype=np.int64)
+        self.all_null_rows = 0
+
+        self.moments = MomentAccumulator(len(self.numeric_columns))
+        self.sketches = [QuantileSketch() for _ in self.numeric_columns]
+        self.correlation = CorrelationAccumulator(self.numeric_columns)
+        self.distinct = [DistinctCounter() for _ in self.columns]
+
+    def update(self, chunk: pd.DataFrame):
+
+        self.rows += len(chunk)
+
+        null_mask = chunk.isna().to_numpy()
+        self.null_counts += null_mask.sum(axis=0)
+        if self.columns:
+            self.all_null_rows += int(null_mask.all(axis=1).sum())
+
+        for i, col in enumerate(self.columns):
+            values = chunk[col].to_numpy()[~null_mask[:, i]]
+            self.distinct[i].update(DistinctCounter.hash_values(values))
+
+        if self.numeric_columns:
+            values = chunk[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+            self.moments.update(values)
+            self.correlation.update(values)
+
+            for i, sketch in enumerate(self.sketches):
+                sketch.update(values[:, i])
+
+
+# =====================================================
+# RESPONSES (same shape as the in-memory paths)
+# =====================================================
+
+def stream_full_analytics(dataset_id: str):
+
+    stats = StreamingDatasetStats(dataset_id)
+
+    return build_analytics_response(stats.df, stats)
+
+
+def stream_profile_dataset(dataset_id: str):
+
+    stats = StreamingDatasetStats(dataset_id)
+
+    return build_profile_response(stats.df, stats)
@@ -0,0 +1,10 @@
+"""
+Engine and endpoint benchmarks on synthetic datasets.
+
+    python -m benchmarks run --rows 100000 --output results.json
+    python -m benchmarks run --suite engines --baseline results.json
+    python -m benchmarks compare baseline.json current.json
+
+See `python -m benchmarks run --help` for the dataset knobs (rows,
+columns, missing / duplicate / outlier rates, string cardinality).
+"""
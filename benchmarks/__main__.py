@@ -0,0 +1,171 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+from benchmarks.generator import DEFAULT_SPEC, dataset_spec, generate_dataset
+from benchmarks.harness import compare_results, format_comparison
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SUITES = ["engines", "endpoints"]
+
+
+# =====================================================
+# RUN
+# =====================================================
+
+def run(args) -> int:
+
+    spec = dataset_spec(
+        rows=args.rows,
+        columns=args.columns,
+        missing_rate=args.missing_rate,
+        duplicate_rate=args.duplicate_rate,
+        outlier_rate=args.outlier_rate,
+        cardinality=args.cardinality,
+        string_share=args.string_share,
+        seed=args.seed,
+    )
+    suites = SUITES if args.suite == "all" else [args.suite]
+    only = args.only.split(",") if args.only else None
+
+    # Uploads, caches and cleaned files go to a scratch directory; set
+    # before anything imports backend.config
+    storage = tempfile.mkdtemp(prefix="dq-bench-")
+    os.environ["DQ_STORAGE_DIR"] = storage
+
+    from benchmarks.endpoint_benchmarks import run_endpoint_benchmarks
+    from benchmarks.engine_benchmarks import run_engine_benchmarks
+
+    df = generate_dataset(**spec)
+    results = []
+
+    try:
+        if "engines" in suites:
+            results += run_engine_benchmarks(df, args.repeat, only)
+
+        if "endpoints" in suites:
+            results += run_endpoint_benchmarks(df, args.repeat, only)
+    finally:
+        shutil.rmtree(storage, ignore_errors=True)
+
+    report = {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dataset": spec,
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR,
+        datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for result in results:
+        print(
+            f"{result['group'] + '/' + result['name']:<44} "
+            f"{result['seconds']:>10.4f}s "
+            f"{result['rows_per_second'] or 0:>14,.0f} rows/s "
+            f"{result['peak_memory_bytes'] / 2 ** 20:>9.1f} MiB"
+        )
+
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        return compare_files(args.baseline, output, args.throughput_tolerance, args.memory_tolerance)
+
+    return 0
+
+
+# =====================================================
+# COMPARE
+# =====================================================
+
+def compare_files(baseline_path: str, current_path: str, throughput_tolerance: float, memory_tolerance: float) -> int:
+    """
+    Print the comparison; exit status 1 when anything regressed.
+    """
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    with open(current_path) as f:
+        current = json.load(f)
+
+    if baseline.get("dataset") != current.get("dataset"):
+        print("Warning: the runs used different datasets", file=sys.stderr)
+
+    rows = compare_results(baseline, current, throughput_tolerance, memory_tolerance)
+    print(format_comparison(rows))
+
+    regressions = [
+        row["benchmark"] for row in rows
+        if row["throughput_regression"] or row["memory_regression"]
+    ]
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    print("\nNo regressions")
+    return 0
+
+
+# =====================================================
+# CLI
+# =====================================================
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def tolerances(command):
+        command.add_argument("--throughput-tolerance", type=float, default=0.10,
+                             help="allowed throughput drop, as a fraction (default 0.10)")
+        command.add_argument("--memory-tolerance", type=float, default=0.10,
+                             help="allowed peak memory growth, as a fraction (default 0.10)")
+
+    run_parser = commands.add_parser("run", help="run benchmarks and write JSON results")
+    run_parser.add_argument("--suite", choices=SUITES + ["all"], default="all")
+    run_parser.add_argument("--only", help="comma-separated benchmark names")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", help="results file (default: benchmarks/results/<time>.json)")
+    run_parser.add_argument("--baseline", help="compare against this results file afterwards")
+
+    for key, default in DEFAULT_SPEC.items():
+        run_parser.add_argument(
+            f"--{key.replace('_', '-')}",
+            type=type(default),
+            default=None,
+            help=f"default {default}"
+        )
+
+    tolerances(run_parser)
+
+    compare_parser = commands.add_parser("compare", help="compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    tolerances(compare_parser)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        return run(args)
+
+    return compare_files(args.baseline, args.current, args.throughput_tolerance, args.memory_tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
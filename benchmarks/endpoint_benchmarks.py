@@ -0,0 +1,179 @@
+import io
+import time
+
+import pandas as pd
+
+from benchmarks.harness import measure
+
+
+SIMULATION_PAYLOAD = {
+    "handle_missing": True,
+    "remove_duplicates": True,
+    "outlier_method": "iqr",
+}
+
+
+# =====================================================
+# CLIENT HELPERS
+# =====================================================
+
+def _client():
+    """
+    ASGI test client for the app. Imported late: the benchmark runner
+    points DQ_STORAGE_DIR at a scratch directory first.
+    """
+
+    try:
+        from fastapi.testclient import TestClient
+    except RuntimeError as e:
+        # Starlette's test client needs httpx
+        raise RuntimeError(f"Endpoint benchmarks need httpx installed ({e})")
+
+    from backend.main import app
+
+    return TestClient(app)
+
+
+def _check(response):
+
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text[:200]}")
+
+    return response
+
+
+def _upload(client, csv_bytes: bytes) -> str:
+
+    response = _check(client.post(
+        "/upload/",
+        files={"file": ("benchmark.csv", csv_bytes, "text/csv")}
+    ))
+
+    return response.json()["dataset_id"]
+
+
+def _cold(dataset_id: str, drop_cleaned: bool = False):
+    """
+    Setup for a cold request: no cached results or registry statistics
+    (and optionally no materialized cleaned file) for the dataset.
+    """
+
+    from backend.core.registry import registry
+    from backend.core.result_cache import result_cache
+    from backend.services.export_service import discard_cleaned_file
+
+    def setup():
+        result_cache.invalidate(dataset_id)
+        registry.upsert(dataset_id, column_types=None, stats={})
+        if drop_cleaned:
+            discard_cleaned_file(dataset_id)
+
+    return setup
+
+
+def _await_job(client, job_id: str):
+
+    while True:
+        response = _check(client.get(f"/jobs/{job_id}/result"))
+        if response.status_code != 202:
+            return response
+        time.sleep(0.01)
+
+
+# =====================================================
+# BENCHMARKS
+# =====================================================
+
+def run_endpoint_benchmarks(df: pd.DataFrame, repeat: int = 3, only: list = None) -> list:
+    """
+    Every HTTP endpoint through the ASGI test client, against one
+    uploaded copy of df. Requests run cold (result cache dropped
+    before each) unless named "*_cached".
+    """
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    csv_bytes = buffer.getvalue().encode()
+
+    batch = io.StringIO()
+    df.head(max(len(df) // 10, 1)).to_csv(batch, index=False)
+    batch_bytes = batch.getvalue().encode()
+
+    rows = len(df)
+
+    with _client() as client:
+
+        dataset_id = _upload(client, csv_bytes)
+
+        # Previews and downloads replay the cleaning plan this records
+        _check(client.post(f"/simulate/{dataset_id}", json=SIMULATION_PAYLOAD))
+
+        def get(path):
+            return lambda _=None: _check(client.get(path)).content
+
+        def post(path, payload):
+            return lambda _=None: _check(client.post(path, json=payload)).json()
+
+        def job(path, payload=None):
+            def run(_=None):
+                submitted = _check(client.post(path, json=payload)).json()
+                return _await_job(client, submitted["job_id"]).json()
+            return run
+
+        def append(target_id):
+            return _check(client.post(
+                f"/upload/{target_id}/append",
+                files={"file": ("batch.csv", batch_bytes, "text/csv")}
+            )).json()
+
+        uploads = iter(range(1, 1_000_000))
+
+        def fresh_bytes():
+            # Trailing blank lines change the hash, not the data, so the
+            # upload is not deduplicated against earlier ones
+            return csv_bytes + b"\n" * next(uploads)
+
+        # Grows with every run, so later appends meet a longer history
+        appended_id = _upload(client, fresh_bytes())
+
+        benchmarks = {
+            "upload": (lambda body: _upload(client, body), fresh_bytes),
+            "upload_duplicate": (lambda: _upload(client, csv_bytes), None),
+            "append": (append, lambda: _upload(client, csv_bytes)),
+            "append_repeated": (lambda _=None: append(appended_id), None),
+            "datasets": (get("/datasets"), None),
+            "dataset_record": (get(f"/datasets/{dataset_id}"), None),
+            "metrics": (get("/metrics"), None),
+            "analytics": (get(f"/analytics/{dataset_id}"), _cold(dataset_id)),
+            "analytics_cached": (get(f"/analytics/{dataset_id}"), None),
+            "analytics_sampled": (get(f"/analytics/{dataset_id}?sample=0.1"), _cold(dataset_id)),
+            "analytics_streaming": (get(f"/analytics/{dataset_id}?streaming=true"), _cold(dataset_id)),
+            "analytics_job": (job(f"/jobs/analytics/{dataset_id}"), _cold(dataset_id)),
+            "profile": (get(f"/profile/{dataset_id}"), _cold(dataset_id)),
+            "profile_memory": (get(f"/profile/{dataset_id}/memory"), _cold(dataset_id)),
+            "classify": (get(f"/classify/{dataset_id}"), _cold(dataset_id)),
+            "correlation_spearman": (get(f"/correlation/{dataset_id}?method=spearman"), _cold(dataset_id)),
+            "correlation_kendall": (get(f"/correlation/{dataset_id}?method=kendall"), _cold(dataset_id)),
+            "recommend": (get(f"/recommend/{dataset_id}"), _cold(dataset_id)),
+            "simulate": (post(f"/simulate/{dataset_id}", SIMULATION_PAYLOAD), _cold(dataset_id)),
+            "simulate_grid": (post(f"/simulate/{dataset_id}/grid", {}), _cold(dataset_id)),
+            "simulate_job": (job(f"/jobs/simulate/{dataset_id}", SIMULATION_PAYLOAD), _cold(dataset_id)),
+            "simulate_grid_job": (job(f"/jobs/simulate-grid/{dataset_id}", {}), _cold(dataset_id)),
+            "download_preview": (get(f"/download/preview/{dataset_id}"), _cold(dataset_id, drop_cleaned=True)),
+            "download_csv": (get(f"/download/{dataset_id}"), _cold(dataset_id, drop_cleaned=True)),
+            "download_csv_gz": (get(f"/download/{dataset_id}?format=csv.gz"), _cold(dataset_id, drop_cleaned=True)),
+            "download_csv_zst": (get(f"/download/{dataset_id}?format=csv.zst"), _cold(dataset_id, drop_cleaned=True)),
+            "download_parquet": (get(f"/download/{dataset_id}?format=parquet"), _cold(dataset_id, drop_cleaned=True)),
+            "download_arrow": (get(f"/download/{dataset_id}?format=arrow"), _cold(dataset_id, drop_cleaned=True)),
+        }
+
+        results = []
+
+        for name, (run, setup) in benchmarks.items():
+
+            if only and name not in only:
+                continue
+
+            results.append(measure("endpoint", name, run, rows, setup=setup, repeat=repeat))
+
+    return results
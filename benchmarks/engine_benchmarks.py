@@ -0,0 +1,89 @@
+import pandas as pd
+
+from backend.core.compact_dtypes import compact_frame
+from backend.core.row_index import RowHashIndex
+from backend.engines.classification_engine import ClassificationEngine
+from backend.engines.cleaning_engine import CleaningEngine
+from backend.engines.completeness_engine import CompletenessEngine
+from backend.engines.correlation_engine import CorrelationEngine
+from backend.engines.dataset_stats import DatasetStats
+from backend.engines.importance_engine import ImportanceEngine
+from backend.engines.outlier_engine import OutlierEngine
+from backend.engines.profiling_engine import ProfilingEngine
+from backend.engines.recommendation_engine import RecommendationEngine
+from backend.services.correlation import (
+    calculate_correlation_matrix,
+    detect_strong_correlations,
+    generate_heatmap_data
+)
+from backend.services.simulation_service import build_cleaning_plan
+
+from benchmarks.harness import measure
+
+
+SIMULATION_PAYLOAD = {
+    "handle_missing": True,
+    "remove_duplicates": True,
+    "outlier_method": "iqr",
+}
+
+
+def _stats(df: pd.DataFrame):
+
+    stats = DatasetStats(df)
+
+    return (
+        stats.missing_percentage,
+        stats.duplicate_percentage,
+        stats.noisy_percentage,
+        stats.iqr_outlier_cells,
+        stats.nunique,
+        stats.correlation,
+    )
+
+
+def _simulate(df: pd.DataFrame, method: str):
+
+    plan = build_cleaning_plan(df, {**SIMULATION_PAYLOAD, "outlier_method": method})
+
+    return plan.missing_percentage, plan.duplicate_percentage, plan.outlier_percentage(method)
+
+
+# name -> callable(df); each call starts without any shared statistics
+ENGINE_BENCHMARKS = {
+    "dataset_stats": _stats,
+    "row_index": lambda df: RowHashIndex.from_frame(df),
+    "compact_frame": lambda df: compact_frame(df),
+    "classification": lambda df: ClassificationEngine.infer(df),
+    "completeness": lambda df: CompletenessEngine.calculate(df),
+    "importance": lambda df: ImportanceEngine.calculate(df),
+    "outliers_iqr": lambda df: OutlierEngine.detect_percentage(df, "iqr"),
+    "outliers_isolation_forest": lambda df: OutlierEngine.detect_percentage(df, "isolation_forest"),
+    "column_outliers_iqr": lambda df: OutlierEngine.detect_column_outliers(df, "iqr"),
+    "correlation_pearson": lambda df: CorrelationEngine.compute(df),
+    "correlation_spearman": lambda df: DatasetStats(df).spearman_correlation,
+    "correlation_kendall": lambda df: DatasetStats(df).kendall_correlation,
+    "correlation_matrix": lambda df: calculate_correlation_matrix(df),
+    "correlation_heatmap": lambda df: generate_heatmap_data(df),
+    "strong_correlations": lambda df: detect_strong_correlations(df),
+    "profiling": lambda df: ProfilingEngine.generate_profile(df),
+    "recommendation": lambda df: RecommendationEngine.analyze(df),
+    "cleaning_fill_mean": lambda df: CleaningEngine.apply_cleaning(df, "fill_mean"),
+    "cleaning_fill_mode": lambda df: CleaningEngine.apply_cleaning(df, "fill_mode"),
+    "simulate_iqr": lambda df: _simulate(df, "iqr"),
+    "simulate_isolation_forest": lambda df: _simulate(df, "isolation_forest"),
+}
+
+
+def run_engine_benchmarks(df: pd.DataFrame, repeat: int = 3, only: list = None) -> list:
+
+    results = []
+
+    for name, benchmark in ENGINE_BENCHMARKS.items():
+
+        if only and name not in only:
+            continue
+
+        results.append(measure("engine", name, lambda: benchmark(df), len(df), repeat=repeat))
+
+    return results
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+
+# =====================================================
+# SYNTHETIC DATASETS
+# =====================================================
+
+DEFAULT_SPEC = {
+    "rows": 50_000,
+    "columns": 12,
+    "missing_rate": 0.05,
+    "duplicate_rate": 0.02,
+    "outlier_rate": 0.01,
+    "cardinality": 50,
+    "string_share": 0.25,
+    "seed": 0,
+}
+
+
+def dataset_spec(**overrides) -> dict:
+    """
+    DEFAULT_SPEC with overrides applied (None values are ignored).
+    """
+
+    spec = dict(DEFAULT_SPEC)
+    spec.update({key: value for key, value in overrides.items() if value is not None})
+
+    return spec
+
+
+def generate_dataset(
+    rows: int = DEFAULT_SPEC["rows"],
+    columns: int = DEFAULT_SPEC["columns"],
+    missing_rate: float = DEFAULT_SPEC["missing_rate"],
+    duplicate_rate: float = DEFAULT_SPEC["duplicate_rate"],
+    outlier_rate: float = DEFAULT_SPEC["outlier_rate"],
+    cardinality: int = DEFAULT_SPEC["cardinality"],
+    string_share: float = DEFAULT_SPEC["string_share"],
+    seed: int = DEFAULT_SPEC["seed"],
+) -> pd.DataFrame:
+    """
+    Mixed numeric / string frame with controlled defects.
+
+    - string_share of the columns hold `cardinality` distinct labels,
+      the rest are correlated normal floats plus one 0/1 integer flag
+      and (from three numeric columns) one True/False column
+    - outlier_rate of the numeric cells are pushed 10-20 std out
+    - missing_rate of the cells are nulled, except in the True/False
+      column, so it loads as bool
+    - duplicate_rate of the rows are replaced by copies of other rows
+      (after the nulls, so copies are exact)
+
+    The same arguments always give the same frame.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    n_strings = min(columns, int(round(columns * string_share)))
+    n_numeric = columns - n_strings
+
+    data = {}
+
+    if n_numeric:
+        # Shared factor so correlation has something to find
+        base = rng.normal(size=rows)
+
+        for i in range(n_numeric):
+            if i == n_numeric - 1 and n_numeric > 1:
+                data[f"flag_{i}"] = rng.integers(0, 2, rows)
+                continue
+
+            if i == n_numeric - 2 and n_numeric > 2:
+                data[f"bool_{i}"] = rng.random(rows) < 0.3
+                continue
+
+            weight = (i % 4) / 4
+            data[f"num_{i}"] = weight * base + (1 - weight) * rng.normal(size=rows) * (i + 1) + i * 10
+
+    labels = np.array([f"label_{k}" for k in range(max(cardinality, 1))], dtype=object)
+
+    for i in range(n_strings):
+        data[f"str_{i}"] = labels[rng.integers(0, len(labels), rows)]
+
+    df = pd.DataFrame(data)
+
+    numeric = [col for col in df.columns if col.startswith("num_")]
+
+    for col in numeric:
+        hits = rng.random(rows) < outlier_rate
+        values = df[col].to_numpy()
+        spread = values.std() or 1.0
+        df.loc[hits, col] = values[hits] + rng.choice([-1, 1], hits.sum()) * rng.uniform(10, 20, hits.sum()) * spread
+
+    for col in df.columns:
+        if col.startswith("bool_"):
+            continue
+
+        nulls = rng.random(rows) < missing_rate
+        if nulls.any():
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = df[col].astype(float)
+            df.loc[nulls, col] = np.nan
+
+    n_duplicates = int(rows * duplicate_rate)
+
+    if n_duplicates and rows > 1:
+        order = np.arange(rows)
+        order[rng.choice(rows, n_duplicates, replace=False)] = rng.integers(0, rows, n_duplicates)
+        df = df.iloc[order].reset_index(drop=True)
+
+    return df
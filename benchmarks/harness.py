@@ -0,0 +1,126 @@
+import gc
+import statistics
+import time
+import tracemalloc
+
+
+# =====================================================
+# MEASUREMENT
+# =====================================================
+
+def measure(group: str, name: str, run, rows: int, setup=None, repeat: int = 3) -> dict:
+    """
+    Time `run` (after `setup`, untimed, before every call) and record
+    its peak traced memory.
+
+    Timing runs are untraced; one extra run under tracemalloc gives the
+    peak of Python and NumPy allocations (Arrow's own memory pool is
+    not traced). The first timed run is kept, so a cold run counts.
+    """
+
+    durations = []
+
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+
+        start = time.perf_counter()
+        run(state) if setup else run()
+        durations.append(time.perf_counter() - start)
+
+    state = setup() if setup else None
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        run(state) if setup else run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(durations)
+
+    return {
+        "group": group,
+        "name": name,
+        "rows": rows,
+        "repeat": repeat,
+        "seconds": round(median, 6),
+        "best_seconds": round(min(durations), 6),
+        "rows_per_second": round(rows / median, 1) if median > 0 else None,
+        "peak_memory_bytes": int(peak),
+    }
+
+
+def result_key(result: dict) -> str:
+    return f"{result['group']}/{result['name']}"
+
+
+# =====================================================
+# COMPARISON
+# =====================================================
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    throughput_tolerance: float = 0.10,
+    memory_tolerance: float = 0.10
+) -> list:
+    """
+    One row per benchmark present in both runs. A benchmark regresses
+    when its throughput drops by more than throughput_tolerance, or its
+    peak memory grows by more than memory_tolerance, relative to the
+    baseline.
+    """
+
+    previous = {result_key(r): r for r in baseline["results"]}
+    rows = []
+
+    for result in current["results"]:
+
+        key = result_key(result)
+        before = previous.get(key)
+
+        if before is None:
+            continue
+
+        throughput_change = _change(before["rows_per_second"], result["rows_per_second"])
+        memory_change = _change(before["peak_memory_bytes"], result["peak_memory_bytes"])
+
+        rows.append({
+            "benchmark": key,
+            "throughput_change": throughput_change,
+            "memory_change": memory_change,
+            "throughput_regression": throughput_change is not None and throughput_change < -throughput_tolerance,
+            "memory_regression": memory_change is not None and memory_change > memory_tolerance,
+        })
+
+    return rows
+
+
+def _change(before, after):
+
+    if not before or after is None:
+        return None
+
+    return round((after - before) / before, 4)
+
+
+def format_comparison(rows: list) -> str:
+
+    lines = [f"{'benchmark':<44} {'throughput':>11} {'peak mem':>10}"]
+
+    for row in rows:
+
+        def cell(change, regressed):
+            if change is None:
+                return "n/a"
+            return f"{change:+.1%}" + (" !" if regressed else "")
+
+        lines.append(
+            f"{row['benchmark']:<44} "
+            f"{cell(row['throughput_change'], row['throughput_regression']):>11} "
+            f"{cell(row['memory_change'], row['memory_regression']):>10}"
+        )
+
+    return "\n".join(lines)